@@ -23,6 +23,13 @@ class ExecutorsSpec:
 @dataclass
 class UserConfig:
     matrix_mode: bool = False
+    watch_directories: bool = True
+    gitignore_engine: str = "builtin"
+    background_listing: bool = True
+    expand_all_max_entries: int = 20000
+    expand_all_max_depth: int = 12
+    matrix_fps: float = 25.0
+    matrix_idle_after: float = 30.0
     handlers: Dict[str, "HandlerSpec"] = field(default_factory=dict)
     executors: ExecutorsSpec = field(default_factory=ExecutorsSpec)
     warnings: List[str] = field(default_factory=list)
@@ -194,6 +201,50 @@ def load_user_config() -> UserConfig:
     if not isinstance(matrix_mode, bool):
         matrix_mode = False
 
+    watch_directories = data.get("watch_directories")
+    if not isinstance(watch_directories, bool):
+        watch_directories = True
+
+    gitignore_engine = data.get("gitignore_engine")
+    if gitignore_engine not in {"builtin", "git"}:
+        gitignore_engine = "builtin"
+
+    background_listing = data.get("background_listing")
+    if not isinstance(background_listing, bool):
+        background_listing = True
+
+    expand_all_max_entries = data.get("expand_all_max_entries")
+    if (
+        not isinstance(expand_all_max_entries, int)
+        or isinstance(expand_all_max_entries, bool)
+        or expand_all_max_entries <= 0
+    ):
+        expand_all_max_entries = 20000
+
+    expand_all_max_depth = data.get("expand_all_max_depth")
+    if (
+        not isinstance(expand_all_max_depth, int)
+        or isinstance(expand_all_max_depth, bool)
+        or expand_all_max_depth <= 0
+    ):
+        expand_all_max_depth = 12
+
+    matrix_fps = data.get("matrix_fps")
+    if (
+        not isinstance(matrix_fps, (int, float))
+        or isinstance(matrix_fps, bool)
+        or not 1 <= matrix_fps <= 120
+    ):
+        matrix_fps = 25.0
+
+    matrix_idle_after = data.get("matrix_idle_after")
+    if (
+        not isinstance(matrix_idle_after, (int, float))
+        or isinstance(matrix_idle_after, bool)
+        or matrix_idle_after <= 0
+    ):
+        matrix_idle_after = 30.0
+
     warnings: List[str] = []
 
     handlers = _normalize_handlers(data.get("handlers", {}))
@@ -217,6 +268,13 @@ def load_user_config() -> UserConfig:
 
     return UserConfig(
         matrix_mode=matrix_mode,
+        watch_directories=watch_directories,
+        gitignore_engine=gitignore_engine,
+        background_listing=background_listing,
+        expand_all_max_entries=expand_all_max_entries,
+        expand_all_max_depth=expand_all_max_depth,
+        matrix_fps=float(matrix_fps),
+        matrix_idle_after=float(matrix_idle_after),
         handlers=handlers,
         executors=executors,
         warnings=warnings,
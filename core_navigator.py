@@ -5,13 +5,19 @@ import threading
 from dataclasses import dataclass
 from typing import Set, List, Optional, Iterable
 
-from directory_manager import DirectoryManager
+from directory_manager import DirectoryManager, IGNORE_FILE_NAMES
+from directory_watcher import DirectoryWatcher, STRUCTURE_MASK
+from display_model import DisplayModel
+from expand_all import ExpandAllJob
+from expansion_set import ExpansionSet
+from listing_workers import ListingWorkers
+from wakeup import WakeupChannel
 from clipboard_manager import ClipboardManager
 from ui_renderer import UIRenderer
 from input_handler import InputHandler
 from constants import Constants
 from file_actions import FileActionService
-from config import USER_CONFIG
+from config import USER_CONFIG, UserConfig
 
 
 @dataclass
@@ -28,6 +34,7 @@ class FileNavigator:
         start_path: str,
         picker_options: Optional[PickerOptions] = None,
         reveal_path: Optional[str] = None,
+        config: Optional[UserConfig] = None,
     ):
         self.dir_manager = DirectoryManager(start_path)
         self.clipboard = ClipboardManager()
@@ -41,7 +48,13 @@ class FileNavigator:
         self.browser_selected = 0
         self.list_offset = 0
         self.need_redraw = True
-        self.config = USER_CONFIG
+        self.wakeup = WakeupChannel()
+        self.config = USER_CONFIG if config is None else config
+        self.dir_manager.gitignore_engine = self.config.gitignore_engine
+        if self.config.background_listing:
+            self.dir_manager.listing_workers = ListingWorkers(
+                on_done=self._on_listing_ready
+            )
         if picker_options is not None:
             self.layout_mode = "list"
         else:
@@ -54,7 +67,9 @@ class FileNavigator:
 
         # Multi-mark support — now using full absolute paths
         self.marked_items = set()  # set of str (absolute paths)
-        self.expanded_nodes: Set[str] = set()
+        self.expanded_nodes = ExpansionSet()
+        self.display_model = DisplayModel(self)
+        self.expand_job: Optional[ExpandAllJob] = None
 
         self.cheatsheet = Constants.CHEATSHEET
         self.status_message = ""
@@ -83,6 +98,13 @@ class FileNavigator:
 
         self.active_execution_job = None
 
+        self.directory_watcher: Optional[DirectoryWatcher] = None
+        self._watch_sync: Optional[tuple] = None
+        if self.config.watch_directories:
+            watcher = DirectoryWatcher(on_event=self.request_redraw)
+            if watcher.available:
+                self.directory_watcher = watcher
+
         if self.config.warnings and not self.status_message:
             self.status_message = self.config.warnings[0]
 
@@ -179,13 +201,13 @@ class FileNavigator:
             return
         with self.command_popup_lock:
             self.command_popup_lines.extend(new_lines)
-        self.need_redraw = True
+        self.request_redraw()
 
     def update_command_popup_header(self, header: str) -> None:
         with self.command_popup_lock:
             self.command_popup_header = header
         self.status_message = header
-        self.need_redraw = True
+        self.request_redraw()
 
     def close_command_popup(self) -> None:
         with self.command_popup_lock:
@@ -236,72 +258,41 @@ class FileNavigator:
     def rename_selected(self):
         self.file_actions.rename_selected()
 
-    def build_display_items(self):
-        base_items = self.dir_manager.get_filtered_items()
-        display = []
+    @property
+    def expanded_nodes(self) -> ExpansionSet:
+        return self._expanded_nodes
 
-        for name, is_dir in base_items:
-            path = os.path.join(self.dir_manager.current_path, name)
-            display.append((name, is_dir, path, 0))
-            if is_dir and path in self.expanded_nodes:
-                self._append_expanded(path, 1, display)
+    @expanded_nodes.setter
+    def expanded_nodes(self, paths: Set[str]) -> None:
+        if not isinstance(paths, ExpansionSet):
+            paths = ExpansionSet(paths)
+        self._expanded_nodes = paths
 
-        return display
+    def build_display_items(self):
+        """Rows currently displayed; a shared snapshot callers must not mutate."""
+        return self.display_model.rows()
 
     def _apply_reveal_selection(self) -> None:
         target = self.reveal_target
         if not target:
             return
 
-        items = self.build_display_items()
-        for idx, (_, _is_dir, path, _depth) in enumerate(items):
-            if os.path.realpath(path) == target:
-                self.browser_selected = idx
-                self.update_visual_active(self.browser_selected)
-                return
-
-    def _append_expanded(self, base_path: str, depth: int, collection: list):
-        children = self.dir_manager.list_directory(base_path)
-        if (
-            not children
-            and base_path in self.expanded_nodes
-            and not os.path.exists(base_path)
-        ):
-            self.expanded_nodes.discard(base_path)
-            return
-
-        for child_name, child_is_dir in children:
-            child_path = os.path.join(base_path, child_name)
-            collection.append((child_name, child_is_dir, child_path, depth))
-            if child_is_dir and child_path in self.expanded_nodes:
-                self._append_expanded(child_path, depth + 1, collection)
+        idx = self.display_model.row_of(target, resolve=True)
+        if idx is not None:
+            self.browser_selected = idx
+            self.update_visual_active(self.browser_selected)
 
     def collapse_branch(self, base_path: str):
-        if base_path not in self.expanded_nodes and not any(
-            p.startswith(f"{base_path}{os.sep}") for p in self.expanded_nodes
-        ):
-            return
-        to_remove = [
-            p
-            for p in self.expanded_nodes
-            if p == base_path or p.startswith(f"{base_path}{os.sep}")
-        ]
-        for entry in to_remove:
-            self.expanded_nodes.discard(entry)
+        expanded = self.expanded_nodes
+        expanded.discard_paths(expanded.paths_under(base_path))
 
     def collapse_expansions_under(self, base_path: str):
         real_base = os.path.realpath(base_path)
         if not real_base:
             return
-        prefix = f"{real_base}{os.sep}"
-        to_remove = [
-            p for p in self.expanded_nodes if p == real_base or p.startswith(prefix)
-        ]
-        if not to_remove:
-            return
-        for entry in to_remove:
-            self.expanded_nodes.discard(entry)
-        self.need_redraw = True
+        expanded = self.expanded_nodes
+        if expanded.discard_paths(expanded.paths_under_real(real_base)):
+            self.need_redraw = True
 
     def add_bookmark(self, path: Optional[str] = None) -> bool:
         target = path or self.dir_manager.current_path
@@ -376,6 +367,126 @@ class FileNavigator:
             else:
                 self.browser_selected = max(0, min(self.browser_selected, total - 1))
 
+    def sync_directory_watches(self) -> None:
+        watcher = self.directory_watcher
+        if watcher is None:
+            return
+        # Diffing thousands of paths on every key adds up, so resync only when
+        # the expansion state, the cwd or the free watch slots changed.
+        if self._watch_sync == self._watch_sync_key(watcher):
+            return
+        paths = set(self.expanded_nodes)
+        paths.add(self.dir_manager.current_path)
+        watcher.watch_paths(paths)
+        self._watch_sync = self._watch_sync_key(watcher)
+
+    def _watch_sync_key(self, watcher: DirectoryWatcher):
+        expanded = self.expanded_nodes
+        return (
+            expanded,
+            expanded.version,
+            self.dir_manager.current_path,
+            watcher.freed_watches,
+        )
+
+    def process_directory_events(self) -> bool:
+        watcher = self.directory_watcher
+        if watcher is None:
+            return False
+
+        changed = False
+        for path, events in watcher.drain().items():
+            if events is not None and not any(
+                self._is_listing_event(path, mask, name) for mask, name in events
+            ):
+                continue
+            recursive = events is None or any(
+                name in IGNORE_FILE_NAMES for _mask, name in events
+            )
+            if self.dir_manager.invalidate_directory(path, recursive=recursive):
+                changed = True
+
+        if changed:
+            self.need_redraw = True
+        return changed
+
+    def _is_listing_event(self, path: str, mask: int, name: str) -> bool:
+        if name in IGNORE_FILE_NAMES:
+            return True
+        if name.startswith(".") and not self.dir_manager.show_hidden:
+            return False
+        if mask & STRUCTURE_MASK:
+            return True
+        # Content writes and touches only reorder mtime-sorted listings.
+        real_path = os.path.realpath(path)
+        return self.dir_manager.sort_mode_for(real_path) != "alpha"
+
+    def start_expand_all(self) -> None:
+        self.cancel_expand_all()
+        job = ExpandAllJob(
+            self.dir_manager,
+            self.dir_manager.current_path,
+            self._expand_path,
+            max_entries=self.config.expand_all_max_entries,
+            max_depth=self.config.expand_all_max_depth,
+            on_done=self._on_listing_ready,
+        )
+        self.expand_job = job
+        self.status_message = job.status_text()
+        self.poll_expand_all()
+
+    def poll_expand_all(self) -> bool:
+        """Advance a running expand-all; True when the view changed."""
+        job = self.expand_job
+        if job is None:
+            return False
+        changed = job.poll()
+        if job.done:
+            self.expand_job = None
+            self.status_message = job.summary()
+            return True
+        if changed:
+            self.status_message = job.status_text()
+        return changed
+
+    def cancel_expand_all(self) -> bool:
+        job = self.expand_job
+        if job is None:
+            return False
+        job.cancel()
+        self.expand_job = None
+        self.status_message = job.summary()
+        self.need_redraw = True
+        return True
+
+    def _expand_path(self, path: str) -> bool:
+        if path in self.expanded_nodes:
+            return False
+        self.expanded_nodes.add(path)
+        return True
+
+    def request_redraw(self) -> None:
+        """Ask for a repaint; safe to call from any thread."""
+        self.need_redraw = True
+        self.wakeup.notify()
+
+    def _on_listing_ready(self) -> None:
+        # Called on a listing worker thread; the main loop picks it up.
+        self.request_redraw()
+
+    def has_pending_listings(self) -> bool:
+        return self.dir_manager.has_pending_listings()
+
+    def close(self) -> None:
+        if self.expand_job is not None:
+            self.expand_job.cancel()
+            self.expand_job = None
+        if self.directory_watcher is not None:
+            self.directory_watcher.close()
+            self.directory_watcher = None
+        self.dir_manager.close()
+        self.wakeup.close()
+
     def go_history_back(self):
         if not self.bookmarks or self.bookmark_index <= 0:
             self.status_message = "No previous bookmark"
@@ -396,6 +507,7 @@ class FileNavigator:
 
     def _set_current_path(self, new_path: str):
         self.exit_visual_mode()
+        self.cancel_expand_all()
         self.dir_manager.current_path = new_path
         self.browser_selected = 0
         self.list_offset = 0
@@ -1,25 +1,220 @@
 # ~/Apps/vios/directory_manager.py
 import os
 import fnmatch
-import subprocess
-from typing import Optional, Dict, List, Tuple
+import itertools
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Deque, Optional, Dict, Iterator, List, Set, Tuple
+
+from git_check_ignore import GitCheckIgnore
+from ignore_rules import (
+    IgnoreRuleSet,
+    IncludeRuleSet,
+    RepoIgnoreMatcher,
+    is_worktree_root,
+    load_rule_set,
+    read_pattern_lines,
+)
+from listing import Listing
+from listing_workers import ListingWorkers
+from path_trie import PathTrie
+
+# (st_mtime_ns, st_ino, st_dev) of a directory when it was listed.
+DirectorySignature = Tuple[int, int, int]
+
+# Directories modified this close to the moment they were listed may change
+# again without moving st_mtime_ns on coarse-timestamp filesystems.
+RACY_MTIME_WINDOW_NS = 1_000_000_000
+
+# With background listing the UI thread never stats directories itself;
+# cached listings older than this are revalidated by a worker.
+REVALIDATE_INTERVAL = 1.0
+
+# How long the UI thread waits for workers before drawing placeholders: per
+# lookup, or in total for all lookups of one ``wait_budget`` block.
+FOREGROUND_WAIT = 0.05
+
+# Entries read before a streaming listing first publishes a sorted prefix.
+STREAM_FIRST_CHUNK = 1024
+
+# Files whose edits can change the visibility of entries in a whole subtree.
+IGNORE_FILE_NAMES = frozenset({".gitignore", ".oinclude"})
+
+# Repo-root lookups store None for "not in a work tree".
+_UNKNOWN = object()
+
+
+def _close_processes(processes: Dict[str, GitCheckIgnore]) -> None:
+    pending = list(processes.values())
+    processes.clear()
+    for process in pending:
+        process.close()
+
+
+def _git_ceiling_directories() -> frozenset:
+    raw = os.environ.get("GIT_CEILING_DIRECTORIES", "")
+    return frozenset(
+        os.path.realpath(path) for path in raw.split(os.pathsep) if os.path.isabs(path)
+    )
+
+
+@dataclass
+class CachedListing:
+    signature: DirectorySignature
+    items: Listing
+    racy: bool = False
+    # time.monotonic() of the last signature check (background mode TTL).
+    checked_at: float = 0.0
+
+
+@dataclass
+class ViewBuild:
+    """Generations seen by one ``building_view`` block.
+
+    ``generation`` is the newest generation the built view is known to
+    reflect; it is set when the block exits.
+    """
+
+    start: int
+    generation: int = 0
+
+
+# Recent generation bumps and the listing path behind each (None otherwise).
+BUMP_LOG_SIZE = 1024
 
 
 class DirectoryManager:
     def __init__(self, start_path: str):
+        # Moves whenever anything a listing or its filtered view depends on
+        # changes; display snapshots compare it to know when to rebuild.
+        self._generations = itertools.count(1)
+        self.generation = 0
+        self._bump_log: Deque[Tuple[int, Optional[str]]] = deque(maxlen=BUMP_LOG_SIZE)
+        self._building = threading.local()
         self.current_path = os.path.realpath(start_path)
         self.filter_pattern = ""
         self.show_hidden = False  # Default: hide dotfiles/dotdirs
         self.sort_mode = "alpha"
         self.sort_map = {}
-        self._cache: Dict[str, List[Tuple[str, bool]]] = {}
-        self._git_repo_cache: Dict[str, Optional[str]] = {}
-        self._oinclude_cache: Dict[str, List[str]] = {}
-        self._nested_gitignore_cache: Dict[str, List[str]] = {}
+        # Listing workers fill the caches below while the UI thread drops
+        # them. The lock covers every read-modify-write of them but is never
+        # held across a filesystem call.
+        self._cache_lock = threading.Lock()
+        # Bumped under the lock whenever ignore caches are invalidated, so a
+        # lookup that raced an invalidation does not store a stale answer.
+        self._ignore_epoch = 0
+        self._cache: Dict[str, CachedListing] = {}
+        # Listings dropped by invalidation, drawn while their refresh runs.
+        self._last_known: Dict[str, Listing] = {}
+        # Sorted prefixes of listings a worker is still streaming.
+        self._partial: Dict[str, Listing] = {}
+        # Bumped whenever hidden/sort settings change; listings produced under
+        # an older epoch are not cached.
+        self._listing_epoch = 0
+        self.listing_workers: Optional[ListingWorkers] = None
+        # Real path each listed path resolved to, as found by the listing job.
+        self._real_paths: Dict[str, str] = {}
+        # Real paths whose listing failed because the directory is gone.
+        self._missing: Set[str] = set()
+        # Memoized work tree root (or None) of every directory looked up.
+        self._git_repo_cache = PathTrie()
+        self._git_ceilings = _git_ceiling_directories()
+        self._oinclude_cache: Dict[str, IncludeRuleSet] = {}
+        self._nested_gitignore_cache: Dict[str, IgnoreRuleSet] = {}
+        # "builtin" filters with compiled rules; "git" asks git check-ignore.
+        self.gitignore_engine = "builtin"
+        self._ignore_matchers: Dict[str, RepoIgnoreMatcher] = {}
+        self._check_ignore_processes: Dict[str, GitCheckIgnore] = {}
+        weakref.finalize(self, _close_processes, self._check_ignore_processes)
 
         # Keep home_path for pretty_path only
         self.home_path = os.path.realpath(os.path.expanduser("~"))
 
+    def _bump_generation(self, path: Optional[str] = None) -> None:
+        if getattr(self._building, "active", False):
+            return
+        # next() on a count is atomic, so worker threads may bump concurrently.
+        generation = next(self._generations)
+        self._bump_log.append((generation, path))
+        self.generation = generation
+
+    @contextmanager
+    def building_view(self) -> Iterator[ViewBuild]:
+        """Don't count listings this thread stores while building a view.
+
+        The view being built already reflects them. Stores made by worker
+        threads meanwhile still move the generation; when every one of them
+        stored a listing the build waited for, the yielded ViewBuild reports
+        the end generation, otherwise the start one, so a view that may have
+        missed a store is rebuilt.
+        """
+        view = ViewBuild(self.generation)
+        self._building.active = True
+        self._building.waited = {}
+        try:
+            with self.wait_budget():
+                yield view
+        finally:
+            self._building.active = False
+            waited = self._building.waited
+            self._building.waited = None
+            end = self.generation
+            view.generation = (
+                end if self._bumps_covered(view.start, end, waited) else view.start
+            )
+
+    @contextmanager
+    def wait_budget(self) -> Iterator[None]:
+        """Share one FOREGROUND_WAIT among all listing lookups in the block.
+
+        A tree with many expanded directories on a hung mount then costs one
+        wait per frame, not one per directory.
+        """
+        if getattr(self._building, "wait_until", None) is not None:
+            yield
+            return
+        self._building.wait_until = time.monotonic() + FOREGROUND_WAIT
+        try:
+            yield
+        finally:
+            self._building.wait_until = None
+
+    def _bumps_covered(self, start: int, end: int, waited: Dict[str, int]) -> bool:
+        if end < start:
+            return False
+        sources = {
+            generation: path
+            for generation, path in self._bump_log.copy()
+            if start < generation <= end
+        }
+        for generation in range(start + 1, end + 1):
+            path = sources.get(generation)
+            if path is None or generation > waited.get(path, -1):
+                return False
+        return True
+
+    @property
+    def current_path(self) -> str:
+        return self._current_path
+
+    @current_path.setter
+    def current_path(self, path: str) -> None:
+        self._current_path = path
+        self._bump_generation()
+
+    @property
+    def filter_pattern(self) -> str:
+        return self._filter_pattern
+
+    @filter_pattern.setter
+    def filter_pattern(self, pattern: str) -> None:
+        self._filter_pattern = pattern
+        self._bump_generation()
+
     @classmethod
     def pretty_path(cls, path: str) -> str:
         """Convert absolute path to pretty ~ form if it's under home."""
@@ -36,84 +231,290 @@ class DirectoryManager:
     def toggle_hidden(self):
         """Toggle visibility of hidden files/directories"""
         self.show_hidden = not self.show_hidden
-        # Hidden visibility affects every cached listing, so clear caches
-        self.refresh_cache()
+        # Hidden visibility affects every cached listing, but not git state
+        with self._cache_lock:
+            self._listing_epoch += 1
+            self._retire_listings(list(self._cache))
+        self._bump_generation()
 
     def get_hidden_status_text(self) -> str:
         """Return text for status bar when hidden files are visible"""
         return " .dot" if self.show_hidden else ""
 
-    def get_items(self):
-        real_path = os.path.realpath(self.current_path)
+    def get_items(self) -> Listing:
+        return self.get_listing(self.current_path)
+
+    def get_listing(self, path: str) -> Listing:
+        """Return the validated cached listing of *path*, re-listing if stale.
+
+        Listings are immutable and shared with the cache, so no copy is made.
+        """
+        if self.listing_workers is not None:
+            return self._get_listing_in_background(path)
+        real_path = os.path.realpath(path)
+        with self._cache_lock:
+            self._real_paths[path] = real_path
+        cached = self._cache.get(real_path)
+        if cached is not None and self._is_listing_current(real_path, cached):
+            return cached.items
+        return self.list_directory(real_path)
+
+    def _get_listing_in_background(self, path: str) -> Listing:
+        """Serve *path* without touching the filesystem on the calling thread.
+
+        Fresh cached listings are returned as is. Anything else is handed to
+        a worker; the caller waits up to FOREGROUND_WAIT and otherwise gets
+        the last known listing, or the sorted prefix streamed so far, while
+        ``is_loading`` reports it. Inside ``wait_budget`` (and so inside
+        ``building_view``) all lookups share one FOREGROUND_WAIT.
+        """
+        assert self.listing_workers is not None
+        with self._cache_lock:
+            real_path = self._real_paths.get(path, path)
         cached = self._cache.get(real_path)
+        if (
+            cached is not None
+            and not cached.racy
+            and time.monotonic() - cached.checked_at < REVALIDATE_INTERVAL
+        ):
+            return cached.items
+
+        future = self.listing_workers.submit(path, self._refresh_listing, path)
         if cached is not None:
-            return cached[:]
-        items = self.list_directory(self.current_path)
-        self._cache[real_path] = items[:]
-        return items
+            # Stale-while-revalidate: the worker reports back when it is done.
+            return cached.items
+        wait_until = getattr(self._building, "wait_until", None)
+        if wait_until is None:
+            timeout = FOREGROUND_WAIT
+        else:
+            timeout = max(0.0, wait_until - time.monotonic())
+        try:
+            listing = future.result(timeout=timeout)
+        except Exception:
+            pass
+        else:
+            waited = getattr(self._building, "waited", None)
+            if waited is not None:
+                # Bumps up to now for this path are in the listing returned.
+                waited[listing.parent] = self.generation
+            return listing
+        last_known = self._last_known.get(real_path)
+        if last_known is not None:
+            return last_known
+        partial = self._partial.get(real_path)
+        if partial is not None:
+            return partial
+        return Listing(real_path, [], [])
+
+    def load_listing(self, path: str) -> Listing:
+        """Validated listing of *path*, read on the calling thread.
+
+        For callers that already run off the UI thread, such as expand-all.
+        """
+        return self._refresh_listing(path)
+
+    def _refresh_listing(self, path: str) -> Listing:
+        real_path = os.path.realpath(path)
+        with self._cache_lock:
+            self._real_paths[path] = real_path
+        cached = self._cache.get(real_path)
+        if cached is not None and self._is_listing_current(real_path, cached):
+            cached.checked_at = time.monotonic()
+            return cached.items
+        return self.list_directory(real_path)
+
+    def real_path_of(self, path: str) -> Optional[str]:
+        """Real path the last listing of *path* resolved, or None if not listed yet."""
+        with self._cache_lock:
+            return self._real_paths.get(path)
+
+    def is_missing(self, path: str) -> bool:
+        """True when the last listing of *path* found no directory there."""
+        with self._cache_lock:
+            return self._real_paths.get(path, path) in self._missing
+
+    def is_loading(self, path: str) -> bool:
+        """True while a worker has been listing *path* for a noticeable time."""
+        workers = self.listing_workers
+        if workers is None:
+            return False
+        since = workers.pending_since(path)
+        return since is not None and time.monotonic() - since >= FOREGROUND_WAIT
 
-    def list_directory(self, target_path: str):
+    def has_pending_listings(self) -> bool:
+        workers = self.listing_workers
+        return workers is not None and workers.has_pending()
+
+    def _directory_signature(self, real_path: str) -> Optional[DirectorySignature]:
         try:
-            raw_items = os.listdir(target_path)
-        except (PermissionError, FileNotFoundError):
-            return []
+            stat_result = os.stat(real_path)
+        except OSError:
+            return None
+        return (stat_result.st_mtime_ns, stat_result.st_ino, stat_result.st_dev)
 
-        visible_items = []
+    def _is_listing_current(self, real_path: str, cached: CachedListing) -> bool:
+        if cached.racy:
+            return False
+        return self._directory_signature(real_path) == cached.signature
 
+    def list_directory(self, target_path: str) -> Listing:
         real_target = os.path.realpath(target_path)
-        sort_mode = self.sort_map.get(real_target, self.sort_mode)
-        ignored_items = self._get_git_ignored_items(target_path, raw_items)
+        epoch = self._listing_epoch
+        listed_at_ns = time.time_ns()
+        signature = self._directory_signature(real_target)
 
-        for item in raw_items:
-            if item in {".", ".."}:
-                continue
+        try:
+            entries = self._scan_entries(target_path)
+        except (FileNotFoundError, NotADirectoryError):
+            with self._cache_lock:
+                self._cache.pop(real_target, None)
+                vanished = real_target not in self._missing
+                self._missing.add(real_target)
+            if vanished:
+                self._bump_generation(real_target)
+            return Listing(real_target, [], [])
+        if entries is None:
+            with self._cache_lock:
+                self._cache.pop(real_target, None)
+            return Listing(real_target, [], [])
 
-            full_path = os.path.join(target_path, item)
-            if not os.path.exists(full_path):
+        sort_mode = self.sort_map.get(real_target, self.sort_mode)
+        # Synchronous listings are built in one pass. Worker listings are built
+        # in chunks of doubling size, and each sorted prefix is published for
+        # the UI, so the first screen of a huge directory appears right away.
+        streaming = self.listing_workers is not None
+        chunk_limit = STREAM_FIRST_CHUNK if streaming else None
+
+        candidates: List[Tuple[str, bool, os.DirEntry]] = []
+        chunk: List[Tuple[str, bool, os.DirEntry]] = []
+        for entry, is_dir in entries:
+            if entry.name.startswith(".") and not self.show_hidden:
                 continue
+            chunk.append((entry.name, is_dir, entry))
+            if chunk_limit is not None and len(chunk) >= chunk_limit:
+                self._merge_chunk(real_target, candidates, chunk, sort_mode)
+                chunk = []
+                chunk_limit = len(candidates)
+                prefix = self._to_listing(real_target, candidates)
+                with self._cache_lock:
+                    published = epoch == self._listing_epoch
+                    if published:
+                        self._partial[real_target] = prefix
+                if published:
+                    self._bump_generation(real_target)
+        self._merge_chunk(real_target, candidates, chunk, sort_mode)
+
+        visible_items = self._to_listing(real_target, candidates)
+        with self._cache_lock:
+            self._partial.pop(real_target, None)
+            self._missing.discard(real_target)
+            if epoch != self._listing_epoch:
+                # Settings changed while listing (background mode); don't cache.
+                return visible_items
+            if signature is not None:
+                self._cache[real_target] = CachedListing(
+                    signature=signature,
+                    items=visible_items,
+                    racy=signature[0] >= listed_at_ns - RACY_MTIME_WINDOW_NS,
+                    checked_at=time.monotonic(),
+                )
+                self._last_known.pop(real_target, None)
+            else:
+                self._cache.pop(real_target, None)
+        self._bump_generation(real_target)
+        return visible_items
 
-            is_dir = os.path.isdir(full_path)
-            is_hidden = item.startswith(".")
-
-            if is_hidden and not self.show_hidden:
-                continue
-            if item in ignored_items:
-                continue
+    @staticmethod
+    def _to_listing(
+        real_target: str, candidates: List[Tuple[str, bool, os.DirEntry]]
+    ) -> Listing:
+        return Listing(
+            real_target,
+            [candidate[0] for candidate in candidates],
+            [candidate[1] for candidate in candidates],
+        )
 
-            visible_items.append((item, is_dir))
+    def _merge_chunk(
+        self,
+        real_target: str,
+        candidates: List[Tuple[str, bool, os.DirEntry]],
+        chunk: List[Tuple[str, bool, os.DirEntry]],
+        sort_mode: str,
+    ) -> None:
+        """Filter *chunk* and merge it into the sorted *candidates* in place.
+
+        Timsort merges the already-sorted prefix with the new run in linear
+        time, so doubling chunks keep the total cost close to one sort.
+        """
+        if chunk:
+            ignored_items = self._get_git_ignored_items(
+                real_target, [(name, is_dir) for name, is_dir, _entry in chunk]
+            )
+            if ignored_items:
+                chunk = [
+                    candidate for candidate in chunk if candidate[0] not in ignored_items
+                ]
+            candidates.extend(chunk)
 
         if sort_mode == "alpha":
-            visible_items.sort(key=self._alpha_sort_key)
+            candidates.sort(key=self._alpha_sort_key)
         else:
             reverse = sort_mode == "mtime_desc"
-            visible_items.sort(
-                key=self._mtime_sort_key_factory(target_path), reverse=reverse
-            )
+            candidates.sort(key=self._mtime_sort_key, reverse=reverse)
 
-        real_path = os.path.realpath(target_path)
-        self._cache[real_path] = visible_items[:]
-        return visible_items
+    def _scan_entries(
+        self, target_path: str
+    ) -> Optional[Iterator[Tuple[os.DirEntry, bool]]]:
+        """Open *target_path* for one pass; only symlinks are stat'ed (to drop dangling ones).
 
-    def _get_git_ignored_items(self, target_path: str, raw_items: List[str]) -> set:
-        real_target = os.path.realpath(target_path)
+        Returns None when it cannot be read, and raises FileNotFoundError or
+        NotADirectoryError when there is no directory there at all.
+        """
+        try:
+            iterator = os.scandir(target_path)
+        except (FileNotFoundError, NotADirectoryError):
+            raise
+        except OSError:
+            return None
+        return self._iter_entries(iterator)
+
+    @staticmethod
+    def _iter_entries(iterator) -> Iterator[Tuple[os.DirEntry, bool]]:
+        with iterator:
+            while True:
+                try:
+                    entry = next(iterator)
+                except StopIteration:
+                    return
+                except OSError:
+                    # The directory went away (or the mount failed) mid-read.
+                    return
+                try:
+                    if entry.is_symlink():
+                        entry.stat()
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+                yield entry, is_dir
+
+    def _get_git_ignored_items(
+        self, real_target: str, entries: List[Tuple[str, bool]]
+    ) -> set:
+        if not entries:
+            return set()
         repo_root = self._get_git_repo_root(real_target)
         if not repo_root:
             return set()
+        rel_dir = os.path.relpath(real_target, repo_root).replace("\\", "/")
+        if rel_dir == os.curdir:
+            rel_dir = ""
         candidates: List[Tuple[str, str, str, bool]] = []
-        for item in raw_items:
+        for item, is_dir in entries:
             full_path = os.path.join(real_target, item)
-            if not os.path.exists(full_path):
-                continue
-            rel_path = os.path.relpath(full_path, repo_root).replace("\\", "/")
-            candidates.append((item, full_path, rel_path, os.path.isdir(full_path)))
+            rel_path = f"{rel_dir}/{item}" if rel_dir else item
+            candidates.append((item, full_path, rel_path, is_dir))
 
-        if not candidates:
-            return set()
-
-        ignored_sources = self._get_git_ignore_sources(
-            repo_root,
-            [rel_path for _item, _full_path, rel_path, _is_dir in candidates],
-        )
+        ignored_sources = self._get_git_ignore_sources(repo_root, rel_dir, entries)
         if not ignored_sources:
             return set()
 
@@ -128,36 +529,49 @@ class DirectoryManager:
         return ignored_items
 
     def _get_git_ignore_sources(
-        self, repo_root: str, rel_paths: List[str]
+        self, repo_root: str, rel_dir: str, entries: List[Tuple[str, bool]]
     ) -> Dict[str, str]:
-        if not rel_paths:
-            return {}
+        """Map ignored repo-relative paths to the ignore file that matched them.
 
-        try:
-            result = subprocess.run(
-                ["git", "-C", repo_root, "check-ignore", "-v", "--stdin"],
-                input="\n".join(rel_paths) + "\n",
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-        except (FileNotFoundError, OSError):
-            return {}
-
-        if result.returncode not in (0, 1):
+        The compiled in-process engine answers by default; with
+        ``gitignore_engine = "git"`` the question goes to ``git check-ignore``.
+        """
+        if not entries:
             return {}
-
-        sources: Dict[str, str] = {}
-        for line in result.stdout.splitlines():
-            if "\t" not in line:
-                continue
-            source_info, rel_path = line.rsplit("\t", 1)
-            parts = source_info.split(":", 2)
-            if len(parts) != 3:
-                continue
-            source_path, _line_number, _pattern = parts
-            sources[rel_path.replace("\\", "/")] = source_path.replace("\\", "/")
-        return sources
+        if self.gitignore_engine != "git":
+            return self._ignore_matcher(repo_root).ignore_sources(rel_dir, entries)
+
+        with self._cache_lock:
+            process = self._check_ignore_processes.get(repo_root)
+            if process is None:
+                process = GitCheckIgnore(repo_root)
+                self._check_ignore_processes[repo_root] = process
+        rel_paths = [f"{rel_dir}/{name}" if rel_dir else name for name, _ in entries]
+        sources = process.query(rel_paths, self._ignore_files_for(repo_root, rel_dir))
+        return sources or {}
+
+    def _ignore_matcher(self, repo_root: str) -> RepoIgnoreMatcher:
+        matcher = self._ignore_matchers.get(repo_root)
+        if matcher is None:
+            # Built outside the lock: it resolves the git directory.
+            created = RepoIgnoreMatcher(repo_root)
+            with self._cache_lock:
+                matcher = self._ignore_matchers.setdefault(repo_root, created)
+        return matcher
+
+    def _ignore_files_for(self, repo_root: str, rel_dir: str) -> List[str]:
+        """Ignore files git consults for entries of *rel_dir*.
+
+        The exclude files come from the repository's matcher, which follows
+        gitfiles to the common git directory and honours core.excludesFile.
+        """
+        files = self._ignore_matcher(repo_root).exclude_files()
+        current = repo_root
+        files.append(os.path.join(current, ".gitignore"))
+        for part in rel_dir.split("/") if rel_dir else ():
+            current = os.path.join(current, part)
+            files.append(os.path.join(current, ".gitignore"))
+        return files
 
     def _is_oincluded(
         self,
@@ -174,54 +588,29 @@ class DirectoryManager:
         source_dir = (
             os.path.join(repo_root, source_dir_rel) if source_dir_rel else repo_root
         )
-        patterns = self._get_oinclude_patterns(source_dir)
-        if not patterns:
+        include_rules = self._get_oinclude_rules(source_dir)
+        if not include_rules:
             return False
 
         rel_path = os.path.relpath(full_path, source_dir).replace("\\", "/")
-        item_name = os.path.basename(full_path)
-        matched = any(
-            self._matches_oinclude_pattern(pattern, rel_path, item_name, is_dir)
-            for pattern in patterns
-        )
-        if not matched:
+        if not include_rules.matches(rel_path, os.path.basename(full_path)):
             return False
         return not self._is_reignored_by_nested_gitignore(source_dir, full_path, is_dir)
 
-    def _get_oinclude_patterns(self, source_dir: str) -> List[str]:
+    def _get_oinclude_rules(self, source_dir: str) -> IncludeRuleSet:
         real_source_dir = os.path.realpath(source_dir)
-        cached = self._oinclude_cache.get(real_source_dir)
+        with self._cache_lock:
+            cached = self._oinclude_cache.get(real_source_dir)
+            epoch = self._ignore_epoch
         if cached is not None:
             return cached
 
         include_path = os.path.join(real_source_dir, ".oinclude")
-        patterns = self._read_pattern_file(include_path)
-        self._oinclude_cache[real_source_dir] = patterns
-        return patterns
-
-    def _matches_oinclude_pattern(
-        self,
-        pattern: str,
-        rel_path: str,
-        item_name: str,
-        is_dir: bool,
-    ) -> bool:
-        normalized = pattern.replace("\\", "/").lstrip("/")
-        if not normalized:
-            return False
-
-        if normalized.endswith("/"):
-            base = normalized.rstrip("/")
-            return bool(base) and (
-                rel_path == base or rel_path.startswith(base + "/")
-            )
-
-        if "/" in normalized:
-            return fnmatch.fnmatch(rel_path, normalized)
-
-        return fnmatch.fnmatch(item_name, normalized) or fnmatch.fnmatch(
-            rel_path, normalized
-        )
+        rules = IncludeRuleSet(read_pattern_lines(include_path))
+        with self._cache_lock:
+            if epoch == self._ignore_epoch:
+                self._oinclude_cache[real_source_dir] = rules
+        return rules
 
     def _is_reignored_by_nested_gitignore(
         self, source_dir: str, full_path: str, is_dir: bool
@@ -248,106 +637,84 @@ class DirectoryManager:
             current = parent
 
         for nested_dir in reversed(nested_dirs):
-            patterns = self._get_nested_gitignore_patterns(nested_dir)
-            if not patterns:
+            rules = self._get_nested_gitignore_rules(nested_dir)
+            if not rules:
                 continue
             rel_path = os.path.relpath(full_path, nested_dir).replace("\\", "/")
-            item_name = os.path.basename(full_path)
-            if any(
-                self._matches_gitignore_pattern(pattern, rel_path, item_name, is_dir)
-                for pattern in patterns
-            ):
+            if self._is_ignored_by_rules(rules, rel_path, is_dir):
                 return True
 
         return False
 
-    def _get_nested_gitignore_patterns(self, directory: str) -> List[str]:
+    def _get_nested_gitignore_rules(self, directory: str) -> IgnoreRuleSet:
         real_directory = os.path.realpath(directory)
-        cached = self._nested_gitignore_cache.get(real_directory)
+        with self._cache_lock:
+            cached = self._nested_gitignore_cache.get(real_directory)
+            epoch = self._ignore_epoch
         if cached is not None:
             return cached
 
-        patterns = self._read_pattern_file(os.path.join(real_directory, ".gitignore"))
-        self._nested_gitignore_cache[real_directory] = patterns
-        return patterns
-
-    def _read_pattern_file(self, path: str) -> List[str]:
-        patterns: List[str] = []
-        try:
-            with open(path, "r", encoding="utf-8") as fh:
-                for line in fh:
-                    stripped = line.strip()
-                    if not stripped or stripped.startswith("#"):
-                        continue
-                    patterns.append(stripped)
-        except OSError:
-            return []
-        return patterns
+        rules = load_rule_set(os.path.join(real_directory, ".gitignore"), ".gitignore")
+        with self._cache_lock:
+            if epoch == self._ignore_epoch:
+                self._nested_gitignore_cache[real_directory] = rules
+        return rules
 
-    def _matches_gitignore_pattern(
-        self,
-        pattern: str,
-        rel_path: str,
-        item_name: str,
-        is_dir: bool,
+    def _is_ignored_by_rules(
+        self, rules: IgnoreRuleSet, rel_path: str, is_dir: bool
     ) -> bool:
-        normalized = pattern.replace("\\", "/").lstrip("/")
-        if not normalized or normalized.startswith("!"):
-            return False
-
-        if normalized.endswith("/"):
-            base = normalized.rstrip("/")
-            return bool(base) and (
-                rel_path == base or rel_path.startswith(base + "/")
-            )
-
-        if is_dir and normalized.endswith("/*"):
-            base = normalized[:-2]
-            if self._matches_gitignore_pathspec(base, rel_path):
+        # Anything below an ignored directory is ignored as well.
+        parts = rel_path.split("/")
+        for depth in range(1, len(parts)):
+            rule = rules.match("/".join(parts[:depth]), True)
+            if rule is not None and not rule.negated:
                 return True
-
-        if "/" in normalized:
-            return self._matches_gitignore_pathspec(normalized, rel_path)
-
-        return fnmatch.fnmatch(item_name, normalized)
-
-    def _matches_gitignore_pathspec(self, pattern: str, rel_path: str) -> bool:
-        if fnmatch.fnmatch(rel_path, pattern):
-            return True
-        if pattern.startswith("**/"):
-            suffix = pattern[3:]
-            return rel_path == suffix or rel_path.endswith("/" + suffix)
-        return False
+        rule = rules.match(rel_path, is_dir)
+        if rule is None and is_dir:
+            # A directory whose entries are all ignored ("cache/*") is hidden
+            # too; probing "<dir>/" lets such a rule match an empty child name.
+            rule = rules.match(rel_path + "/", False)
+        return rule is not None and not rule.negated
 
     def _get_git_repo_root(self, target_path: str) -> Optional[str]:
-        cached = self._git_repo_cache.get(target_path)
-        if target_path in self._git_repo_cache:
+        """Find the work tree containing *target_path* by walking up to ``.git``.
+
+        Every directory passed on the way is memoized, so later lookups below
+        or beside it stop at the first known ancestor. Runs on listing
+        workers; the trie is only touched under the cache lock.
+        """
+        cache = self._git_repo_cache
+        with self._cache_lock:
+            cached = cache.get(target_path, _UNKNOWN)
+            epoch = self._ignore_epoch
+        if cached is not _UNKNOWN:
             return cached
 
-        for known_path, known_root in self._git_repo_cache.items():
-            if not known_root:
-                continue
-            if target_path == known_root or target_path.startswith(f"{known_root}{os.sep}"):
-                self._git_repo_cache[target_path] = known_root
-                return known_root
-
-        try:
-            result = subprocess.run(
-                ["git", "-C", target_path, "rev-parse", "--show-toplevel"],
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-        except (FileNotFoundError, OSError):
-            self._git_repo_cache[target_path] = None
-            return None
-
-        if result.returncode != 0:
-            self._git_repo_cache[target_path] = None
-            return None
+        visited: List[str] = []
+        repo_root: Optional[str] = None
+        current = target_path
+        while True:
+            with self._cache_lock:
+                cached = cache.get(current, _UNKNOWN)
+            if cached is not _UNKNOWN:
+                repo_root = cached
+                break
+            visited.append(current)
+            if os.path.basename(current) == ".git":
+                # Inside a git directory there is no work tree.
+                break
+            if is_worktree_root(current):
+                repo_root = current
+                break
+            parent = os.path.dirname(current)
+            if parent == current or parent in self._git_ceilings:
+                break
+            current = parent
 
-        repo_root = result.stdout.strip() or None
-        self._git_repo_cache[target_path] = repo_root
+        with self._cache_lock:
+            if epoch == self._ignore_epoch:
+                for directory in visited:
+                    cache[directory] = repo_root
         return repo_root
 
     def _normalize_pattern(self, pattern: str) -> str:
@@ -386,18 +753,21 @@ class DirectoryManager:
 
         lowered = [self._normalize_pattern(p).lower() for p in patterns if p]
 
-        return [
-            item
-            for item in all_items
-            if any(fnmatch.fnmatch(item[0].lower(), pat) for pat in lowered)
-        ]
+        return all_items.subset(
+            index
+            for index, name in enumerate(all_items.names())
+            if any(fnmatch.fnmatch(name.lower(), pat) for pat in lowered)
+        )
 
     def set_sort_mode(self, mode: str):
         if mode in {"alpha", "mtime_asc", "mtime_desc"}:
             if self.sort_mode == mode:
                 return
             self.sort_mode = mode
-            self.refresh_cache()
+            with self._cache_lock:
+                self._listing_epoch += 1
+                self._retire_listings(list(self._cache))
+            self._bump_generation()
 
     def set_sort_mode_for_path(self, path: str, mode: str):
         if mode not in {"alpha", "mtime_asc", "mtime_desc"}:
@@ -406,20 +776,78 @@ class DirectoryManager:
             return
         real_path = os.path.realpath(path)
         self.sort_map[real_path] = mode
-        self._cache.pop(real_path, None)
+        with self._cache_lock:
+            self._listing_epoch += 1
+            self._retire_listings([real_path])
+        self._bump_generation()
 
     def refresh_cache(self, path: Optional[str] = None):
         if path:
-            real = os.path.realpath(path)
-            self._cache.pop(real, None)
-        else:
-            self._cache.clear()
-        self._git_repo_cache.clear()
-        self._oinclude_cache.clear()
-        self._nested_gitignore_cache.clear()
+            self.invalidate_directory(path)
+            return
+        with self._cache_lock:
+            self._listing_epoch += 1
+            self._ignore_epoch += 1
+            self._retire_listings(list(self._cache))
+            self._partial.clear()
+            self._real_paths.clear()
+            self._missing.clear()
+            self._git_repo_cache.clear()
+            self._oinclude_cache.clear()
+            self._nested_gitignore_cache.clear()
+            self._ignore_matchers.clear()
+            processes = dict(self._check_ignore_processes)
+            self._check_ignore_processes.clear()
+        _close_processes(processes)
+        self._bump_generation()
+
+    def close(self) -> None:
+        """Stop the listing workers and the git coprocesses."""
+        if self.listing_workers is not None:
+            self.listing_workers.close()
+            self.listing_workers = None
+        _close_processes(self._check_ignore_processes)
+
+    def invalidate_directory(self, path: str, *, recursive: bool = False) -> bool:
+        """Drop the listing and ignore-file caches of one directory.
+
+        With *recursive*, cached listings below it are dropped as well (an
+        edited ``.gitignore`` can change any of them). Returns True when a
+        cached listing was discarded.
+        """
+        real = os.path.realpath(path)
+        with self._cache_lock:
+            self._ignore_epoch += 1
+            dropped = self._retire_listings([real])
+            # A .git appearing or vanishing here changes every directory below.
+            self._git_repo_cache.discard_subtree(real)
+            self._oinclude_cache.pop(real, None)
+            self._nested_gitignore_cache.pop(real, None)
+            if recursive:
+                prefix = real.rstrip(os.sep) + os.sep
+                nested = [key for key in self._cache if key.startswith(prefix)]
+                dropped = self._retire_listings(nested) or dropped
+        self._bump_generation()
+        return dropped
+
+    def _retire_listings(self, real_paths: List[str]) -> bool:
+        """Drop cached listings but keep drawing them until they are redone.
+
+        Called with the cache lock held. Returns True when any was cached.
+        """
+        retired = False
+        for real_path in real_paths:
+            cached = self._cache.pop(real_path, None)
+            if cached is not None:
+                self._last_known[real_path] = cached.items
+                retired = True
+        return retired
+
+    def sort_mode_for(self, real_path: str) -> str:
+        return self.sort_map.get(real_path, self.sort_mode)
 
     def _alpha_sort_key(self, entry):
-        name, is_dir = entry
+        name, is_dir = entry[0], entry[1]
         hidden = name.startswith(".")
         if hidden:
             group = 2 if is_dir else 3
@@ -427,14 +855,10 @@ class DirectoryManager:
             group = 0 if is_dir else 1
         return (group, name.lower())
 
-    def _mtime_sort_key_factory(self, base_path: str):
-        def sorter(entry):
-            name, _ = entry
-            full_path = os.path.join(base_path, name)
-            try:
-                mtime = os.path.getmtime(full_path)
-            except Exception:
-                mtime = 0
-            return (mtime, name.lower())
-
-        return sorter
+    def _mtime_sort_key(self, entry):
+        name, _is_dir, dir_entry = entry
+        try:
+            mtime = dir_entry.stat().st_mtime
+        except OSError:
+            mtime = 0
+        return (mtime, name.lower())
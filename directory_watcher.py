@@ -0,0 +1,295 @@
+"""Live directory change notifications backed by Linux inotify (via ctypes)."""
+
+from __future__ import annotations
+
+import ctypes
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+
+# Entries appearing, disappearing or being renamed change a listing outright.
+STRUCTURE_MASK = (
+    IN_CREATE
+    | IN_DELETE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_Q_OVERFLOW
+)
+# Writes and touches only matter to mtime ordering (and ignore files).
+CONTENT_MASK = IN_CLOSE_WRITE | IN_ATTRIB
+WATCH_MASK = STRUCTURE_MASK | CONTENT_MASK | IN_ONLYDIR
+
+_EVENT_HEADER = struct.Struct("iIII")
+# Past this many queued events a directory is simply reported as changed.
+_MAX_EVENTS_PER_PATH = 256
+# Seconds before a failed watch is tried again, doubling up to the maximum.
+RETRY_BACKOFF = 1.0
+MAX_RETRY_BACKOFF = 60.0
+
+WatchEvent = Tuple[int, str]
+
+
+def _load_inotify():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        init1 = libc.inotify_init1
+        add_watch = libc.inotify_add_watch
+        rm_watch = libc.inotify_rm_watch
+    except (OSError, AttributeError):
+        return None
+    init1.argtypes = [ctypes.c_int]
+    init1.restype = ctypes.c_int
+    add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    add_watch.restype = ctypes.c_int
+    rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    rm_watch.restype = ctypes.c_int
+    return init1, add_watch, rm_watch
+
+
+class DirectoryWatcher:
+    """Watch a set of directories and queue their change events.
+
+    A daemon thread blocks on the inotify descriptor and only collects events;
+    the UI thread picks them up with ``drain()``. When inotify is unavailable
+    the watcher stays inert and ``available`` is False.
+    """
+
+    def __init__(self, on_event: Optional[Callable[[], None]] = None):
+        self.on_event = on_event
+        self.available = False
+        self._fd = -1
+        self._api = _load_inotify()
+        self._lock = threading.Lock()
+        self._wd_paths: Dict[int, Set[str]] = {}
+        self._path_wds: Dict[str, int] = {}
+        self._pending: Dict[str, Optional[List[WatchEvent]]] = {}
+        # path -> (errno, backoff, retry_at) for watches the kernel refused.
+        self._failed: Dict[str, Tuple[int, float, float]] = {}
+        # Bumped whenever a watch goes away; ENOSPC failures wait for it.
+        self.freed_watches = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop_r = self._stop_w = -1
+
+        if self._api is None:
+            return
+        fd = self._api[0](IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return
+        self._fd = fd
+        self._stop_r, self._stop_w = os.pipe()
+        self._thread = threading.Thread(
+            target=self._read_events, name="o-directory-watcher", daemon=True
+        )
+        self._thread.start()
+        self.available = True
+
+    @property
+    def watched_paths(self) -> Set[str]:
+        with self._lock:
+            return set(self._path_wds)
+
+    @property
+    def failed_paths(self) -> Dict[str, int]:
+        """Paths that could not be watched, with the errno that refused them."""
+        with self._lock:
+            return {path: failure[0] for path, failure in self._failed.items()}
+
+    def watch_paths(self, paths: Iterable[str]) -> None:
+        """Reconcile the watch set with *paths*, adding and removing watches.
+
+        Paths the kernel refused are retried with a doubling backoff; once
+        the watch limit is hit (ENOSPC) no path is tried again until a
+        watch has been freed.
+        """
+        if not self.available or self._api is None:
+            return
+        desired = {path for path in paths if path}
+        with self._lock:
+            current = set(self._path_wds)
+            for path in self._failed.keys() - desired:
+                del self._failed[path]
+        for path in current - desired:
+            self._remove_watch(path)
+        now = time.monotonic()
+        limit_reached = False
+        for path in desired - current:
+            failure = self._failed.get(path)
+            if failure is not None and now < failure[2]:
+                continue
+            if limit_reached:
+                self._record_failure(path, errno.ENOSPC, now)
+                continue
+            error = self._add_watch(path)
+            if error:
+                self._record_failure(path, error, now)
+                limit_reached = error == errno.ENOSPC
+
+    def _add_watch(self, path: str) -> int:
+        """Watch *path*; return 0, or the errno when the kernel refuses."""
+        assert self._api is not None
+        try:
+            encoded = os.fsencode(path)
+        except (TypeError, ValueError):
+            return errno.EINVAL
+        wd = self._api[1](self._fd, encoded, WATCH_MASK)
+        if wd < 0:
+            # ENOENT, EACCES or ENOSPC (watch limit): fall back to stat checks.
+            return ctypes.get_errno() or errno.EINVAL
+        with self._lock:
+            self._failed.pop(path, None)
+            self._path_wds[path] = wd
+            self._wd_paths.setdefault(wd, set()).add(path)
+        return 0
+
+    def _record_failure(self, path: str, error: int, now: float) -> None:
+        with self._lock:
+            if error == errno.ENOSPC:
+                self._failed[path] = (error, 0.0, float("inf"))
+                return
+            previous = self._failed.get(path)
+            backoff = RETRY_BACKOFF
+            if previous is not None and previous[1]:
+                backoff = min(previous[1] * 2, MAX_RETRY_BACKOFF)
+            self._failed[path] = (error, backoff, now + backoff)
+
+    def _watch_freed(self) -> None:
+        # Called with the lock held: a slot is free, so retry the limit victims.
+        self.freed_watches += 1
+        for path, failure in list(self._failed.items()):
+            if failure[0] == errno.ENOSPC:
+                del self._failed[path]
+
+    def _remove_watch(self, path: str) -> None:
+        assert self._api is not None
+        with self._lock:
+            wd = self._path_wds.pop(path, None)
+            if wd is None:
+                return
+            paths = self._wd_paths.get(wd)
+            if paths is not None:
+                paths.discard(path)
+                if paths:
+                    return
+                self._wd_paths.pop(wd, None)
+            self._watch_freed()
+        self._api[2](self._fd, wd)
+
+    def drain(self) -> Dict[str, Optional[List[WatchEvent]]]:
+        """Return and clear queued events keyed by watched path.
+
+        A value of None means the directory changed in an unspecified way
+        (queue overflow or too many events) and must be treated as stale.
+        """
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+        return pending
+
+    def close(self) -> None:
+        if not self.available:
+            return
+        self.available = False
+        try:
+            os.write(self._stop_w, b"x")
+        except OSError:
+            pass
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        for fd in (self._fd, self._stop_r, self._stop_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._fd = self._stop_r = self._stop_w = -1
+        with self._lock:
+            self._wd_paths.clear()
+            self._path_wds.clear()
+            self._pending.clear()
+            self._failed.clear()
+
+    def _read_events(self) -> None:
+        while True:
+            try:
+                readable, _, _ = select.select([self._fd, self._stop_r], [], [])
+            except (OSError, ValueError):
+                return
+            if self._stop_r in readable:
+                return
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            except OSError:
+                return
+            if self._queue_events(data) and self.on_event is not None:
+                try:
+                    self.on_event()
+                except Exception:
+                    pass
+
+    def _queue_events(self, data: bytes) -> bool:
+        queued = False
+        offset = 0
+        header_size = _EVENT_HEADER.size
+        with self._lock:
+            while offset + header_size <= len(data):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += header_size
+                raw_name = data[offset : offset + length]
+                offset += length
+                name = os.fsdecode(raw_name.rstrip(b"\0"))
+
+                if mask & IN_Q_OVERFLOW:
+                    for path in self._path_wds:
+                        self._pending[path] = None
+                    queued = True
+                    continue
+
+                paths = self._wd_paths.get(wd)
+                if not paths:
+                    continue
+                if mask & IN_IGNORED:
+                    # The kernel dropped the watch (directory removed/unmounted).
+                    for path in paths:
+                        self._path_wds.pop(path, None)
+                        self._pending[path] = None
+                    self._wd_paths.pop(wd, None)
+                    self._watch_freed()
+                    queued = True
+                    continue
+
+                for path in paths:
+                    events = self._pending.get(path, [])
+                    if events is None:
+                        continue
+                    if len(events) >= _MAX_EVENTS_PER_PATH:
+                        self._pending[path] = None
+                    else:
+                        events.append((mask, name))
+                        self._pending[path] = events
+                queued = True
+        return queued
@@ -0,0 +1,373 @@
+"""Version-stamped, virtual snapshot of the displayed tree rows."""
+
+from __future__ import annotations
+
+import os
+import time
+from bisect import bisect_left, bisect_right
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+from directory_manager import REVALIDATE_INTERVAL
+from listing import DisplayRow, Listing
+
+
+class _Node:
+    """One listed directory plus the expanded subtrees spliced into it.
+
+    Nodes are immutable: a change re-creates the node and its ancestors, so
+    snapshots handed out earlier keep describing the rows they were built on.
+    ``size`` is the node's row count including every expanded descendant.
+    """
+
+    __slots__ = ("path", "listing", "depth", "indexes", "nodes", "starts", "extras", "size")
+
+    def __init__(
+        self,
+        path: str,
+        listing: Listing,
+        depth: int,
+        children: Sequence[Tuple[int, "_Node"]] = (),
+    ):
+        self.path = path
+        self.listing = listing
+        self.depth = depth
+        # Expanded entries in listing order, the first row of each subtree
+        # block, and the rows added by the subtrees before it.
+        self.indexes: List[int] = []
+        self.nodes: List[_Node] = []
+        self.starts: List[int] = []
+        self.extras: List[int] = []
+        extra = 0
+        for index, node in sorted(children, key=lambda child: child[0]):
+            self.indexes.append(index)
+            self.nodes.append(node)
+            self.starts.append(index + 1 + extra)
+            self.extras.append(extra)
+            extra += node.size
+        self.size = len(listing) + extra
+
+    def children(self) -> List[Tuple[int, "_Node"]]:
+        return list(zip(self.indexes, self.nodes))
+
+    def child_at(self, index: int) -> Optional["_Node"]:
+        slot = bisect_left(self.indexes, index)
+        if slot < len(self.indexes) and self.indexes[slot] == index:
+            return self.nodes[slot]
+        return None
+
+    def row_of_entry(self, index: int) -> int:
+        """Row of entry *index*, relative to this node's first row."""
+        slot = bisect_left(self.indexes, index)
+        if slot < len(self.indexes):
+            return index + self.extras[slot]
+        return index + self.size - len(self.listing)
+
+    def locate(self, row: int) -> Tuple[Optional[int], int]:
+        """``(slot, row in child)`` when *row* is inside a subtree block,
+        otherwise ``(None, entry index)``."""
+        slot = bisect_right(self.starts, row) - 1
+        if slot < 0:
+            return None, row
+        start = self.starts[slot]
+        if row < start + self.nodes[slot].size:
+            return slot, row - start
+        return None, row - self.extras[slot] - self.nodes[slot].size
+
+
+class DisplayRows(Sequence):
+    """Read-only sequence of ``DisplayRow`` views over a node tree.
+
+    Length is O(1); indexing and slicing bisect the cached subtree sizes, so
+    only the rows asked for are ever materialized.
+    """
+
+    __slots__ = ("root",)
+
+    def __init__(self, root: _Node):
+        self.root = root
+
+    def __len__(self) -> int:
+        return self.root.size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return list(self._iter_from(start, stop - start))
+            return [self[position] for position in range(start, stop, step)]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("display row index out of range")
+        node = self.root
+        while True:
+            slot, index = node.locate(index)
+            if slot is None:
+                return DisplayRow(node.listing, index, node.depth)
+            node = node.nodes[slot]
+
+    def __iter__(self) -> Iterator[DisplayRow]:
+        return self._iter_from(0, len(self))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (DisplayRows, list, tuple)):
+            return len(self) == len(other) and all(
+                row == item for row, item in zip(self, other)
+            )
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"DisplayRows({len(self)} rows)"
+
+    def row_of(self, path: str) -> Optional[int]:
+        """Row displaying *path*, found in O(depth) steps, or None."""
+        node = self.root
+        prefix = node.path.rstrip(os.sep) + os.sep
+        if not path.startswith(prefix):
+            return None
+        parts = path[len(prefix) :].split(os.sep)
+        base = 0
+        for part in parts[:-1]:
+            index = node.listing.index_of(part)
+            child = None if index is None else node.child_at(index)
+            if child is None:
+                return None
+            base += node.row_of_entry(index) + 1
+            node = child
+        index = node.listing.index_of(parts[-1])
+        if index is None:
+            return None
+        return base + node.row_of_entry(index)
+
+    def _iter_from(self, position: int, count: int) -> Iterator[DisplayRow]:
+        if count <= 0 or position >= len(self):
+            return
+        # Frames are [node, next entry, next child slot]; descend to the row
+        # at *position*, leaving each ancestor's resume point on the stack.
+        stack: List[List[Any]] = []
+        node = self.root
+        while True:
+            slot, row = node.locate(position)
+            if slot is None:
+                stack.append([node, row, bisect_left(node.indexes, row)])
+                break
+            stack.append([node, node.indexes[slot] + 1, slot + 1])
+            node = node.nodes[slot]
+            position = row
+
+        while stack and count > 0:
+            frame = stack[-1]
+            node, entry, slot = frame
+            if entry >= len(node.listing):
+                stack.pop()
+                continue
+            yield DisplayRow(node.listing, entry, node.depth)
+            count -= 1
+            frame[1] = entry + 1
+            if slot < len(node.indexes) and node.indexes[slot] == entry:
+                frame[2] = slot + 1
+                stack.append([node.nodes[slot], 0, 0])
+
+
+class DisplayModel:
+    """Build the navigator's display rows once per state change.
+
+    The snapshot is a tree of listed directories with cached subtree sizes,
+    stamped with the directory manager's generation and the expansion set's
+    version. Rows are views created on access, so a frame costs time in
+    proportion to the rows drawn rather than to the size of the tree.
+
+    When only the expansion set moved and its change log covers the gap,
+    expanding or collapsing re-creates just the affected directory's node and
+    its ancestors; everything else is shared with the previous snapshot.
+
+    Listings the directory watcher does not cover can go stale on disk
+    without moving the generation, so once the snapshot is older than
+    REVALIDATE_INTERVAL those directories are re-validated, which re-lists
+    changed ones and moves the generation.
+    """
+
+    def __init__(self, navigator: Any):
+        self.nav = navigator
+        self._rows: Optional[DisplayRows] = None
+        self._source: Tuple[int, int, int] = (0, 0, 0)
+        self._version = 0
+        self._checked_at = 0.0
+        self.builds = 0
+        self.splices = 0
+
+    def rows(self, offset: int = 0, count: Optional[int] = None):
+        """The current snapshot, or a list of *count* rows from *offset*."""
+        now = time.monotonic()
+        if self._rows is None or not self._is_current(now):
+            self._rebuild(now)
+        assert self._rows is not None
+        if count is None:
+            return self._rows if offset == 0 else self._rows[offset:]
+        return self._rows[offset : offset + count]
+
+    def __len__(self) -> int:
+        return len(self.rows())
+
+    def invalidate(self) -> None:
+        self._rows = None
+
+    def row_of(self, path: str, resolve: bool = False) -> Optional[int]:
+        """Row index of *path* in the current snapshot, or None.
+
+        With *resolve*, a path that is not displayed verbatim is matched
+        against the rows' real paths (a slow scan, for symlinked rows).
+        """
+        rows = self.rows()
+        row = rows.row_of(path)
+        if row is None and resolve:
+            real = os.path.realpath(path)
+            row = rows.row_of(real)
+            if row is None:
+                for index, item in enumerate(rows):
+                    if os.path.realpath(item.path) == real:
+                        return index
+        return row
+
+    def _is_current(self, now: float) -> bool:
+        if self._source != self._current_source() or not self._catch_up():
+            return False
+        if now - self._checked_at < REVALIDATE_INTERVAL:
+            return True
+        self._revalidate()
+        self._checked_at = now
+        return self._source == self._current_source()
+
+    # ------------------------------------------------------------------
+    # Full builds
+
+    def _current_source(self) -> Tuple[int, int, int]:
+        return (
+            id(self.nav.dir_manager),
+            self.nav.dir_manager.generation,
+            id(self.nav.expanded_nodes),
+        )
+
+    def _rebuild(self, now: float) -> None:
+        dir_manager = self.nav.dir_manager
+        with dir_manager.building_view() as view:
+            listing = dir_manager.get_filtered_items()
+            root = self._build_node(dir_manager.current_path, listing, 0)
+        self._rows = DisplayRows(root)
+        # Listings this build waited on are already in the rows, and so are
+        # expansions it dropped for vanished directories.
+        self._source = (id(dir_manager), view.generation, id(self.nav.expanded_nodes))
+        self._version = self.nav.expanded_nodes.version
+        self._checked_at = now
+        self.builds += 1
+
+    def _build_node(self, path: str, listing: Listing, depth: int) -> _Node:
+        if listing.parent != path:
+            listing = listing.rebased(path)
+        children: List[Tuple[int, _Node]] = []
+        for child_path in self.nav.expanded_nodes.children_of(path):
+            index = listing.index_of(os.path.basename(child_path))
+            if index is None or not listing.is_dir_at(index):
+                continue
+            child = self._load_node(child_path, depth + 1)
+            if child is not None:
+                children.append((index, child))
+        return _Node(path, listing, depth, children)
+
+    def _load_node(self, path: str, depth: int) -> Optional[_Node]:
+        dir_manager = self.nav.dir_manager
+        listing = dir_manager.get_listing(path)
+        # Both come from the listing job; nothing here touches the filesystem.
+        if not listing and dir_manager.is_missing(path):
+            self.nav.expanded_nodes.discard(path)
+            return None
+        real = dir_manager.real_path_of(path)
+        if real is not None:
+            self.nav.expanded_nodes.set_real(path, real)
+        return self._build_node(path, listing, depth)
+
+    def _revalidate(self) -> None:
+        assert self._rows is not None
+        watcher = getattr(self.nav, "directory_watcher", None)
+        # Watched directories report their own changes.
+        watched = watcher.watched_paths if watcher is not None else set()
+        dir_manager = self.nav.dir_manager
+        stack = [self._rows.root]
+        with dir_manager.wait_budget():
+            while stack:
+                node = stack.pop()
+                if node.path not in watched:
+                    dir_manager.get_listing(node.path)
+                stack.extend(node.nodes)
+
+    # ------------------------------------------------------------------
+    # Splices
+
+    def _catch_up(self) -> bool:
+        """Apply logged expansion changes; False when a rebuild is needed."""
+        expanded = self.nav.expanded_nodes
+        dir_manager = self.nav.dir_manager
+        generation = self._source[1]
+        while self._version != expanded.version:
+            changes = expanded.changes_since(self._version)
+            if changes is None:
+                return False
+            for version, op, path in changes:
+                if op not in ("add", "discard") or path is None:
+                    return False
+                with dir_manager.building_view() as view:
+                    self._splice(path, op == "add")
+                if view.start == generation:
+                    generation = view.generation
+                self._version = version
+        # As with full builds, listings the splices waited on are in the rows.
+        self._source = (id(dir_manager), generation, id(expanded))
+        return True
+
+    def _splice(self, path: str, expand: bool) -> None:
+        trail = self._trail_to(os.path.dirname(path))
+        if trail is None:
+            return
+        parent = trail[-1][1]
+        index = parent.listing.index_of(os.path.basename(path))
+        if index is None or not parent.listing.is_dir_at(index):
+            return
+        shown = parent.child_at(index) is not None
+        if expand == shown:
+            return
+        children = [child for child in parent.children() if child[0] != index]
+        if expand:
+            child = self._load_node(path, parent.depth + 1)
+            if child is None:
+                return
+            children.append((index, child))
+        node = _Node(parent.path, parent.listing, parent.depth, children)
+        for slot in range(len(trail) - 1, 0, -1):
+            entry = trail[slot][0]
+            ancestor = trail[slot - 1][1]
+            siblings = [child for child in ancestor.children() if child[0] != entry]
+            siblings.append((entry, node))
+            node = _Node(ancestor.path, ancestor.listing, ancestor.depth, siblings)
+        self._rows = DisplayRows(node)
+        self.splices += 1
+
+    def _trail_to(self, path: str) -> Optional[List[Tuple[int, _Node]]]:
+        """Nodes from the root down to *path*, each with its entry index."""
+        assert self._rows is not None
+        node = self._rows.root
+        trail = [(-1, node)]
+        if path == node.path:
+            return trail
+        prefix = node.path.rstrip(os.sep) + os.sep
+        if not path.startswith(prefix):
+            return None
+        for part in path[len(prefix) :].split(os.sep):
+            index = node.listing.index_of(part)
+            child = None if index is None else node.child_at(index)
+            if child is None:
+                return None
+            node = child
+            trail.append((index, node))
+        return trail
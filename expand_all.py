@@ -0,0 +1,139 @@
+"""Budgeted, cancellable expand-all that lists directories in the background."""
+
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, List, Optional, Set, Tuple
+
+from listing_workers import DEFAULT_MAX_WORKERS, ListingWorkers
+
+DEFAULT_MAX_ENTRIES = 20000
+DEFAULT_MAX_DEPTH = 12
+
+
+class ExpandAllJob:
+    """Expand every directory below *root*, breadth first, within a budget.
+
+    Directories are listed on the directory manager's listing workers, or on
+    a private pool when it lists synchronously. ``poll`` runs on the UI thread:
+    it expands each directory whose listing has arrived, so subtrees show up
+    as they finish, and queues the subdirectories while the entry and depth
+    budgets last. ``expand`` is only ever called from ``poll``.
+    """
+
+    def __init__(
+        self,
+        dir_manager: Any,
+        root: str,
+        expand: Callable[[str], bool],
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        on_done: Optional[Callable[[], None]] = None,
+    ):
+        self.dir_manager = dir_manager
+        self.root = os.path.realpath(root)
+        self.expand = expand
+        self.max_entries = max(1, max_entries)
+        self.max_depth = max(1, max_depth)
+        shared = getattr(dir_manager, "listing_workers", None)
+        self._owns_workers = shared is None
+        self.workers = (
+            ListingWorkers(max_workers, on_done) if shared is None else shared
+        )
+        self._frontier: Deque[Tuple[str, int]] = deque([(self.root, 0)])
+        self._visited: Set[str] = {self.root}
+        self._running: List[Tuple[str, int, Future]] = []
+        self.expanded = 0
+        self.entries = 0
+        self.truncated = False
+        self.cancelled = False
+        self._submit()
+
+    @property
+    def done(self) -> bool:
+        return self.cancelled or (not self._frontier and not self._running)
+
+    def poll(self) -> bool:
+        """Apply finished listings; True when anything new was expanded."""
+        if self.done:
+            return False
+        progressed = False
+        running: List[Tuple[str, int, Future]] = []
+        for path, depth, future in self._running:
+            if not future.done():
+                running.append((path, depth, future))
+                continue
+            try:
+                entry_count, child_dirs = future.result()
+            except Exception:
+                continue
+            self.entries += entry_count
+            if depth > 0 and self.expand(path):
+                self.expanded += 1
+                progressed = True
+            self._queue_children(child_dirs, depth + 1)
+        self._running = running
+        self._submit()
+        if self.done and self._owns_workers:
+            self.workers.close()
+        return progressed
+
+    def cancel(self) -> None:
+        self.cancelled = True
+        self._frontier.clear()
+        for _path, _depth, future in self._running:
+            future.cancel()
+        self._running = []
+        if self._owns_workers:
+            self.workers.close()
+
+    def status_text(self) -> str:
+        return (
+            f"Expanding… {self.expanded} directories, "
+            f"{self.entries} entries (Esc to cancel)"
+        )
+
+    def summary(self) -> str:
+        if self.cancelled:
+            return f"Expand cancelled after {self.expanded} directories"
+        if not self.expanded:
+            return "No directories expanded"
+        message = f"Expanded {self.expanded} directories"
+        if self.truncated:
+            message += " (limit reached)"
+        return message
+
+    def _queue_children(self, child_dirs: List[str], depth: int) -> None:
+        for child in child_dirs:
+            if child in self._visited:
+                continue
+            if depth > self.max_depth:
+                self.truncated = True
+                return
+            self._visited.add(child)
+            self._frontier.append((child, depth))
+
+    def _submit(self) -> None:
+        limit = self.workers.max_workers * 2
+        while self._frontier and len(self._running) < limit:
+            if self.entries >= self.max_entries:
+                self.truncated = True
+                self._frontier.clear()
+                return
+            path, depth = self._frontier.popleft()
+            # Keyed apart from the manager's own listing job for the same path.
+            future = self.workers.submit(("expand-all", path), self._scan, path)
+            self._running.append((path, depth, future))
+
+    def _scan(self, path: str) -> Tuple[int, List[str]]:
+        listing = self.dir_manager.load_listing(path)
+        child_dirs = [
+            os.path.realpath(listing.path_at(index))
+            for index in range(len(listing))
+            if listing.is_dir_at(index)
+        ]
+        return len(listing), child_dirs
@@ -0,0 +1,223 @@
+"""Set of expanded directory paths that counts its own mutations."""
+
+from __future__ import annotations
+
+import os
+from collections import deque
+from typing import Deque, Iterable, List, Optional, Set, Tuple
+
+from path_trie import PathTrie
+
+# Changes remembered for incremental consumers; older ones force a rebuild.
+CHANGE_LOG_SIZE = 256
+
+# (version after the change, "add" / "discard" / "reset", path or None)
+ExpansionChange = Tuple[int, str, Optional[str]]
+
+
+class ExpansionSet(set):
+    """A ``set`` whose ``version`` increases on every in-place mutation.
+
+    Display snapshots record the version they were built from and are rebuilt
+    only after the expansion state actually changed. Single-path additions
+    and removals are also kept in ``changes`` so a snapshot can be patched
+    instead of rebuilt; bulk operations log a "reset".
+
+    Entries are also indexed in path tries, by path and by real path, so
+    branch queries and removals cost time proportional to the path depth and
+    the size of the branch, not of the whole set. Real paths are derived from
+    the parent's without touching the filesystem; ``set_real`` corrects them
+    once a listing job has resolved the actual one.
+    """
+
+    __slots__ = ("version", "changes", "_paths", "_reals")
+
+    def __init__(self, paths: Iterable[str] = ()):
+        super().__init__(paths)
+        self.version = 0
+        self.changes: Deque[ExpansionChange] = deque(maxlen=CHANGE_LOG_SIZE)
+        self._reindex()
+
+    # ------------------------------------------------------------------
+    # Trie index
+
+    def _reindex(self) -> None:
+        # path -> real path, and real path -> set of paths resolving to it
+        self._paths = PathTrie()
+        self._reals = PathTrie()
+        for path in self:
+            self._index(path)
+
+    def _resolve(self, path: str) -> str:
+        parent, name = os.path.split(path)
+        parent_real = self._paths.get(parent)
+        if parent_real is not None and name not in ("", ".", ".."):
+            return os.path.join(parent_real, name)
+        return os.path.abspath(path)
+
+    def set_real(self, path: str, real: str) -> None:
+        """Record that entry *path* resolves to *real*.
+
+        Entries below it whose real path was derived from its old one move
+        along. Membership is unchanged, so the version is not bumped.
+        """
+        old = self._paths.get(path)
+        if path not in self or old is None or old == real:
+            return
+        old_prefix = old.rstrip(os.sep) + os.sep
+        moved: List[Tuple[str, str]] = []
+        for entry, entry_real in self._paths.items_under(path):
+            if entry_real == old:
+                moved.append((entry, real))
+            elif entry_real is not None and entry_real.startswith(old_prefix):
+                moved.append((entry, os.path.join(real, entry_real[len(old_prefix):])))
+        for entry, entry_real in moved:
+            self._unindex(entry)
+            self._index(entry, entry_real)
+
+    def _index(self, path: str, real: Optional[str] = None) -> None:
+        if real is None:
+            real = self._resolve(path)
+        self._paths[path] = real
+        aliases = self._reals.get(real)
+        if aliases is None:
+            self._reals[real] = {path}
+        else:
+            aliases.add(path)
+
+    def _unindex(self, path: str) -> None:
+        real = self._paths.pop(path)
+        if real is None:
+            return
+        aliases = self._reals.get(real)
+        if aliases is not None:
+            aliases.discard(path)
+            if not aliases:
+                self._reals.pop(real)
+
+    def contains_real(self, path: str) -> bool:
+        """True when an entry resolves to the same real path as *path*."""
+        return path in self or os.path.realpath(path) in self._reals
+
+    def paths_under(self, path: str) -> List[str]:
+        """Entries equal to *path* or below it."""
+        return [entry for entry, _real in self._paths.items_under(path)]
+
+    def children_of(self, path: str) -> List[str]:
+        """Entries exactly one component below *path*."""
+        return [entry for entry, _real in self._paths.child_items(path)]
+
+    def paths_under_real(self, path: str) -> List[str]:
+        """Entries whose real path is at or below the real path of *path*."""
+        found: List[str] = []
+        for _real, aliases in self._reals.items_under(os.path.realpath(path)):
+            found.extend(aliases)
+        return found
+
+    def discard_paths(self, paths: Iterable[str]) -> int:
+        """Remove *paths*; return how many were present.
+
+        Only the outermost removed entries are logged, since dropping a
+        directory's rows already drops the rows of everything below it.
+        """
+        removed: Set[str] = {path for path in paths if path in self}
+        if not removed:
+            return 0
+        for path in removed:
+            super().discard(path)
+            self._unindex(path)
+        for path in sorted(removed, key=len):
+            parent = os.path.dirname(path)
+            while parent not in removed and parent != os.path.dirname(parent):
+                parent = os.path.dirname(parent)
+            if parent not in removed:
+                self._touch("discard", path)
+        return len(removed)
+
+    def _touch(self, op: str = "reset", path: Optional[str] = None) -> None:
+        self.version += 1
+        self.changes.append((self.version, op, path))
+
+    def changes_since(self, version: int) -> Optional[Tuple[ExpansionChange, ...]]:
+        """Changes after *version*, or None when the log no longer covers it."""
+        if version == self.version:
+            return ()
+        pending = tuple(change for change in self.changes if change[0] > version)
+        if not pending or pending[0][0] != version + 1:
+            return None
+        return pending
+
+    # ------------------------------------------------------------------
+    # set API
+
+    def add(self, path: str) -> None:
+        if path not in self:
+            super().add(path)
+            self._index(path)
+            self._touch("add", path)
+
+    def discard(self, path: str) -> None:
+        if path in self:
+            super().discard(path)
+            self._unindex(path)
+            self._touch("discard", path)
+
+    def remove(self, path: str) -> None:
+        super().remove(path)
+        self._unindex(path)
+        self._touch("discard", path)
+
+    def pop(self) -> str:
+        path = super().pop()
+        self._unindex(path)
+        self._touch("discard", path)
+        return path
+
+    def clear(self) -> None:
+        if self:
+            super().clear()
+            self._paths.clear()
+            self._reals.clear()
+            self._touch()
+
+    def update(self, *others: Iterable[str]) -> None:
+        for other in others:
+            for path in other:
+                if path not in self:
+                    super().add(path)
+                    self._index(path)
+        self._touch()
+
+    def difference_update(self, *others: Iterable[str]) -> None:
+        for other in others:
+            for path in list(other):
+                if path in self:
+                    super().discard(path)
+                    self._unindex(path)
+        self._touch()
+
+    def intersection_update(self, *others: Iterable[str]) -> None:
+        super().intersection_update(*others)
+        self._reindex()
+        self._touch()
+
+    def symmetric_difference_update(self, other: Iterable[str]) -> None:
+        super().symmetric_difference_update(other)
+        self._reindex()
+        self._touch()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __iand__(self, other):
+        self.intersection_update(other)
+        return self
+
+    def __isub__(self, other):
+        self.difference_update(other)
+        return self
+
+    def __ixor__(self, other):
+        self.symmetric_difference_update(other)
+        return self
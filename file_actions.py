@@ -156,6 +156,12 @@ class FileActionService:
         except Exception:
             pass
 
+    def _window_dirtied(self) -> None:
+        """Tell the renderer we drew on the window outside its frame buffer."""
+        invalidate_frame = getattr(self.nav.renderer, "invalidate_frame", None)
+        if callable(invalidate_frame):
+            invalidate_frame()
+
     def _resolve_base_directory(self, base_path: Optional[str]) -> str:
         if base_path:
             candidate = os.path.realpath(base_path)
@@ -263,6 +269,7 @@ class FileActionService:
         text = initial_text[:max_input_width]
         cursor = len(text)
 
+        self._window_dirtied()
         stdscr.move(prompt_y, 0)
         stdscr.clrtoeol()
 
@@ -378,6 +385,7 @@ class FileActionService:
         prompt_y = max_y - 1
         prompt_display = prompt[: max_x - 1] if max_x > 0 else ""
 
+        self._window_dirtied()
         stdscr.move(prompt_y, 0)
         stdscr.clrtoeol()
         try:
@@ -437,6 +445,7 @@ class FileActionService:
                 os.makedirs(extract_dir, exist_ok=True)
 
                 status = f"Unzipping {filename} in progress..."
+                self._window_dirtied()
                 stdscr.move(max_y - 1, 0)
                 stdscr.clrtoeol()
                 stdscr.addstr(max_y - 1, 0, status[: max_x - 1], curses.A_BOLD)
@@ -556,6 +565,8 @@ class FileActionService:
         flush_terminal_input()
         stdscr_opt = self.nav.renderer.stdscr
         if stdscr_opt is not None:
+            # The program we hand the terminal to repaints all of it.
+            self._window_dirtied()
             try:
                 curses.def_prog_mode()
             except curses.error:
@@ -709,6 +720,8 @@ class FileActionService:
         stdscr_opt = getattr(self.nav.renderer, "stdscr", None)
 
         if stdscr_opt is not None:
+            # The program we hand the terminal to repaints all of it.
+            self._window_dirtied()
             try:
                 curses.def_prog_mode()
             except curses.error:
@@ -1054,6 +1067,7 @@ class FileActionService:
         except Exception as e:
             stdscr = cast(Any, self.nav.renderer.stdscr)
             if stdscr:
+                self._window_dirtied()
                 max_y, max_x = stdscr.getmaxyx()
                 prompt_y = max_y - 1
                 stdscr.addstr(
@@ -1086,6 +1100,7 @@ class FileActionService:
         except Exception as e:
             stdscr = cast(Any, self.nav.renderer.stdscr)
             if stdscr:
+                self._window_dirtied()
                 max_y, max_x = stdscr.getmaxyx()
                 prompt_y = max_y - 1
                 stdscr.addstr(
@@ -1116,6 +1131,7 @@ class FileActionService:
         except Exception as e:
             stdscr = cast(Any, self.nav.renderer.stdscr)
             if stdscr:
+                self._window_dirtied()
                 max_y, max_x = stdscr.getmaxyx()
                 prompt_y = max_y - 1
                 stdscr.addstr(
@@ -1166,6 +1182,7 @@ class FileActionService:
         try:
             os.rename(selected_path, new_path)
         except Exception as e:
+            self._window_dirtied()
             prompt_y = max_y - 1
             stdscr.addstr(
                 prompt_y,
@@ -0,0 +1,236 @@
+"""Back-buffered drawing surface that sends only changed cells to curses."""
+
+from __future__ import annotations
+
+import curses
+import unicodedata
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+_BLANK = " "
+# Second half of a double-width character; never drawn on its own.
+_WIDE_TAIL = ""
+
+
+def _cell_width(ch: str) -> int:
+    if unicodedata.combining(ch):
+        return 0
+    return 2 if unicodedata.east_asian_width(ch) in ("W", "F") else 1
+
+
+class FrameBuffer:
+    """Stand-in for a curses window that draws a frame into memory first.
+
+    It accepts the window calls the renderer makes (``addstr``, ``addch``,
+    ``move``, ``clrtoeol``, ``erase``, ``getmaxyx``). ``present`` compares
+    the frame with the previous one and writes only the runs of changed
+    cells, one ``addstr`` per run of equal attributes, so rows that did not
+    change (header, status bar, idle columns) cost no curses calls at all.
+
+    The real window is never erased; after something else drew on it
+    directly, call ``invalidate`` so the next frame is written in full.
+
+    ``draw_row`` writes a whole row and remembers it: drawing the same text
+    on the same row next frame reuses the previous frame's cells, so the row
+    is neither re-laid out nor compared cell by cell. Reused rows are shared
+    with the previous frame and copied before anything draws over them.
+    """
+
+    def __init__(self, window: Any):
+        self.window = window
+        self.height = 0
+        self.width = 0
+        self._chars: List[List[str]] = []
+        self._attrs: List[List[int]] = []
+        self._front: Optional[Tuple[List[List[str]], List[List[int]]]] = None
+        self._cursor = (0, 0)
+        # Per row: the (text, attr) last drawn with draw_row and its cells.
+        self._row_memo: Dict[int, Tuple[str, int, List[str], List[int]]] = {}
+        self._shared: Set[int] = set()
+        self.cells_written = 0
+        self.rows_written = 0
+
+    # ------------------------------------------------------------------
+    # Frame lifecycle
+
+    def begin(self) -> None:
+        """Start a new, blank frame sized to the window."""
+        height, width = self.window.getmaxyx()
+        if (height, width) != (self.height, self.width):
+            self.height, self.width = height, width
+            self._front = None
+            self._row_memo.clear()
+        self._chars = [[_BLANK] * width for _ in range(height)]
+        self._attrs = [[curses.A_NORMAL] * width for _ in range(height)]
+        self._shared.clear()
+        self._cursor = (0, 0)
+
+    def invalidate(self) -> None:
+        """Forget what the window shows; the next present writes every cell."""
+        self._front = None
+
+    def present(self) -> None:
+        """Write the cells that differ from the previous frame and refresh."""
+        window = self.window
+        front = self._front
+        for y in range(self.height):
+            chars = self._chars[y]
+            attrs = self._attrs[y]
+            if front is None:
+                old_chars: Optional[List[str]] = None
+                old_attrs: Optional[List[int]] = None
+            else:
+                old_chars = front[0][y]
+                old_attrs = front[1][y]
+                if (chars is old_chars and attrs is old_attrs) or (
+                    chars == old_chars and attrs == old_attrs
+                ):
+                    continue
+            self.rows_written += 1
+            x = 0
+            width = self.width
+            while x < width:
+                if (
+                    old_chars is not None
+                    and chars[x] == old_chars[x]
+                    and attrs[x] == old_attrs[x]  # type: ignore[index]
+                ):
+                    x += 1
+                    continue
+                start = x
+                if chars[start] == _WIDE_TAIL and start > 0:
+                    start -= 1
+                attr = attrs[x]
+                x += 1
+                while x < width and attrs[x] == attr and (
+                    old_chars is None
+                    or chars[x] != old_chars[x]
+                    or attrs[x] != old_attrs[x]  # type: ignore[index]
+                    or chars[x] == _WIDE_TAIL
+                ):
+                    x += 1
+                try:
+                    window.addstr(y, start, "".join(chars[start:x]), attr)
+                except curses.error:
+                    # Writing the bottom-right cell cannot advance the cursor.
+                    pass
+                self.cells_written += x - start
+        self._front = (self._chars, self._attrs)
+        window.refresh()
+
+    # ------------------------------------------------------------------
+    # curses window API
+
+    def getmaxyx(self) -> Tuple[int, int]:
+        return self.height, self.width
+
+    def erase(self) -> None:
+        for y in range(self.height):
+            self._chars[y] = [_BLANK] * self.width
+            self._attrs[y] = [curses.A_NORMAL] * self.width
+        self._shared.clear()
+
+    clear = erase
+
+    def refresh(self) -> None:
+        self.present()
+
+    def move(self, y: int, x: int) -> None:
+        self._check(y, x)
+        self._cursor = (y, x)
+
+    def clrtoeol(self) -> None:
+        y, x = self._cursor
+        self._own_row(y)
+        count = self.width - x
+        self._chars[y][x:] = [_BLANK] * count
+        self._attrs[y][x:] = [curses.A_NORMAL] * count
+
+    def addstr(self, *args: Any) -> None:
+        if isinstance(args[0], str):
+            y, x = self._cursor
+            text, attr = args[0], (args[1] if len(args) > 1 else curses.A_NORMAL)
+        else:
+            y, x, text = args[0], args[1], args[2]
+            attr = args[3] if len(args) > 3 else curses.A_NORMAL
+        self._put(y, x, text, attr)
+
+    def addch(self, *args: Any) -> None:
+        if len(args) <= 2:
+            y, x = self._cursor
+            ch, attr = args[0], (args[1] if len(args) > 1 else curses.A_NORMAL)
+        else:
+            y, x, ch = args[0], args[1], args[2]
+            attr = args[3] if len(args) > 3 else curses.A_NORMAL
+        if isinstance(ch, int):
+            ch = chr(ch)
+        self._put(y, x, ch, attr)
+
+    def addvstr(self, y: int, x: int, text: str, attr: int = curses.A_NORMAL) -> None:
+        """Write *text* downwards from ``(y, x)``, one character per row."""
+        self._check(y, x)
+        chars = self._chars
+        attrs = self._attrs
+        for row, ch in zip(range(y, self.height), text):
+            if row in self._shared:
+                self._own_row(row)
+            chars[row][x] = ch
+            attrs[row][x] = attr
+
+    def draw_row(self, y: int, text: str, attr: int = curses.A_NORMAL) -> None:
+        """Fill row *y* with *text* from column 0, blanking the rest."""
+        self._check(y, 0)
+        memo = self._row_memo.get(y)
+        if memo is not None and memo[0] == text and memo[1] == attr:
+            self._chars[y] = memo[2]
+            self._attrs[y] = memo[3]
+            self._shared.add(y)
+            self._cursor = (y, min(len(text), self.width - 1))
+            return
+        self._own_row(y)
+        self._chars[y] = [_BLANK] * self.width
+        self._attrs[y] = [curses.A_NORMAL] * self.width
+        if text:
+            self._put(y, 0, text, attr)
+        self._row_memo[y] = (text, attr, self._chars[y], self._attrs[y])
+        # The memo holds these lists now; later drawing must not touch them.
+        self._shared.add(y)
+
+    # ------------------------------------------------------------------
+
+    def _check(self, y: int, x: int) -> None:
+        if not (0 <= y < self.height and 0 <= x < self.width):
+            raise curses.error("position outside the frame")
+
+    def _own_row(self, y: int) -> None:
+        """Give row *y* private cells before drawing over a reused row."""
+        if y in self._shared:
+            self._shared.discard(y)
+            self._chars[y] = list(self._chars[y])
+            self._attrs[y] = list(self._attrs[y])
+
+    def _put(self, y: int, x: int, text: str, attr: int) -> None:
+        self._check(y, x)
+        self._own_row(y)
+        chars = self._chars[y]
+        attrs = self._attrs[y]
+        if text.isascii():
+            end = min(self.width, x + len(text))
+            chars[x:end] = text[: end - x]
+            attrs[x:end] = [attr] * (end - x)
+            self._cursor = (y, min(end, self.width - 1))
+            return
+        for ch in text:
+            width = _cell_width(ch)
+            if width == 0:
+                if x > 0:
+                    chars[x - 1] += ch
+                continue
+            if x + width > self.width:
+                break
+            chars[x] = ch
+            attrs[x] = attr
+            if width == 2:
+                chars[x + 1] = _WIDE_TAIL
+                attrs[x + 1] = attr
+            x += width
+        self._cursor = (y, min(x, self.width - 1))
@@ -0,0 +1,78 @@
+"""Frame pacing for the main loop: when to paint and how long to block."""
+
+from __future__ import annotations
+
+import math
+import time
+from typing import Callable, Optional
+
+DEFAULT_FPS = 25.0
+DEFAULT_IDLE_AFTER = 30.0
+IDLE_FPS = 2.0
+# Longest wait while something is polled rather than signalled (spinner).
+POLL_INTERVAL = 0.04
+# Largest share of wall time animation frames may spend rendering.
+FRAME_BUDGET = 0.5
+
+
+class FrameScheduler:
+    """Pace animated frames; paint static views only when asked to.
+
+    Animation runs at ``fps`` and drops to IDLE_FPS once no key has arrived
+    for ``idle_after`` seconds. A frame that takes longer than its share of
+    the interval pushes the next one back (the skipped frames are counted),
+    so rendering never uses more than FRAME_BUDGET of the wall clock.
+    Animation steps are time based, so skipped frames do not slow it down.
+    """
+
+    def __init__(
+        self,
+        fps: float = DEFAULT_FPS,
+        idle_after: float = DEFAULT_IDLE_AFTER,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.fps = max(1.0, fps)
+        self.idle_after = idle_after
+        self.clock = clock
+        self._last_input = clock()
+        self._next_frame = 0.0
+        self.frames = 0
+        self.skipped = 0
+
+    def note_input(self) -> None:
+        self._last_input = self.clock()
+
+    def is_idle(self) -> bool:
+        return self.clock() - self._last_input >= self.idle_after
+
+    def frame_interval(self) -> float:
+        return 1.0 / (IDLE_FPS if self.is_idle() else self.fps)
+
+    def should_render(self, need_redraw: bool, animating: bool) -> bool:
+        if need_redraw:
+            return True
+        return animating and self.clock() >= self._next_frame
+
+    def frame_rendered(self, started: float, finished: Optional[float] = None) -> None:
+        """Record a painted frame and schedule the next animated one."""
+        if finished is None:
+            finished = self.clock()
+        self.frames += 1
+        interval = self.frame_interval()
+        duration = max(0.0, finished - started)
+        wait = max(interval, duration / FRAME_BUDGET)
+        self.skipped += max(0, math.ceil(wait / interval - 1e-9) - 1)
+        self._next_frame = started + wait
+
+    def timeout(self, animating: bool, busy: bool = False) -> Optional[float]:
+        """How long the loop may wait for input; None blocks until woken.
+
+        Static views wait indefinitely (workers wake the loop themselves);
+        *busy* caps the wait at POLL_INTERVAL for state that is polled, such
+        as the loading spinner.
+        """
+        wait: Optional[float] = POLL_INTERVAL if busy else None
+        if animating:
+            until_frame = max(0.0, self._next_frame - self.clock())
+            wait = until_frame if wait is None else min(wait, until_frame)
+        return wait
@@ -0,0 +1,180 @@
+"""Persistent ``git check-ignore`` coprocess, one per repository root."""
+
+from __future__ import annotations
+
+import os
+import selectors
+import subprocess
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from ignore_rules import FileSignature, file_signature
+
+# Give up on a coprocess that makes no progress for this long.
+RESPONSE_TIMEOUT = 5.0
+
+
+class CheckIgnoreError(Exception):
+    """The coprocess died or answered with something unexpected."""
+
+
+class GitCheckIgnore:
+    """Feed paths to ``git check-ignore --stdin -z -v --non-matching``.
+
+    The process stays alive between queries and is restarted when it exits.
+    Git keeps already-loaded ignore files in memory, so callers pass the ignore
+    files relevant to a query and the process is restarted when one changed.
+    """
+
+    def __init__(self, repo_root: str):
+        self.repo_root = repo_root
+        self._process: Optional[subprocess.Popen] = None
+        self._pending = b""
+        self._lock = threading.Lock()
+        self._file_signatures: Dict[str, FileSignature] = {}
+
+    def query(
+        self, rel_paths: Sequence[str], ignore_files: Iterable[str] = ()
+    ) -> Optional[Dict[str, str]]:
+        """Map each ignored path in *rel_paths* to the file holding its rule.
+
+        Returns None when git cannot be used for this repository.
+        """
+        if not rel_paths:
+            return {}
+        with self._lock:
+            self._check_ignore_files(ignore_files)
+            for _attempt in range(2):
+                process = self._ensure_process()
+                if process is None:
+                    return None
+                try:
+                    return self._exchange(process, rel_paths)
+                except (OSError, CheckIgnoreError):
+                    self._stop_process()
+            return None
+
+    def close(self) -> None:
+        with self._lock:
+            self._stop_process()
+
+    def _check_ignore_files(self, ignore_files: Iterable[str]) -> None:
+        stale = False
+        for path in ignore_files:
+            signature = file_signature(path)
+            previous = self._file_signatures.get(path, signature)
+            if previous != signature:
+                stale = True
+            self._file_signatures[path] = signature
+        if stale:
+            self._stop_process()
+
+    def _ensure_process(self) -> Optional[subprocess.Popen]:
+        process = self._process
+        if process is not None and process.poll() is None:
+            return process
+        self._stop_process()
+
+        env = dict(os.environ)
+        env["GIT_FLUSH"] = "1"
+        try:
+            process = subprocess.Popen(
+                [
+                    "git",
+                    "-C",
+                    self.repo_root,
+                    "check-ignore",
+                    "--stdin",
+                    "-z",
+                    "-v",
+                    "--non-matching",
+                ],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                bufsize=0,
+                env=env,
+            )
+        except (FileNotFoundError, OSError):
+            return None
+
+        assert process.stdin is not None and process.stdout is not None
+        os.set_blocking(process.stdin.fileno(), False)
+        os.set_blocking(process.stdout.fileno(), False)
+        self._process = process
+        self._pending = b""
+        return process
+
+    def _stop_process(self) -> None:
+        process = self._process
+        self._process = None
+        self._pending = b""
+        if process is None:
+            return
+        for stream in (process.stdin, process.stdout):
+            try:
+                if stream is not None:
+                    stream.close()
+            except OSError:
+                pass
+        try:
+            process.kill()
+        except OSError:
+            pass
+        try:
+            process.wait(timeout=1.0)
+        except (subprocess.TimeoutExpired, OSError):
+            pass
+
+    def _exchange(
+        self, process: subprocess.Popen, rel_paths: Sequence[str]
+    ) -> Dict[str, str]:
+        assert process.stdin is not None and process.stdout is not None
+        payload = b"".join(os.fsencode(path) + b"\0" for path in rel_paths)
+        expected_fields = 4 * len(rel_paths)
+        fields: List[bytes] = []
+        buffer = self._pending
+        self._pending = b""
+        stdin_fd = process.stdin.fileno()
+        stdout_fd = process.stdout.fileno()
+
+        with selectors.DefaultSelector() as selector:
+            selector.register(stdout_fd, selectors.EVENT_READ)
+            selector.register(stdin_fd, selectors.EVENT_WRITE)
+            written = 0
+            while len(fields) < expected_fields:
+                ready = selector.select(RESPONSE_TIMEOUT)
+                if not ready:
+                    raise CheckIgnoreError("git check-ignore stopped responding")
+                for key, _events in ready:
+                    if key.fd == stdin_fd:
+                        try:
+                            written += os.write(stdin_fd, payload[written:])
+                        except BlockingIOError:
+                            continue
+                        if written >= len(payload):
+                            selector.unregister(stdin_fd)
+                        continue
+                    try:
+                        chunk = os.read(stdout_fd, 64 * 1024)
+                    except BlockingIOError:
+                        continue
+                    if not chunk:
+                        raise CheckIgnoreError("git check-ignore exited")
+                    buffer += chunk
+                    *complete, buffer = buffer.split(b"\0")
+                    fields.extend(complete)
+
+        if len(fields) > expected_fields:
+            raise CheckIgnoreError("unexpected git check-ignore output")
+        self._pending = buffer
+
+        sources: Dict[str, str] = {}
+        for index in range(0, expected_fields, 4):
+            source, _line_number, pattern, path = fields[index : index + 4]
+            if not source or pattern.startswith(b"!"):
+                # Not matched, or matched by a negation (explicitly not ignored).
+                continue
+            rel_path = os.fsdecode(path).replace("\\", "/")
+            sources[rel_path] = os.fsdecode(source).replace("\\", "/")
+        return sources
@@ -0,0 +1,628 @@
+"""In-process gitignore engine: compiled rule sets, repo excludes and index."""
+
+from __future__ import annotations
+
+import fnmatch
+import os
+import re
+import stat
+import struct
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+FileSignature = Optional[Tuple[int, int]]
+
+_POSIX_CLASSES = {
+    "alnum": "a-zA-Z0-9",
+    "alpha": "a-zA-Z",
+    "blank": " \\t",
+    "cntrl": "\\x00-\\x1f\\x7f",
+    "digit": "0-9",
+    "graph": "!-~",
+    "lower": "a-z",
+    "print": " -~",
+    "punct": re.escape("!\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~"),
+    "space": "\\s",
+    "upper": "A-Z",
+    "xdigit": "0-9a-fA-F",
+}
+
+
+@dataclass(frozen=True)
+class IgnoreRule:
+    source: str
+    line_number: int
+    pattern: str
+    negated: bool
+    dir_only: bool
+
+
+def file_signature(path: str) -> FileSignature:
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        return None
+    return (stat_result.st_mtime_ns, stat_result.st_size)
+
+
+def _trim_trailing_spaces(line: str) -> str:
+    end = len(line)
+    while end > 0 and line[end - 1] == " ":
+        backslashes = 0
+        idx = end - 2
+        while idx >= 0 and line[idx] == "\\":
+            backslashes += 1
+            idx -= 1
+        if backslashes % 2:
+            break
+        end -= 1
+    return line[:end]
+
+
+def _translate_bracket(body: str, start: int) -> Tuple[Optional[str], int]:
+    idx = start + 1
+    negate = False
+    if idx < len(body) and body[idx] in "!^":
+        negate = True
+        idx += 1
+    parts: List[str] = []
+    first = True
+    while idx < len(body):
+        ch = body[idx]
+        if ch == "]" and not first:
+            break
+        first = False
+        if ch == "\\" and idx + 1 < len(body):
+            parts.append(re.escape(body[idx + 1]))
+            idx += 2
+            continue
+        if body.startswith("[:", idx):
+            close = body.find(":]", idx + 2)
+            if close != -1:
+                parts.append(_POSIX_CLASSES.get(body[idx + 2 : close], ""))
+                idx = close + 2
+                continue
+        if idx + 2 < len(body) and body[idx + 1] == "-" and body[idx + 2] != "]":
+            parts.append(f"{re.escape(ch)}-{re.escape(body[idx + 2])}")
+            idx += 3
+            continue
+        parts.append(re.escape(ch))
+        idx += 1
+    if idx >= len(body) or not parts:
+        return None, start + 1
+    negation = "^" if negate else ""
+    return f"(?!/)[{negation}{''.join(parts)}]", idx + 1
+
+
+def translate_pattern(body: str) -> str:
+    """Translate a gitignore glob (wildmatch, WM_PATHNAME) into a regex body."""
+    out: List[str] = []
+    idx = 0
+    length = len(body)
+    while idx < length:
+        ch = body[idx]
+        if ch == "*":
+            end = idx
+            while end < length and body[end] == "*":
+                end += 1
+            component_start = idx == 0 or body[idx - 1] == "/"
+            component_end = end == length or body[end] == "/"
+            if end - idx >= 2 and component_start and component_end:
+                if end == length:
+                    out.append(".*")
+                else:
+                    out.append("(?:.*/)?")
+                    end += 1
+            else:
+                out.append("[^/]*")
+            idx = end
+            continue
+        if ch == "?":
+            out.append("[^/]")
+        elif ch == "[":
+            translated, next_idx = _translate_bracket(body, idx)
+            if translated is not None:
+                out.append(translated)
+                idx = next_idx
+                continue
+            out.append(re.escape(ch))
+        elif ch == "\\":
+            if idx + 1 < length:
+                out.append(re.escape(body[idx + 1]))
+                idx += 2
+                continue
+            out.append(re.escape(ch))
+        else:
+            out.append(re.escape(ch))
+        idx += 1
+    return "".join(out)
+
+
+def parse_rules(lines: Iterable[str], source: str) -> List[Tuple[IgnoreRule, str]]:
+    """Parse ignore-file lines into rules paired with their anchored regex."""
+    parsed: List[Tuple[IgnoreRule, str]] = []
+    for line_number, raw in enumerate(lines, start=1):
+        line = raw.rstrip("\n").rstrip("\r")
+        if line_number == 1 and line.startswith("﻿"):
+            line = line[1:]
+        if not line or line.startswith("#"):
+            continue
+        line = _trim_trailing_spaces(line)
+        if not line:
+            continue
+
+        body = line
+        negated = body.startswith("!")
+        if negated:
+            body = body[1:]
+        dir_only = body.endswith("/")
+        if dir_only:
+            body = body.rstrip("/")
+        if not body:
+            continue
+
+        anchored = "/" in body
+        body = body.lstrip("/") if anchored else body
+        if not body:
+            continue
+        translated = translate_pattern(body)
+        prefix = "" if anchored else "(?:.*/)?"
+        regex = f"{prefix}{translated}\\Z"
+        rule = IgnoreRule(
+            source=source,
+            line_number=line_number,
+            pattern=line,
+            negated=negated,
+            dir_only=dir_only,
+        )
+        parsed.append((rule, regex))
+    return parsed
+
+
+class IgnoreRuleSet:
+    """The rules of one ignore file, compiled into one regex per entry kind.
+
+    Alternatives are emitted last-rule-first, so the first alternative that
+    matches is git's "last matching pattern wins" answer.
+    """
+
+    __slots__ = ("rules", "_dir_regex", "_dir_rules", "_file_regex", "_file_rules")
+
+    def __init__(self, parsed: Sequence[Tuple[IgnoreRule, str]]):
+        self.rules = [rule for rule, _regex in parsed]
+        self._dir_regex, self._dir_rules = self._compile(parsed)
+        self._file_regex, self._file_rules = self._compile(
+            [(rule, regex) for rule, regex in parsed if not rule.dir_only]
+        )
+
+    @staticmethod
+    def _compile(parsed: Sequence[Tuple[IgnoreRule, str]]):
+        if not parsed:
+            return None, []
+        ordered = list(reversed(parsed))
+        combined = "|".join(f"({regex})" for _rule, regex in ordered)
+        return re.compile(combined, re.DOTALL), [rule for rule, _regex in ordered]
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[IgnoreRule]:
+        """Return the last rule matching *rel_path* (relative to the file's dir)."""
+        regex, rules = (
+            (self._dir_regex, self._dir_rules)
+            if is_dir
+            else (self._file_regex, self._file_rules)
+        )
+        if regex is None:
+            return None
+        found = regex.match(rel_path)
+        if found is None or found.lastindex is None:
+            return None
+        return rules[found.lastindex - 1]
+
+
+EMPTY_RULE_SET = IgnoreRuleSet([])
+
+
+def load_rule_set(path: str, source: str) -> IgnoreRuleSet:
+    try:
+        with open(path, "r", encoding="utf-8", errors="surrogateescape") as fh:
+            return IgnoreRuleSet(parse_rules(fh, source))
+    except OSError:
+        return EMPTY_RULE_SET
+
+
+class IncludeRuleSet:
+    """Compiled ``.oinclude`` patterns (fnmatch semantics, not gitignore)."""
+
+    __slots__ = ("_path_regex", "_name_regex")
+
+    def __init__(self, patterns: Sequence[str]):
+        path_alternatives: List[str] = []
+        name_alternatives: List[str] = []
+        for pattern in patterns:
+            normalized = pattern.replace("\\", "/").lstrip("/")
+            if not normalized:
+                continue
+            if normalized.endswith("/"):
+                base = normalized.rstrip("/")
+                if base:
+                    path_alternatives.append(f"{re.escape(base)}(?:/.*)?\\Z")
+                continue
+            translated = fnmatch.translate(normalized)
+            path_alternatives.append(translated)
+            if "/" not in normalized:
+                name_alternatives.append(translated)
+        self._path_regex = self._compile(path_alternatives)
+        self._name_regex = self._compile(name_alternatives)
+
+    @staticmethod
+    def _compile(alternatives: List[str]):
+        if not alternatives:
+            return None
+        return re.compile("|".join(f"(?:{alt})" for alt in alternatives), re.DOTALL)
+
+    def __bool__(self) -> bool:
+        return self._path_regex is not None
+
+    def matches(self, rel_path: str, item_name: str) -> bool:
+        if self._path_regex is not None and self._path_regex.match(rel_path):
+            return True
+        return self._name_regex is not None and bool(self._name_regex.match(item_name))
+
+
+def read_pattern_lines(path: str) -> List[str]:
+    patterns: List[str] = []
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            for line in fh:
+                stripped = line.strip()
+                if not stripped or stripped.startswith("#"):
+                    continue
+                patterns.append(stripped)
+    except OSError:
+        return []
+    return patterns
+
+
+# ----------------------------------------------------------------------
+# Repository metadata
+
+
+def _stat_mode(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mode
+    except OSError:
+        return None
+
+
+def resolve_git_dir(repo_root: str) -> Optional[str]:
+    """Return the git directory of *repo_root* (following ``gitdir:`` files)."""
+    dot_git = os.path.join(repo_root, ".git")
+    mode = _stat_mode(dot_git)
+    if mode is None:
+        return None
+    if stat.S_ISDIR(mode):
+        return dot_git
+    try:
+        with open(dot_git, "r", encoding="utf-8") as fh:
+            content = fh.read().strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+    if not content.startswith("gitdir:"):
+        return None
+    git_dir = content[len("gitdir:") :].strip()
+    if not os.path.isabs(git_dir):
+        git_dir = os.path.join(repo_root, git_dir)
+    git_dir = os.path.normpath(git_dir)
+    mode = _stat_mode(git_dir)
+    return git_dir if mode is not None and stat.S_ISDIR(mode) else None
+
+
+def is_worktree_root(directory: str) -> bool:
+    """True when *directory* holds a usable ``.git`` directory or gitfile."""
+    git_dir = resolve_git_dir(directory)
+    return git_dir is not None and _stat_mode(os.path.join(git_dir, "HEAD")) is not None
+
+
+def common_git_dir(git_dir: str) -> str:
+    try:
+        with open(os.path.join(git_dir, "commondir"), "r", encoding="utf-8") as fh:
+            common = fh.read().strip()
+    except OSError:
+        return git_dir
+    if not common:
+        return git_dir
+    if not os.path.isabs(common):
+        common = os.path.join(git_dir, common)
+    return os.path.normpath(common)
+
+
+def _strip_config_value(value: str) -> str:
+    result: List[str] = []
+    in_quotes = False
+    idx = 0
+    while idx < len(value):
+        ch = value[idx]
+        if ch == '"':
+            in_quotes = not in_quotes
+        elif ch == "\\" and idx + 1 < len(value):
+            result.append(value[idx + 1])
+            idx += 1
+        elif ch in "#;" and not in_quotes:
+            break
+        else:
+            result.append(ch)
+        idx += 1
+    return "".join(result).strip()
+
+
+def read_git_config(paths: Iterable[str]) -> Dict[Tuple[str, str], str]:
+    """Read ``section.key`` values from git config files; later files win."""
+    values: Dict[Tuple[str, str], str] = {}
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as fh:
+                lines = fh.readlines()
+        except OSError:
+            continue
+        section = ""
+        for raw in lines:
+            line = raw.strip()
+            if not line or line[0] in "#;":
+                continue
+            if line.startswith("["):
+                end = line.find("]")
+                header = line[1:end] if end != -1 else line[1:]
+                section = header.split(None, 1)[0].lower() if header.strip() else ""
+                line = line[end + 1 :].strip() if end != -1 else ""
+                if not line:
+                    continue
+            key, _sep, value = line.partition("=")
+            values[(section, key.strip().lower())] = _strip_config_value(value)
+    return values
+
+
+def _config_home() -> str:
+    return os.environ.get("XDG_CONFIG_HOME") or os.path.join(
+        os.path.expanduser("~"), ".config"
+    )
+
+
+def _config_files(common_dir: Optional[str]) -> List[str]:
+    files: List[str] = []
+    if not os.environ.get("GIT_CONFIG_NOSYSTEM"):
+        files.append(os.environ.get("GIT_CONFIG_SYSTEM") or "/etc/gitconfig")
+    global_override = os.environ.get("GIT_CONFIG_GLOBAL")
+    if global_override:
+        files.append(global_override)
+    else:
+        files.append(os.path.join(_config_home(), "git", "config"))
+        files.append(os.path.join(os.path.expanduser("~"), ".gitconfig"))
+    if common_dir:
+        files.append(os.path.join(common_dir, "config"))
+    return files
+
+
+def global_excludes_file(config: Dict[Tuple[str, str], str]) -> str:
+    configured = config.get(("core", "excludesfile"))
+    if configured:
+        return os.path.expanduser(configured)
+    return os.path.join(_config_home(), "git", "ignore")
+
+
+def _read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    byte = data[offset]
+    offset += 1
+    value = byte & 0x7F
+    while byte & 0x80:
+        byte = data[offset]
+        offset += 1
+        value = ((value + 1) << 7) | (byte & 0x7F)
+    return value, offset
+
+
+def read_index_paths(index_path: str, hash_size: int = 20) -> List[str]:
+    """Return the worktree paths recorded in a git index (versions 2-4)."""
+    try:
+        with open(index_path, "rb") as fh:
+            data = fh.read()
+    except OSError:
+        return []
+    if len(data) < 12 or data[:4] != b"DIRC":
+        return []
+    version, count = struct.unpack_from(">II", data, 4)
+    if version not in (2, 3, 4):
+        return []
+
+    paths: List[str] = []
+    offset = 12
+    previous = b""
+    fixed = 40 + hash_size
+    try:
+        for _ in range(count):
+            entry_start = offset
+            (flags,) = struct.unpack_from(">H", data, offset + fixed)
+            offset += fixed + 2
+            skip_worktree = False
+            if version >= 3 and flags & 0x4000:
+                (extended,) = struct.unpack_from(">H", data, offset)
+                skip_worktree = bool(extended & 0x4000)
+                offset += 2
+            if version == 4:
+                strip, offset = _read_varint(data, offset)
+                end = data.index(b"\0", offset)
+                name = previous[: len(previous) - strip] + data[offset:end]
+                offset = end + 1
+            else:
+                end = data.index(b"\0", offset)
+                name = data[offset:end]
+                entry_length = end - entry_start
+                offset = entry_start + ((entry_length + 8) & ~7)
+            previous = name
+            if not skip_worktree:
+                paths.append(os.fsdecode(name))
+    except (struct.error, ValueError, IndexError):
+        return paths
+    return paths
+
+
+# ----------------------------------------------------------------------
+# Per-repository matcher
+
+
+@dataclass
+class _RuleStack:
+    files: List[Tuple[str, FileSignature]]
+    stack: List[Tuple[str, IgnoreRuleSet]]
+    parent_rule: Optional[IgnoreRule]
+
+
+class RepoIgnoreMatcher:
+    """Answer ``git check-ignore -v`` questions for one repository in-process.
+
+    Rule files are compiled once and re-read only when their stat signature
+    changes; the stack of rule sets applying to a directory is cached per
+    directory and revalidated against the same signatures. Tracked paths
+    (and directories holding them) are never reported, mirroring
+    check-ignore's index handling.
+    """
+
+    def __init__(self, repo_root: str):
+        self.repo_root = repo_root
+        self.git_dir = resolve_git_dir(repo_root)
+        self.common_dir = common_git_dir(self.git_dir) if self.git_dir else None
+        self._rule_sets: Dict[str, Tuple[FileSignature, IgnoreRuleSet]] = {}
+        self._stacks: Dict[str, _RuleStack] = {}
+        self._config_signature: Optional[Tuple[FileSignature, ...]] = None
+        self._config: Dict[Tuple[str, str], str] = {}
+        self._index_signature: FileSignature = None
+        self._tracked: frozenset = frozenset()
+        # Listing workers share one matcher per repository.
+        self._lock = threading.Lock()
+
+    def ignore_sources(
+        self, rel_dir: str, entries: Sequence[Tuple[str, bool]]
+    ) -> Dict[str, str]:
+        """Map ignored ``rel_dir``-relative entries to their rule's source file.
+
+        *rel_dir* is relative to the repo root ("" for the root itself), and
+        the keys of the result are repo-relative paths like check-ignore's.
+        """
+        with self._lock:
+            stack, parent_rule = self._rule_stack(rel_dir)
+            tracked = self._tracked_paths()
+        sources: Dict[str, str] = {}
+        for name, is_dir in entries:
+            rel_path = f"{rel_dir}/{name}" if rel_dir else name
+            if rel_path in tracked:
+                continue
+            rule = parent_rule or self._match_stack(stack, rel_path, is_dir)
+            if rule is not None and not rule.negated:
+                sources[rel_path] = rule.source
+        return sources
+
+    def exclude_files(self) -> List[str]:
+        """Repository-wide exclude files: ``core.excludesFile`` and info/exclude."""
+        with self._lock:
+            files = [global_excludes_file(self._git_config())]
+        if self.common_dir:
+            files.append(os.path.join(self.common_dir, "info", "exclude"))
+        return files
+
+    def _match_stack(
+        self,
+        stack: Sequence[Tuple[str, IgnoreRuleSet]],
+        rel_path: str,
+        is_dir: bool,
+    ) -> Optional[IgnoreRule]:
+        for base, rule_set in reversed(stack):
+            if base:
+                if not rel_path.startswith(base + "/"):
+                    continue
+                local = rel_path[len(base) + 1 :]
+            else:
+                local = rel_path
+            rule = rule_set.match(local, is_dir)
+            if rule is not None:
+                return rule
+        return None
+
+    def _rule_stack(
+        self, rel_dir: str
+    ) -> Tuple[List[Tuple[str, IgnoreRuleSet]], Optional[IgnoreRule]]:
+        cached = self._stacks.get(rel_dir)
+        if cached is not None and all(
+            file_signature(path) == signature for path, signature in cached.files
+        ):
+            return cached.stack, cached.parent_rule
+
+        files: List[Tuple[str, FileSignature]] = []
+        stack: List[Tuple[str, IgnoreRuleSet]] = []
+
+        def push(base: str, path: str, source: str) -> None:
+            files.append((path, file_signature(path)))
+            stack.append((base, self._rule_set(path, source)))
+
+        excludes = global_excludes_file(self._git_config())
+        push("", excludes, excludes)
+        if self.common_dir:
+            info_exclude = os.path.join(self.common_dir, "info", "exclude")
+            source = os.path.relpath(info_exclude, self.repo_root).replace("\\", "/")
+            push("", info_exclude, source)
+        push("", os.path.join(self.repo_root, ".gitignore"), ".gitignore")
+
+        parent_rule: Optional[IgnoreRule] = None
+        current = ""
+        for part in rel_dir.split("/") if rel_dir else ():
+            current = f"{current}/{part}" if current else part
+            # git never descends into excluded directories, so their own
+            # .gitignore files are not consulted and the exclusion sticks.
+            rule = self._match_stack(stack, current, True)
+            if rule is not None and not rule.negated:
+                parent_rule = rule
+                break
+            path = os.path.join(self.repo_root, current, ".gitignore")
+            push(current, path, f"{current}/.gitignore")
+
+        self._stacks[rel_dir] = _RuleStack(files, stack, parent_rule)
+        return stack, parent_rule
+
+    def _rule_set(self, path: str, source: str) -> IgnoreRuleSet:
+        signature = file_signature(path)
+        cached = self._rule_sets.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        rule_set = load_rule_set(path, source) if signature else EMPTY_RULE_SET
+        self._rule_sets[path] = (signature, rule_set)
+        return rule_set
+
+    def _git_config(self) -> Dict[Tuple[str, str], str]:
+        files = _config_files(self.common_dir)
+        signature = tuple(file_signature(path) for path in files)
+        if signature != self._config_signature:
+            self._config = read_git_config(files)
+            self._config_signature = signature
+        return self._config
+
+    def _tracked_paths(self) -> frozenset:
+        if not self.git_dir:
+            return frozenset()
+        index_path = os.path.join(self.git_dir, "index")
+        signature = file_signature(index_path)
+        if signature == self._index_signature:
+            return self._tracked
+        object_format = self._git_config().get(("extensions", "objectformat"), "")
+        hash_size = 32 if object_format.lower() == "sha256" else 20
+        tracked = set()
+        for path in read_index_paths(index_path, hash_size):
+            path = path.rstrip("/")
+            tracked.add(path)
+            parent = path.rpartition("/")[0]
+            while parent and parent not in tracked:
+                tracked.add(parent)
+                parent = parent.rpartition("/")[0]
+        self._tracked = frozenset(tracked)
+        self._index_signature = signature
+        return self._tracked
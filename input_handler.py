@@ -5,10 +5,11 @@ import time
 import shutil
 import subprocess
 import tempfile
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 
 import config
-from keys import is_ctrl_j, is_enter
+from keymap import KeyContext, Keymap
+from keys import CTRL_J_KEY_CODES, ENTER_KEY_CODES, is_ctrl_j, is_enter
 
 
 class InputHandler:
@@ -41,6 +42,7 @@ class InputHandler:
         self.popup_leader_sequence = ""
         self.popup_leader_timestamp = 0.0
         self.popup_leader_timeout = 2.0
+        self.keymap = self._build_keymap()
 
     def _check_operator_timeout(self):
         if self.pending_operator and (
@@ -104,15 +106,10 @@ class InputHandler:
             self._flash()
             return
 
-        target_real = os.path.realpath(target_path)
         target_name = os.path.basename(target_path) or target_path
 
         if target_path in self.nav.expanded_nodes:
-            collapse_index = None
-            for idx, (_, _, path, _) in enumerate(display_items):
-                if os.path.realpath(path) == target_real:
-                    collapse_index = idx
-                    break
+            collapse_index = self.nav.display_model.row_of(target_path, resolve=True)
 
             self.nav.collapse_branch(target_path)
             if collapse_index is not None:
@@ -146,6 +143,9 @@ class InputHandler:
 
     def _collapse_all_expansions(self):
         self.nav.exit_visual_mode()
+        cancel_expand_all = getattr(self.nav, "cancel_expand_all", None)
+        if callable(cancel_expand_all):
+            cancel_expand_all()
         if self.nav.expanded_nodes:
             self.nav.expanded_nodes.clear()
             self.nav.status_message = "Collapsed all expansions"
@@ -161,50 +161,12 @@ class InputHandler:
 
     def _expand_all_directories(self):
         self.nav.exit_visual_mode()
-
-        root = os.path.realpath(self.nav.dir_manager.current_path)
-        to_visit = [root]
-        visited = set()
-        added = 0
-
-        while to_visit:
-            current = to_visit.pop()
-            if current in visited:
-                continue
-            visited.add(current)
-
-            try:
-                entries = self.nav.dir_manager.list_directory(current)
-            except Exception:
-                continue
-
-            for name, is_dir in entries:
-                if not is_dir:
-                    continue
-                child_path = os.path.realpath(os.path.join(current, name))
-                to_visit.append(child_path)
-                if child_path not in self.nav.expanded_nodes:
-                    self.nav.expanded_nodes.add(child_path)
-                    added += 1
-
-        if added:
-            self.nav.status_message = f"Expanded {added} directories"
-        else:
-            self.nav.status_message = "No directories expanded"
+        self.nav.start_expand_all()
         self.nav.need_redraw = True
 
-    def _handle_comma_command(
-        self,
-        key,
-        total: int,
-        selection,
-        context_path,
-        scope_range,
-        target_dir,
-        display_items=None,
-    ) -> bool:
-        if display_items is None:
-            display_items = self.nav.build_display_items()
+    def _handle_comma_command(self, key, ctx: Optional[KeyContext] = None) -> bool:
+        if ctx is None:
+            ctx = KeyContext(self)
         ch = self._key_to_char(key)
         if ch is None:
             self._reset_comma()
@@ -215,25 +177,28 @@ class InputHandler:
         self.nav.leader_sequence = "," + command
         self.nav.need_redraw = True
 
-        base_dir = context_path or target_dir or self.nav.dir_manager.current_path
+        def base_dir():
+            return (
+                ctx.context_path or ctx.target_dir or self.nav.dir_manager.current_path
+            )
 
         command_map = {
-            "j": lambda: self._jump_to_scope_edge("down", scope_range, total),
-            "k": lambda: self._jump_to_scope_edge("up", scope_range, total),
-            "sa": lambda: self._set_sort_mode("alpha", "Sort: Name", context_path),
+            "j": lambda: self._jump_to_scope_edge("down", ctx.scope_range, ctx.total),
+            "k": lambda: self._jump_to_scope_edge("up", ctx.scope_range, ctx.total),
+            "sa": lambda: self._set_sort_mode("alpha", "Sort: Name", ctx.context_path),
             "sma": lambda: self._set_sort_mode(
-                "mtime_asc", "Sort: Modified ↑", context_path
+                "mtime_asc", "Sort: Modified ↑", ctx.context_path
             ),
             "smd": lambda: self._set_sort_mode(
-                "mtime_desc", "Sort: Modified ↓", context_path
+                "mtime_desc", "Sort: Modified ↓", ctx.context_path
             ),
             "cl": self._clear_clipboard,
-            "nf": lambda: self.nav.create_new_file_no_open(base_dir),
-            "nd": lambda: self.nav.create_new_directory(base_dir),
-            "rn": lambda: self._leader_rename(selection),
+            "nf": lambda: self.nav.create_new_file_no_open(base_dir()),
+            "nd": lambda: self.nav.create_new_directory(base_dir()),
+            "rn": lambda: self._leader_rename(ctx.selection),
             "b": self._leader_bookmark,
             "cm": self._clear_marked_items,
-            "xr": lambda: self._toggle_inline_expansion(selection, display_items),
+            "xr": lambda: self._toggle_inline_expansion(ctx.selection, ctx.items),
             "dot": self._toggle_hidden_files,
             "xc": self._collapse_all_expansions,
             "xar": self._expand_all_directories,
@@ -287,10 +252,10 @@ class InputHandler:
         self.nav.browser_selected = (self.nav.browser_selected + delta) % total
         self.nav.update_visual_active(self.nav.browser_selected)
 
-    def _jump_selection(self, total: int, direction: str):
+    def _jump_selection(self, total: int, direction: str, count: int = 1):
         if total <= 0:
             return
-        jump = max(1, total // 10)
+        jump = max(1, total // 10) * count
         if direction == "up":
             self.nav.browser_selected = max(0, self.nav.browser_selected - jump)
         else:
@@ -965,6 +930,79 @@ class InputHandler:
         suffix = picker.extensions[0].lstrip(".")
         return path + "." + suffix
 
+    def _motion_of(self, key: int) -> Optional[Tuple[str, int]]:
+        """``("move", delta)`` or ``("jump", direction)`` for plain motions."""
+        if key == curses.KEY_UP:
+            return "move", -1
+        if key == curses.KEY_DOWN:
+            return "move", 1
+        if key in (curses.KEY_SR, 11):
+            return "jump", -1
+        if is_ctrl_j(key):
+            return "jump", 1
+        if self.nav.layout_mode == "matrix":
+            steps = {ord("h"): -1, ord("l"): 1}
+        else:
+            steps = {ord("k"): -1, ord("j"): 1}
+        if key in steps:
+            return "move", steps[key]
+        return None
+
+    def is_motion_key(self, key: int) -> bool:
+        """True when *key* only moves the selection and may be coalesced."""
+        if (
+            getattr(self.nav, "command_popup_visible", False)
+            or self.nav.show_help
+            or getattr(self.nav, "command_mode", False)
+            or self.in_filter_mode
+            or self.pending_operator
+            or self.pending_comma
+        ):
+            return False
+        return self._motion_of(key) is not None
+
+    def handle_keys(self, stdscr, keys: Sequence[int]) -> bool:
+        """Handle a batch of queued keys, folding runs of motions into one move.
+
+        Selection moves wrap, so a run of single steps collapses to its net
+        delta; page jumps clamp at the ends, so only runs in one direction
+        are merged. The rows are built once per run instead of once per key.
+        """
+        index = 0
+        while index < len(keys):
+            key = keys[index]
+            motion = self._motion_of(key) if self.is_motion_key(key) else None
+            if motion is None:
+                if self.handle_key(stdscr, key):
+                    return True
+                index += 1
+                continue
+            kind, step = motion
+            net = 0
+            while index < len(keys):
+                following = self._motion_of(keys[index])
+                if following is None or following[0] != kind:
+                    break
+                if kind == "jump" and following[1] != step:
+                    break
+                net += following[1]
+                index += 1
+            self.nav.status_message = ""
+            total = len(self.nav.build_display_items())
+            if total == 0:
+                if kind == "move" and key in (ord("j"), ord("k"), ord("h"), ord("l")):
+                    self._flash()
+                continue
+            self.nav.browser_selected = max(
+                0, min(self.nav.browser_selected, total - 1)
+            )
+            if kind == "move":
+                if net:
+                    self._move_selection(total, net)
+            else:
+                self._jump_selection(total, "up" if step < 0 else "down", abs(net))
+        return False
+
     def handle_key(self, stdscr, key):
         if getattr(self.nav, "command_popup_visible", False):
             if self._handle_command_popup_key(key):
@@ -1045,6 +1083,11 @@ class InputHandler:
                 self.nav.exit_visual_mode()
                 return False
 
+            cancel_expand_all = getattr(self.nav, "cancel_expand_all", None)
+            if callable(cancel_expand_all) and cancel_expand_all():
+                self._reset_comma()
+                return False
+
             self._reset_comma()
             self.pending_operator = None
             self.in_filter_mode = False
@@ -1069,34 +1112,7 @@ class InputHandler:
             self.nav.need_redraw = True
             return False
 
-        display_items = self.nav.build_display_items()
-        total = len(display_items)
-        selection = None
-        selected_name = selected_path = selected_is_dir = None
-        target_dir = self.nav.dir_manager.current_path
-        context_path = None
-        scope_range = None
-        context_index = None
-
-        if total == 0:
-            self.nav.browser_selected = 0
-        else:
-            self.nav.browser_selected = max(
-                0, min(self.nav.browser_selected, total - 1)
-            )
-            selection = display_items[self.nav.browser_selected]
-            selected_name, selected_is_dir, selected_path, _ = selection
-            context_path, scope_range, context_index = self._compute_context_scope(
-                display_items, self.nav.browser_selected
-            )
-            target_dir = self._determine_target_directory(
-                selected_path,
-                selected_is_dir,
-                selected_index=self.nav.browser_selected,
-                context_path=context_path,
-                context_index=context_index,
-                scope_range=scope_range,
-            )
+        ctx = KeyContext(self)
 
         if key == ord(","):
             self.pending_comma = True
@@ -1107,378 +1123,410 @@ class InputHandler:
             return False
 
         if self.pending_comma:
-            if self._handle_comma_command(
-                key,
-                total,
-                selection,
-                context_path,
-                scope_range,
-                target_dir,
-                display_items,
-            ):
+            if self._handle_comma_command(key, ctx):
                 return False
 
-        if key == ord("e"):
-            if not selection or not selected_path or selected_is_dir:
-                self.nav.status_message = "Select a file to execute"
-                self._flash()
-                self.nav.need_redraw = True
-                return False
-            self.nav.exit_visual_mode()
-            if not self.nav.file_actions.run_execution(selected_path):
-                self._flash()
-            return False
+        binding = self.keymap.lookup(key, self.nav.layout_mode)
+        if binding is not None:
+            if binding.cancels_operator:
+                self.pending_operator = None
+            result = binding.handler(ctx)
+            if result is not None:
+                return result
 
-        if is_enter(key):
-            if getattr(self.nav, "picker_options", None):
-                if self._confirm_picker_selection(selection, display_items):
-                    return True
-                return False
-            if self.nav.layout_mode == "list":
-                self.nav.enter_matrix_mode()
-            else:
-                self.nav.enter_list_mode()
+        # Unbound keys cancel a pending d/y operator.
+        self.pending_operator = None
+        return False
+
+    # ------------------------------------------------------------------
+    # Key bindings
+
+    def _build_keymap(self) -> Keymap:
+        keymap = Keymap()
+        keymap.bind([ord("e")], self._key_execute)
+        keymap.bind(ENTER_KEY_CODES, self._key_enter)
+        keymap.bind([ord(" ")], self._key_space)
+        keymap.bind([8], self._key_history_back)  # Ctrl+H
+        keymap.bind([12], self._key_history_forward)  # Ctrl+L
+        keymap.bind([8], self._key_matrix_page_up, layout="matrix")
+        keymap.bind([12], self._key_matrix_page_down, layout="matrix")
+        keymap.bind([ord("m")], self._key_toggle_mark)
+        keymap.bind([ord("v")], self._key_toggle_visual)
+        keymap.bind([ord(".")], self._key_repeat)
+        keymap.bind([ord("?")], self._key_help)
+        keymap.bind([ord("n")], self._key_shell_cd)
+        keymap.bind([ord("q"), 17], self._key_quit)  # Ctrl+Q
+        keymap.bind([ord("t")], self._key_terminal)
+        keymap.bind([ord("p")], self._key_paste)
+        keymap.bind([ord("x")], self._key_delete)
+        keymap.bind([ord("d")], self._key_cut_operator)
+        keymap.bind([ord("y")], self._key_yank_operator)
+
+        motions = [
+            ([ord("j")], self._key_down, "list"),
+            ([ord("k")], self._key_up, "list"),
+            ([ord("h")], self._key_parent, "list"),
+            ([ord("l")], self._key_open_selection, "list"),
+            ([ord("h")], self._key_up, "matrix"),
+            ([ord("l")], self._key_down, "matrix"),
+            ([ord("j")], self._key_matrix_descend, "matrix"),
+            ([ord("k")], self._key_matrix_ascend, "matrix"),
+            ([curses.KEY_UP], self._key_arrow_up, None),
+            ([curses.KEY_DOWN], self._key_arrow_down, None),
+            ([curses.KEY_SR, 11], self._key_page_up, None),  # Ctrl+K / Shift+Up
+            (CTRL_J_KEY_CODES, self._key_page_down, None),  # Ctrl+J / Shift+Down
+            ([curses.KEY_LEFT], self._key_arrow_left, None),
+            ([curses.KEY_RIGHT], self._key_arrow_right, None),
+        ]
+        for keys, handler, layout in motions:
+            keymap.bind(keys, handler, layout=layout, cancels_operator=True)
+        return keymap
+
+    def _leave_filter_and_visual(self) -> None:
+        self.in_filter_mode = False
+        self.nav.dir_manager.filter_pattern = ""
+        self.nav.exit_visual_mode()
+
+    def _open_parent(self, track_visual: bool = False) -> bool:
+        """Change to the parent directory; False when already at the root."""
+        current_path = self.nav.dir_manager.current_path
+        parent = os.path.dirname(current_path)
+        if not parent or parent == current_path:
             return False
+        if self.nav.change_directory(parent):
+            self._leave_filter_and_visual()
+            if track_visual:
+                self.nav.update_visual_active(self.nav.browser_selected)
+        return True
 
-        if key == ord(" "):
-            if getattr(self.nav, "picker_options", None):
-                if self.nav.layout_mode == "list":
-                    self.nav.enter_matrix_mode()
-                else:
-                    self.nav.enter_list_mode()
-                return False
+    def _open_selected(self, ctx: KeyContext) -> None:
+        if ctx.selected_is_dir and ctx.selected_path:
+            if self.nav.change_directory(ctx.selected_path):
+                self._leave_filter_and_visual()
+        elif ctx.selected_path:
+            self.nav.open_file(ctx.selected_path)
 
-        if key == 8:  # Ctrl+H
-            self.nav.exit_visual_mode()
-            if self.nav.layout_mode == "matrix":
-                self._jump_selection(total, "up")
-                return False
-            if self.nav.go_history_back():
-                self.in_filter_mode = False
-                self.nav.dir_manager.filter_pattern = ""
-            else:
-                self._flash()
+    def _key_execute(self, ctx: KeyContext):
+        if not ctx.selection or not ctx.selected_path or ctx.selected_is_dir:
+            self.nav.status_message = "Select a file to execute"
+            self._flash()
+            self.nav.need_redraw = True
             return False
+        self.nav.exit_visual_mode()
+        if not self.nav.file_actions.run_execution(ctx.selected_path):
+            self._flash()
+        return False
 
-        if key == 12:  # Ctrl+L
-            self.nav.exit_visual_mode()
-            if self.nav.layout_mode == "matrix":
-                self._jump_selection(total, "down")
-                return False
-            if self.nav.go_history_forward():
-                self.in_filter_mode = False
-                self.nav.dir_manager.filter_pattern = ""
+    def _toggle_layout(self) -> None:
+        if self.nav.layout_mode == "list":
+            self.nav.enter_matrix_mode()
+        else:
+            self.nav.enter_list_mode()
+
+    def _key_enter(self, ctx: KeyContext):
+        if getattr(self.nav, "picker_options", None):
+            return self._confirm_picker_selection(ctx.selection, ctx.items)
+        self._toggle_layout()
+        return False
+
+    def _key_space(self, ctx: KeyContext):
+        if not getattr(self.nav, "picker_options", None):
+            return None
+        self._toggle_layout()
+        return False
+
+    def _key_history_back(self, ctx: KeyContext):
+        self.nav.exit_visual_mode()
+        if self.nav.go_history_back():
+            self.in_filter_mode = False
+            self.nav.dir_manager.filter_pattern = ""
+        else:
+            self._flash()
+        return False
+
+    def _key_history_forward(self, ctx: KeyContext):
+        self.nav.exit_visual_mode()
+        if self.nav.go_history_forward():
+            self.in_filter_mode = False
+            self.nav.dir_manager.filter_pattern = ""
+        else:
+            self._flash()
+        return False
+
+    def _key_matrix_page_up(self, ctx: KeyContext):
+        self.nav.exit_visual_mode()
+        self._jump_selection(ctx.total, "up")
+        return False
+
+    def _key_matrix_page_down(self, ctx: KeyContext):
+        self.nav.exit_visual_mode()
+        self._jump_selection(ctx.total, "down")
+        return False
+
+    # === Toggle mark with 'm' — now using full path ===
+    def _key_toggle_mark(self, ctx: KeyContext):
+        self.nav.exit_visual_mode()
+        if ctx.total > 0 and ctx.selected_path:
+            full_path = ctx.selected_path
+            if full_path in self.nav.marked_items:
+                self.nav.marked_items.remove(full_path)
             else:
-                self._flash()
-            return False
+                self.nav.marked_items.add(full_path)
+            # Auto-advance after marking
+            self.nav.browser_selected = (self.nav.browser_selected + 1) % ctx.total
+            self._record_repeat_sequence([ord("m")])
+        return False
 
-        # === Toggle mark with 'm' — now using full path ===
-        if key == ord("m"):
+    def _key_toggle_visual(self, ctx: KeyContext):
+        if ctx.total > 0:
+            if getattr(self.nav, "visual_mode", False):
+                self._commit_visual_selection(ctx.items)
+            else:
+                self.nav.enter_visual_mode(self.nav.browser_selected)
+        else:
             self.nav.exit_visual_mode()
-            if total > 0 and selected_path:
-                full_path = selected_path
-                if full_path in self.nav.marked_items:
-                    self.nav.marked_items.remove(full_path)
-                else:
-                    self.nav.marked_items.add(full_path)
-                # Auto-advance after marking
-                self.nav.browser_selected = (self.nav.browser_selected + 1) % total
-                self._record_repeat_sequence([ord("m")])
-            return False
+        return False
 
-        # === VISUAL MODE TOGGLE ===
-        if key == ord("v"):
-            if total > 0:
-                if getattr(self.nav, "visual_mode", False):
-                    self._commit_visual_selection(display_items)
-                else:
-                    self.nav.enter_visual_mode(self.nav.browser_selected)
-            else:
-                self.nav.exit_visual_mode()
+    def _key_repeat(self, ctx: KeyContext):
+        if self.is_repeating:
+            return False
+        if not self.last_repeat_sequence:
+            self.nav.status_message = "Nothing to repeat"
+            self._flash()
+            self.nav.need_redraw = True
             return False
 
-        # === Other single-key commands ===
-        if key == ord("."):
-            if self.is_repeating:
-                return False
-            if not self.last_repeat_sequence:
-                self.nav.status_message = "Nothing to repeat"
-                self._flash()
-                self.nav.need_redraw = True
-                return False
+        sequence = list(self.last_repeat_sequence)
+        self.is_repeating = True
+        result = False
+        try:
+            for seq_key in sequence:
+                result = self.handle_key(None, seq_key)
+                if result:
+                    break
+        finally:
+            self.is_repeating = False
+        return result
 
-            sequence = list(self.last_repeat_sequence)
-            self.is_repeating = True
-            result = False
-            try:
-                for seq_key in sequence:
-                    result = self.handle_key(None, seq_key)
-                    if result:
-                        break
-            finally:
-                self.is_repeating = False
-            return result
+    def _key_help(self, ctx: KeyContext):
+        self.nav.show_help = True
+        self.nav.help_scroll = 0
+        return False
 
-        if key == ord("?"):
-            self.nav.show_help = True
-            self.nav.help_scroll = 0
-            return False
+    def _key_shell_cd(self, ctx: KeyContext):
+        self.nav.exit_visual_mode()
+        return bool(self._request_shell_cd(ctx.target_dir))
 
-        if key == ord("n"):
-            self.nav.exit_visual_mode()
-            if self._request_shell_cd(target_dir):
-                return True
-            return False
+    def _key_quit(self, ctx: KeyContext):
+        self.nav.exit_visual_mode()
+        self.nav.status_message = "Quit"
+        self.nav.need_redraw = True
+        return True
 
-        if key == ord("q") or key == 17:  # Ctrl+Q
-            self.nav.exit_visual_mode()
-            self.nav.status_message = "Quit"
-            self.nav.need_redraw = True
-            return True
+    def _key_terminal(self, ctx: KeyContext):
+        self.nav.open_terminal()
+        return False
 
-        if key == ord("t"):
-            self.nav.open_terminal()
+    def _key_paste(self, ctx: KeyContext):
+        if self.nav.marked_items:
+            self._copy_marked(ctx.target_dir)
+            self._record_repeat_sequence([ord("p")])
             return False
 
-        # === Multi-mark operations ===
-        if self.nav.marked_items:
-            if key == ord("p"):
-                self._copy_marked(target_dir)
-                self._record_repeat_sequence([ord("p")])
-                return False
-            if key == ord("x"):
-                self._delete_marked()
-                return False
+        # Single-item paste (only when no marks)
+        if not self.nav.clipboard.has_entries:
+            return None
+        target_dir = ctx.target_dir
+        try:
+            self.nav.clipboard.paste(target_dir)
+            count = self.nav.clipboard.entry_count
+            noun = "item" if count == 1 else "items"
+            self.nav.status_message = f"Pasted {count} {noun}"
+            self._notify_directories({target_dir})
+            self._record_repeat_sequence([ord("p")])
+        except Exception:
+            self._flash()
+        return False
 
-        # === Single-item paste (only when no marks) ===
-        if key == ord("p") and self.nav.clipboard.has_entries:
-            try:
-                self.nav.clipboard.paste(target_dir)
-                count = self.nav.clipboard.entry_count
-                noun = "item" if count == 1 else "items"
-                self.nav.status_message = f"Pasted {count} {noun}"
-                self._notify_directories({target_dir})
-                self._record_repeat_sequence([ord("p")])
-            except Exception:
-                self._flash()
+    def _key_delete(self, ctx: KeyContext):
+        if self.nav.marked_items:
+            self._delete_marked()
             return False
 
-        if key == ord("x"):
-            if getattr(self.nav, "visual_mode", False):
-                entries = self._collect_visual_entries(display_items)
-                if not entries:
-                    self.nav.exit_visual_mode()
-                    return False
-                if not self._prompt_delete_confirmation(entries):
-                    self.nav.status_message = "Deletion cancelled"
-                    self.nav.need_redraw = True
-                    return False
-                success, dirs = self._delete_entries(entries)
-                if success:
-                    count = len(entries)
-                    noun = "item" if count == 1 else "items"
-                    self.nav.status_message = f"Deleted {count} {noun}"
-                    self.nav.exit_visual_mode()
-                else:
-                    self._flash()
-                if dirs:
-                    self._notify_directories(dirs)
-                self.nav.need_redraw = True
+        if getattr(self.nav, "visual_mode", False):
+            entries = self._collect_visual_entries(ctx.items)
+            if not entries:
+                self.nav.exit_visual_mode()
                 return False
-
-        if key == ord("x") and total > 0 and selected_path:
-            entry = self._normalize_entry(
-                selected_path,
-                selected_name,
-                selected_is_dir,
-            )
-            entries = [entry]
             if not self._prompt_delete_confirmation(entries):
                 self.nav.status_message = "Deletion cancelled"
                 self.nav.need_redraw = True
                 return False
             success, dirs = self._delete_entries(entries)
-            parent_dir = (
-                os.path.dirname(selected_path or self.nav.dir_manager.current_path)
-                or self.nav.dir_manager.current_path
-            )
             if success:
-                label = self._format_deletion_label(*entry)
-                self.nav.status_message = f"Deleted {label}"
-                notify_dirs = dirs or {parent_dir}
-                self._notify_directories(notify_dirs)
+                count = len(entries)
+                noun = "item" if count == 1 else "items"
+                self.nav.status_message = f"Deleted {count} {noun}"
+                self.nav.exit_visual_mode()
             else:
                 self._flash()
-                notify_dirs = dirs or {parent_dir}
-                if notify_dirs:
-                    self._notify_directories(notify_dirs)
+            if dirs:
+                self._notify_directories(dirs)
             self.nav.need_redraw = True
             return False
 
-        # === yy / dd operators ===
-        if self.pending_operator == "d" and key == ord("d"):
-            handled = False
-            if getattr(self.nav, "visual_mode", False):
-                entries = self._collect_visual_entries(display_items)
-                handled = self._stage_visual_to_clipboard(entries, cut=True)
-            elif self.nav.marked_items:
-                handled = self._stage_marked_to_clipboard(cut=True)
-            elif total > 0:
-                try:
-                    self.nav.clipboard.yank(
-                        selected_path, selected_name, selected_is_dir, cut=True
-                    )
+        selected_path = ctx.selected_path
+        if ctx.total == 0 or not selected_path:
+            return None
+        entry = self._normalize_entry(
+            selected_path,
+            ctx.selected_name,
+            ctx.selected_is_dir,
+        )
+        entries = [entry]
+        if not self._prompt_delete_confirmation(entries):
+            self.nav.status_message = "Deletion cancelled"
+            self.nav.need_redraw = True
+            return False
+        success, dirs = self._delete_entries(entries)
+        parent_dir = (
+            os.path.dirname(selected_path or self.nav.dir_manager.current_path)
+            or self.nav.dir_manager.current_path
+        )
+        if success:
+            label = self._format_deletion_label(*entry)
+            self.nav.status_message = f"Deleted {label}"
+            notify_dirs = dirs or {parent_dir}
+            self._notify_directories(notify_dirs)
+        else:
+            self._flash()
+            notify_dirs = dirs or {parent_dir}
+            if notify_dirs:
+                self._notify_directories(notify_dirs)
+        self.nav.need_redraw = True
+        return False
+
+    # === yy / dd operators ===
+    def _stage_selection_to_clipboard(self, ctx: KeyContext, cut: bool) -> bool:
+        if getattr(self.nav, "visual_mode", False):
+            entries = self._collect_visual_entries(ctx.items)
+            return self._stage_visual_to_clipboard(entries, cut=cut)
+        if self.nav.marked_items:
+            return self._stage_marked_to_clipboard(cut=cut)
+        if ctx.total > 0:
+            try:
+                self.nav.clipboard.yank(
+                    ctx.selected_path, ctx.selected_name, ctx.selected_is_dir, cut=cut
+                )
+                if cut:
                     parent_dir = os.path.dirname(
-                        selected_path or self.nav.dir_manager.current_path
+                        ctx.selected_path or self.nav.dir_manager.current_path
                     )
                     self._notify_directories({parent_dir})
-                    handled = True
-                except Exception:
-                    self._flash()
+                return True
+            except Exception:
+                self._flash()
+        return False
+
+    def _key_cut_operator(self, ctx: KeyContext):
+        if self.pending_operator == "d":
+            handled = self._stage_selection_to_clipboard(ctx, cut=True)
             self.pending_operator = None
             if handled:
                 return False
 
-        if self.pending_operator == "y" and key == ord("y"):
-            handled = False
-            if getattr(self.nav, "visual_mode", False):
-                entries = self._collect_visual_entries(display_items)
-                handled = self._stage_visual_to_clipboard(entries, cut=False)
-            elif self.nav.marked_items:
-                handled = self._stage_marked_to_clipboard(cut=False)
-            elif total > 0:
-                try:
-                    self.nav.clipboard.yank(
-                        selected_path, selected_name, selected_is_dir, cut=False
-                    )
-                    handled = True
-                except Exception:
-                    self._flash()
+        self.pending_operator = "d"
+        self.operator_timestamp = time.time()
+        return False
+
+    def _key_yank_operator(self, ctx: KeyContext):
+        if self.pending_operator == "y":
+            handled = self._stage_selection_to_clipboard(ctx, cut=False)
             self.pending_operator = None
             if handled:
                 return False
 
-        if key == ord("d"):
-            self.pending_operator = "d"
-            self.operator_timestamp = time.time()
-            return False
+        if self.pending_operator is None and self.nav.marked_items:
+            handled = self._stage_marked_to_clipboard(cut=False)
+            if handled:
+                self._record_repeat_sequence([ord("y")])
+                return False
+        self.pending_operator = "y"
+        self.operator_timestamp = time.time()
+        return False
 
-        if key == ord("y"):
-            if self.pending_operator is None and self.nav.marked_items:
-                handled = self._stage_marked_to_clipboard(cut=False)
-                if handled:
-                    self._record_repeat_sequence([ord("y")])
-                    return False
-            self.pending_operator = "y"
-            self.operator_timestamp = time.time()
-            return False
+    # === Motions ===
+    def _key_down(self, ctx: KeyContext):
+        if ctx.total > 0:
+            self._move_selection(ctx.total, 1)
+        else:
+            self._flash()
+        return False
 
-        if self.pending_operator:
-            self.pending_operator = None
+    def _key_up(self, ctx: KeyContext):
+        if ctx.total > 0:
+            self._move_selection(ctx.total, -1)
+        else:
+            self._flash()
+        return False
 
-        is_matrix = self.nav.layout_mode == "matrix"
+    def _key_parent(self, ctx: KeyContext):
+        if not self._open_parent():
+            self._flash()
+        return False
 
-        if is_matrix:
-            if key == ord("h"):
-                if total > 0:
-                    self._move_selection(total, -1)
-                else:
-                    self._flash()
-                return False
-            if key == ord("l"):
-                if total > 0:
-                    self._move_selection(total, 1)
-                else:
-                    self._flash()
-                return False
-            if key == ord("j"):
-                if total > 0:
-                    if selected_is_dir and selected_path:
-                        previous_path = self.nav.dir_manager.current_path
-                        self.nav.remember_matrix_position()
-                        if self.nav.change_directory(selected_path):
-                            self.in_filter_mode = False
-                            self.nav.dir_manager.filter_pattern = ""
-                            self.nav.exit_visual_mode()
-                            self.nav.update_visual_active(self.nav.browser_selected)
-                        else:
-                            self.nav.discard_matrix_position(previous_path)
-                    elif selected_path:
-                        self.nav.open_file(selected_path)
-                else:
-                    self._flash()
-                return False
-            if key == ord("k"):
-                parent = os.path.dirname(self.nav.dir_manager.current_path)
-                if parent and parent != self.nav.dir_manager.current_path:
-                    if self.nav.change_directory(parent):
-                        self.in_filter_mode = False
-                        self.nav.dir_manager.filter_pattern = ""
-                        self.nav.exit_visual_mode()
-                        self.nav.update_visual_active(self.nav.browser_selected)
-                else:
-                    self._flash()
-                return False
+    def _key_open_selection(self, ctx: KeyContext):
+        if ctx.total > 0:
+            self._open_selected(ctx)
         else:
-            if key == ord("j"):
-                if total > 0:
-                    self._move_selection(total, 1)
-                else:
-                    self._flash()
-                return False
-            if key == ord("k"):
-                if total > 0:
-                    self._move_selection(total, -1)
-                else:
-                    self._flash()
-                return False
-            if key == ord("h"):
-                parent = os.path.dirname(self.nav.dir_manager.current_path)
-                if parent and parent != self.nav.dir_manager.current_path:
-                    if self.nav.change_directory(parent):
-                        self.in_filter_mode = False
-                        self.nav.dir_manager.filter_pattern = ""
-                        self.nav.exit_visual_mode()
-                else:
-                    self._flash()
-                return False
-            if key == ord("l"):
-                if total > 0:
-                    if selected_is_dir and selected_path:
-                        if self.nav.change_directory(selected_path):
-                            self.in_filter_mode = False
-                            self.nav.dir_manager.filter_pattern = ""
-                            self.nav.exit_visual_mode()
-                    elif selected_path:
-                        self.nav.open_file(selected_path)
-                else:
-                    self._flash()
-                return False
+            self._flash()
+        return False
 
-        if key == curses.KEY_UP and total > 0:
-            self._move_selection(total, -1)
-        elif key == curses.KEY_DOWN and total > 0:
-            self._move_selection(total, 1)
-        elif key in (curses.KEY_SR, 11):  # Ctrl+K / Shift+Up
-            self._jump_selection(total, "up")
-        elif is_ctrl_j(key):  # Ctrl+J / Shift+Down
-            self._jump_selection(total, "down")
-        elif key == curses.KEY_LEFT:
-            parent = os.path.dirname(self.nav.dir_manager.current_path)
-            if parent and parent != self.nav.dir_manager.current_path:
-                if self.nav.change_directory(parent):
-                    self.in_filter_mode = False
-                    self.nav.dir_manager.filter_pattern = ""
-                    self.nav.exit_visual_mode()
-        elif key == curses.KEY_RIGHT and total > 0:
-            if selected_is_dir and selected_path:
-                if self.nav.change_directory(selected_path):
-                    self.in_filter_mode = False
-                    self.nav.dir_manager.filter_pattern = ""
-                    self.nav.exit_visual_mode()
-            elif selected_path:
-                self.nav.open_file(selected_path)
+    def _key_matrix_descend(self, ctx: KeyContext):
+        if ctx.total == 0:
+            self._flash()
+        elif ctx.selected_is_dir and ctx.selected_path:
+            previous_path = self.nav.dir_manager.current_path
+            self.nav.remember_matrix_position()
+            if self.nav.change_directory(ctx.selected_path):
+                self._leave_filter_and_visual()
+                self.nav.update_visual_active(self.nav.browser_selected)
+            else:
+                self.nav.discard_matrix_position(previous_path)
+        elif ctx.selected_path:
+            self.nav.open_file(ctx.selected_path)
+        return False
+
+    def _key_matrix_ascend(self, ctx: KeyContext):
+        if not self._open_parent(track_visual=True):
+            self._flash()
+        return False
+
+    def _key_arrow_up(self, ctx: KeyContext):
+        if ctx.total > 0:
+            self._move_selection(ctx.total, -1)
+        return False
+
+    def _key_arrow_down(self, ctx: KeyContext):
+        if ctx.total > 0:
+            self._move_selection(ctx.total, 1)
+        return False
+
+    def _key_page_up(self, ctx: KeyContext):
+        self._jump_selection(ctx.total, "up")
+        return False
+
+    def _key_page_down(self, ctx: KeyContext):
+        self._jump_selection(ctx.total, "down")
+        return False
+
+    def _key_arrow_left(self, ctx: KeyContext):
+        self._open_parent()
+        return False
 
+    def _key_arrow_right(self, ctx: KeyContext):
+        if ctx.total > 0:
+            self._open_selected(ctx)
         return False
 
     # === Updated multi-mark operations using full paths ===
@@ -1637,6 +1685,9 @@ class InputHandler:
         expanded = getattr(self.nav, "expanded_nodes", set())
         if path in expanded:
             return True
+        contains_real = getattr(expanded, "contains_real", None)
+        if contains_real is not None:
+            return contains_real(path)
         real_target = os.path.realpath(path)
         for entry in expanded:
             try:
@@ -0,0 +1,129 @@
+"""Key binding registry and the lazily computed context handlers receive."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+
+class KeyContext:
+    """The selection as a key handler sees it, computed on first use.
+
+    Building the rows, finding the enclosing expanded directory (a backwards
+    scan) and resolving the paste/create target all cost time in proportion
+    to the tree, so each happens at most once per key and only for handlers
+    that read it. Keys such as ``?`` or ``q`` never touch the tree.
+    """
+
+    def __init__(self, handler: Any):
+        self.handler = handler
+        self.nav = handler.nav
+
+    @cached_property
+    def items(self):
+        items = self.nav.build_display_items()
+        total = len(items)
+        if total == 0:
+            self.nav.browser_selected = 0
+        else:
+            self.nav.browser_selected = max(
+                0, min(self.nav.browser_selected, total - 1)
+            )
+        self.index = self.nav.browser_selected
+        return items
+
+    @cached_property
+    def total(self) -> int:
+        return len(self.items)
+
+    @cached_property
+    def selection(self):
+        if self.total == 0:
+            return None
+        return self.items[self.index]
+
+    @property
+    def selected_name(self) -> Optional[str]:
+        return self.selection[0] if self.selection else None
+
+    @property
+    def selected_is_dir(self) -> Optional[bool]:
+        return self.selection[1] if self.selection else None
+
+    @property
+    def selected_path(self) -> Optional[str]:
+        return self.selection[2] if self.selection else None
+
+    @cached_property
+    def context(self) -> Tuple[Optional[str], Any, Optional[int]]:
+        """``(context_path, scope_range, context_index)`` of the selection."""
+        if self.total == 0:
+            return (None, None, None)
+        return self.handler._compute_context_scope(self.items, self.index)
+
+    @property
+    def context_path(self) -> Optional[str]:
+        return self.context[0]
+
+    @property
+    def scope_range(self):
+        return self.context[1]
+
+    @cached_property
+    def target_dir(self) -> str:
+        """Directory that pastes and new entries go to."""
+        if self.total == 0:
+            return self.nav.dir_manager.current_path
+        context_path, scope_range, context_index = self.context
+        return self.handler._determine_target_directory(
+            self.selected_path,
+            self.selected_is_dir,
+            selected_index=self.index,
+            context_path=context_path,
+            context_index=context_index,
+            scope_range=scope_range,
+        )
+
+
+# A handler returns True to quit, False when it handled the key, or None to
+# decline it (the key then behaves as unbound).
+KeyHandler = Callable[[KeyContext], Optional[bool]]
+
+
+@dataclass(frozen=True)
+class Binding:
+    handler: KeyHandler
+    # Motions cancel a pending ``d``/``y`` operator before they run.
+    cancels_operator: bool = False
+
+
+class Keymap:
+    """Keys mapped to handlers, optionally only in one layout mode.
+
+    A binding for the current layout wins over one for every layout.
+    """
+
+    def __init__(self):
+        self._bindings: Dict[Tuple[Optional[str], int], Binding] = {}
+
+    def bind(
+        self,
+        keys: Iterable[int],
+        handler: KeyHandler,
+        *,
+        layout: Optional[str] = None,
+        cancels_operator: bool = False,
+    ) -> None:
+        binding = Binding(handler, cancels_operator)
+        for key in keys:
+            self._bindings[(layout, key)] = binding
+
+    def lookup(self, key: int, layout: Optional[str] = None) -> Optional[Binding]:
+        binding = self._bindings.get((layout, key))
+        if binding is None:
+            binding = self._bindings.get((None, key))
+        return binding
+
+    def __len__(self) -> int:
+        return len(self._bindings)
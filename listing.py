@@ -0,0 +1,191 @@
+"""Compact, read-only directory listings and the row views built on them."""
+
+from __future__ import annotations
+
+import os
+import sys
+from array import array
+from itertools import accumulate
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+_DIR_FLAG = 1
+
+
+class ListingRow(tuple):
+    """A ``(name, is_dir)`` entry materialized from a Listing on access."""
+
+    __slots__ = ()
+
+    name = property(itemgetter(0))
+    is_dir = property(itemgetter(1))
+
+
+class Listing:
+    """Struct-of-arrays listing of one directory.
+
+    Names live in one string with an offset table, and flags in a bytearray.
+    The parent path is interned and shared by every row. Indexing and
+    iterating yield ``ListingRow`` values, which unpack like the
+    ``(name, is_dir)`` tuples listings used to be. Listings are never mutated
+    after construction, so they are handed out without copying.
+    """
+
+    __slots__ = ("parent", "_names", "_offsets", "_flags", "_positions")
+
+    def __init__(self, parent: str, names: Sequence[str], dir_flags: Iterable[bool]):
+        self.parent = sys.intern(parent)
+        self._names = "".join(names)
+        self._offsets = array("Q", accumulate(map(len, names), initial=0))
+        self._flags = bytearray(_DIR_FLAG if is_dir else 0 for is_dir in dir_flags)
+        self._positions: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def from_pairs(cls, parent: str, pairs: Iterable[Tuple[str, bool]]) -> "Listing":
+        names: List[str] = []
+        flags: List[bool] = []
+        for name, is_dir in pairs:
+            names.append(name)
+            flags.append(is_dir)
+        return cls(parent, names, flags)
+
+    def __len__(self) -> int:
+        return len(self._flags)
+
+    def name_at(self, index: int) -> str:
+        offsets = self._offsets
+        return self._names[offsets[index] : offsets[index + 1]]
+
+    def is_dir_at(self, index: int) -> bool:
+        return bool(self._flags[index])
+
+    def path_at(self, index: int) -> str:
+        return os.path.join(self.parent, self.name_at(index))
+
+    def index_of(self, name: str) -> Optional[int]:
+        """Position of *name*, from a name index built on first use."""
+        positions = self._positions
+        if positions is None:
+            positions = {entry: index for index, entry in enumerate(self.names())}
+            self._positions = positions
+        return positions.get(name)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("listing index out of range")
+        return ListingRow((self.name_at(index), bool(self._flags[index])))
+
+    def __iter__(self) -> Iterator[ListingRow]:
+        names = self._names
+        offsets = self._offsets
+        for index, flag in enumerate(self._flags):
+            yield ListingRow((names[offsets[index] : offsets[index + 1]], bool(flag)))
+
+    def names(self) -> Iterator[str]:
+        names = self._names
+        offsets = self._offsets
+        return (names[offsets[i] : offsets[i + 1]] for i in range(len(self._flags)))
+
+    def rebased(self, parent: str) -> "Listing":
+        """The same entries under another parent path (e.g. via a symlink)."""
+        clone = Listing.__new__(Listing)
+        clone.parent = sys.intern(parent)
+        clone._names = self._names
+        clone._offsets = self._offsets
+        clone._flags = self._flags
+        clone._positions = self._positions
+        return clone
+
+    def subset(self, indices: Iterable[int]) -> "Listing":
+        """A new listing holding the rows at *indices*, in that order."""
+        picked = list(indices)
+        return Listing(
+            self.parent,
+            [self.name_at(i) for i in picked],
+            [self._flags[i] for i in picked],
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Listing):
+            return (
+                self.parent == other.parent
+                and self._flags == other._flags
+                and self._names == other._names
+                and self._offsets == other._offsets
+            )
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and all(
+                row == item for row, item in zip(self, other)
+            )
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"Listing({self.parent!r}, {len(self)} entries)"
+
+
+class DisplayRow:
+    """One visible row: a listing entry plus its tree depth.
+
+    Unpacks and indexes like the ``(name, is_dir, path, depth)`` tuples the
+    UI consumes, but the absolute path is only joined when asked for.
+    """
+
+    __slots__ = ("listing", "index", "depth")
+
+    def __init__(self, listing: Listing, index: int, depth: int):
+        self.listing = listing
+        self.index = index
+        self.depth = depth
+
+    @property
+    def name(self) -> str:
+        return self.listing.name_at(self.index)
+
+    @property
+    def is_dir(self) -> bool:
+        return self.listing.is_dir_at(self.index)
+
+    @property
+    def path(self) -> str:
+        return self.listing.path_at(self.index)
+
+    def __len__(self) -> int:
+        return 4
+
+    def __iter__(self):
+        yield self.name
+        yield self.is_dir
+        yield self.path
+        yield self.depth
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self)[index]
+        if index < 0:
+            index += 4
+        if index == 0:
+            return self.name
+        if index == 1:
+            return self.is_dir
+        if index == 2:
+            return self.path
+        if index == 3:
+            return self.depth
+        raise IndexError("display row index out of range")
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (DisplayRow, tuple)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+
+    def __repr__(self) -> str:
+        return f"DisplayRow{tuple(self)!r}"
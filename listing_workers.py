@@ -0,0 +1,115 @@
+"""Daemon worker threads that list directories off the UI thread."""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_MAX_WORKERS = 8
+
+
+class ListingWorkers:
+    """Run listing jobs on daemon threads, at most one in flight per key.
+
+    Threads are daemons on purpose: a job stuck on a hung mount must never
+    keep the process from exiting. Threads are started on demand, so a few
+    stuck jobs do not starve listings of healthy directories until
+    ``max_workers`` threads are blocked. ``on_done`` is called from the
+    worker thread after each job finishes.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        on_done: Optional[Callable[[], None]] = None,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.on_done = on_done
+        self._queue: "queue.Queue[Optional[Tuple[Any, Future, Callable, tuple]]]" = (
+            queue.Queue()
+        )
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Any, Tuple[Future, float]] = {}
+        self._threads: List[threading.Thread] = []
+        self._idle = 0
+        self._closed = False
+
+    def submit(self, key: Any, fn: Callable[..., Any], *args: Any) -> Future:
+        """Queue ``fn(*args)`` unless a job for *key* is already in flight."""
+        with self._lock:
+            running = self._in_flight.get(key)
+            if running is not None:
+                return running[0]
+            future: Future = Future()
+            if self._closed:
+                future.cancel()
+                return future
+            self._in_flight[key] = (future, time.monotonic())
+            self._queue.put((key, future, fn, args))
+            if (
+                self._idle < self._queue.qsize()
+                and len(self._threads) < self.max_workers
+            ):
+                self._start_thread()
+        return future
+
+    def pending_since(self, key: Any) -> Optional[float]:
+        """Monotonic submit time of the job running for *key*, if any."""
+        with self._lock:
+            running = self._in_flight.get(key)
+        return running[1] if running is not None else None
+
+    def has_pending(self) -> bool:
+        with self._lock:
+            return bool(self._in_flight)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            pending = list(self._in_flight.values())
+            self._in_flight.clear()
+            threads = len(self._threads)
+        for future, _submitted in pending:
+            future.cancel()
+        for _ in range(threads):
+            self._queue.put(None)
+
+    def _start_thread(self) -> None:
+        thread = threading.Thread(
+            target=self._run,
+            name=f"o-listing-{len(self._threads)}",
+            daemon=True,
+        )
+        self._threads.append(thread)
+        thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                self._idle += 1
+            job = self._queue.get()
+            with self._lock:
+                self._idle -= 1
+            if job is None:
+                return
+            key, future, fn, args = job
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(*args))
+                except BaseException as exc:
+                    future.set_exception(exc)
+            with self._lock:
+                running = self._in_flight.get(key)
+                if running is not None and running[0] is future:
+                    del self._in_flight[key]
+                closed = self._closed
+            if self.on_done is not None and not closed:
+                try:
+                    self.on_done()
+                except Exception:
+                    pass
@@ -1,8 +1,22 @@
 import curses
 import os
-from typing import Optional, Callable, Any
+import selectors
+import signal
+import sys
+from typing import Any, Callable, List, Optional
 
 from core_navigator import FileNavigator
+from frame_scheduler import (
+    DEFAULT_FPS,
+    DEFAULT_IDLE_AFTER,
+    POLL_INTERVAL,
+    FrameScheduler,
+)
+
+# Upper bound on queued motion keys folded into one move and one frame.
+MAX_COALESCED_KEYS = 512
+# How long key handlers wait for the rest of an escape sequence.
+KEY_TIMEOUT_MS = int(POLL_INTERVAL * 1000)
 
 
 class Orchestrator:
@@ -18,6 +32,7 @@ class Orchestrator:
         self.navigator: Optional[Any] = None
         self.picker_options = picker_options
         self.reveal_path = reveal_path
+        self._resized = False
 
     def setup(self) -> None:
         if self.navigator is None:
@@ -59,29 +74,172 @@ class Orchestrator:
         except Exception:
             pass
 
-        stdscr.timeout(40)
+        config = getattr(navigator, "config", None)
+        scheduler = FrameScheduler(
+            fps=getattr(config, "matrix_fps", DEFAULT_FPS),
+            idle_after=getattr(config, "matrix_idle_after", DEFAULT_IDLE_AFTER),
+        )
         navigator.need_redraw = True
 
-        while True:
-            should_render = navigator.need_redraw or navigator.layout_mode == "matrix"
-            if should_render:
-                navigator.renderer.render()
-                if navigator.layout_mode != "matrix":
-                    navigator.need_redraw = False
-                else:
+        sync_watches = getattr(navigator, "sync_directory_watches", None)
+        process_directory_events = getattr(
+            navigator, "process_directory_events", None
+        )
+        has_pending_listings = getattr(navigator, "has_pending_listings", None)
+        poll_expand_all = getattr(navigator, "poll_expand_all", None)
+        if callable(sync_watches):
+            sync_watches()
+
+        wakeup = getattr(navigator, "wakeup", None)
+        selector = selectors.DefaultSelector()
+        try:
+            selector.register(sys.stdin.fileno(), selectors.EVENT_READ)
+        except (AttributeError, OSError, ValueError):
+            # No selectable terminal: fall back to polling getch.
+            wakeup = None
+        if wakeup is not None:
+            selector.register(wakeup.fileno(), selectors.EVENT_READ, wakeup)
+        restore_resize = self._install_resize_handler(wakeup)
+
+        try:
+            while True:
+                if self._resized:
+                    self._resized = False
+                    self._resize_terminal()
+                    navigator.need_redraw = True
+                if callable(process_directory_events):
+                    process_directory_events()
+                busy = wakeup is None
+                if callable(has_pending_listings) and has_pending_listings():
+                    # Keep the loading spinner moving until the workers finish.
+                    navigator.need_redraw = True
+                    busy = True
+                if callable(poll_expand_all) and poll_expand_all():
+                    navigator.need_redraw = True
+
+                animating = navigator.layout_mode == "matrix"
+                if scheduler.should_render(navigator.need_redraw, animating):
+                    started = scheduler.clock()
+                    navigator.renderer.render()
                     navigator.need_redraw = False
+                    scheduler.frame_rendered(started)
 
-            key = stdscr.getch()
-            if key == -1:
-                continue
+                # Keys curses has already buffered never show up on stdin,
+                # so ask it first and only then block in select().
+                stdscr.timeout(0)
+                key = stdscr.getch()
+                if key == -1:
+                    stdin_ready = False
+                    timeout = scheduler.timeout(animating, busy)
+                    for selected, _events in selector.select(timeout):
+                        if selected.data is None:
+                            stdin_ready = True
+                        else:
+                            selected.data.drain()
+                    if not stdin_ready:
+                        continue
+                    # Give escape sequences time to arrive in full.
+                    stdscr.timeout(KEY_TIMEOUT_MS)
+                    key = stdscr.getch()
+                    if key == -1:
+                        continue
+                # Key handlers read follow-up keys with the classic timeout.
+                stdscr.timeout(KEY_TIMEOUT_MS)
+                if key == curses.KEY_RESIZE:
+                    invalidate_frame = getattr(
+                        navigator.renderer, "invalidate_frame", None
+                    )
+                    if callable(invalidate_frame):
+                        invalidate_frame()
+                    navigator.need_redraw = True
+                    continue
+                scheduler.note_input()
+                if self._handle_input(stdscr, key):
+                    break
+        finally:
+            restore_resize()
+            selector.close()
 
-            if navigator.input_handler.handle_key(stdscr, key):
-                break
+    def _handle_input(self, stdscr, key: int) -> bool:
+        """Handle *key* plus the motions queued behind it; True means quit."""
+        navigator = self.navigator
+        input_handler = navigator.input_handler
+        keys = self._drain_motion_keys(stdscr, key, input_handler)
+        stdscr.timeout(KEY_TIMEOUT_MS)
+        if len(keys) > 1:
+            if input_handler.handle_keys(stdscr, keys):
+                return True
+        elif input_handler.handle_key(stdscr, key):
+            return True
+
+        if getattr(navigator, "exit_requested", False):
+            return True
+
+        sync_watches = getattr(navigator, "sync_directory_watches", None)
+        if callable(sync_watches):
+            sync_watches()
+
+        navigator.need_redraw = True
+        return False
 
-            if getattr(navigator, "exit_requested", False):
+    @staticmethod
+    def _drain_motion_keys(stdscr, key: int, input_handler: Any) -> List[int]:
+        """Collect the motion keys queued behind *key* (a held-down key).
+
+        Reading stops at the first key that is not a plain motion; it is
+        pushed back so its handler can still read its own follow-up keys.
+        """
+        keys = [key]
+        is_motion_key = getattr(input_handler, "is_motion_key", None)
+        if not callable(is_motion_key) or not is_motion_key(key):
+            return keys
+        stdscr.timeout(0)
+        while len(keys) < MAX_COALESCED_KEYS:
+            following = stdscr.getch()
+            if following == -1:
+                break
+            if not is_motion_key(following):
+                curses.ungetch(following)
                 break
+            keys.append(following)
+        return keys
+
+    def _install_resize_handler(self, wakeup: Any) -> Callable[[], None]:
+        """Route SIGWINCH through the wakeup channel; return an undo callable.
+
+        curses only reports a resize from inside getch, which the loop no
+        longer sits in while idle, so the signal has to wake select() itself.
+        """
+        sigwinch = getattr(signal, "SIGWINCH", None)
+        if wakeup is None or sigwinch is None:
+            return lambda: None
+
+        def on_resize(_signum, _frame) -> None:
+            self._resized = True
+
+        try:
+            previous = signal.signal(sigwinch, on_resize)
+            previous_fd = signal.set_wakeup_fd(
+                wakeup.write_fd, warn_on_full_buffer=False
+            )
+        except (ValueError, OSError):
+            return lambda: None
 
-            navigator.need_redraw = True
+        def restore() -> None:
+            signal.set_wakeup_fd(previous_fd)
+            handler = signal.SIG_DFL if previous is None else previous
+            signal.signal(sigwinch, handler)
+
+        return restore
+
+    @staticmethod
+    def _resize_terminal() -> None:
+        try:
+            size = os.get_terminal_size(sys.__stdout__.fileno())
+            curses.resizeterm(size.lines, size.columns)
+            curses.update_lines_cols()
+        except (AttributeError, OSError, ValueError, curses.error):
+            pass
 
     def _run_curses(self) -> None:
         curses.wrapper(self._curses_main)
@@ -96,6 +254,12 @@ class Orchestrator:
             self.shutdown()
 
     def shutdown(self) -> None:
+        close_navigator = getattr(self.navigator, "close", None)
+        if callable(close_navigator):
+            try:
+                close_navigator()
+            except Exception:
+                pass
         if self.navigator and hasattr(self.navigator.clipboard, "cleanup"):
             try:
                 self.navigator.clipboard.cleanup()
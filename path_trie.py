@@ -0,0 +1,194 @@
+"""Component-wise trie keyed by absolute filesystem paths."""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+_MISSING = object()
+
+
+class _Node:
+    __slots__ = ("children", "value")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.value: Any = _MISSING
+
+
+def split_path(path: str) -> List[str]:
+    """Split an absolute path into components ("/" is the empty root component)."""
+    stripped = path.rstrip(os.sep)
+    if not stripped:
+        return [""]
+    return stripped.split(os.sep)
+
+
+def join_parts(parts: List[str]) -> str:
+    if parts == [""]:
+        return os.sep
+    return os.sep.join(parts)
+
+
+class PathTrie:
+    """Map paths to values; lookups cost one dict step per path component.
+
+    Besides exact lookups the trie answers "deepest stored ancestor" queries
+    and drops or walks whole subtrees without scanning unrelated keys.
+    """
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self):
+        self._root = _Node()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, path: object) -> bool:
+        if not isinstance(path, str):
+            return False
+        node = self._find(path)
+        return node is not None and node.value is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        for path, _value in self.items():
+            yield path
+
+    def get(self, path: str, default: Any = None) -> Any:
+        node = self._find(path)
+        if node is None or node.value is _MISSING:
+            return default
+        return node.value
+
+    def __getitem__(self, path: str) -> Any:
+        node = self._find(path)
+        if node is None or node.value is _MISSING:
+            raise KeyError(path)
+        return node.value
+
+    def __setitem__(self, path: str, value: Any) -> None:
+        node = self._root
+        for part in split_path(path):
+            child = node.children.get(part)
+            if child is None:
+                child = _Node()
+                node.children[part] = child
+            node = child
+        if node.value is _MISSING:
+            self._size += 1
+        node.value = value
+
+    def pop(self, path: str, default: Any = None) -> Any:
+        trail = self._trail(path)
+        if trail is None:
+            return default
+        node = trail[-1][1]
+        if node.value is _MISSING:
+            return default
+        value = node.value
+        node.value = _MISSING
+        self._size -= 1
+        self._prune(trail)
+        return value
+
+    def discard_subtree(self, path: str) -> int:
+        """Remove *path* and every stored path below it; return how many."""
+        trail = self._trail(path)
+        if trail is None:
+            return 0
+        node = trail[-1][1]
+        removed = sum(1 for _ in self._walk(node, []))
+        node.value = _MISSING
+        node.children.clear()
+        self._size -= removed
+        self._prune(trail)
+        return removed
+
+    def has_subtree(self, path: str) -> bool:
+        """True when *path* or anything below it is stored."""
+        return self._find(path) is not None
+
+    def items_under(self, path: str) -> Iterator[Tuple[str, Any]]:
+        """Yield stored ``(path, value)`` pairs at or below *path*."""
+        node = self._find(path)
+        if node is None:
+            return iter(())
+        return (
+            (join_parts(parts), value)
+            for parts, value in self._walk(node, split_path(path))
+        )
+
+    def child_items(self, path: str) -> List[Tuple[str, Any]]:
+        """Stored ``(path, value)`` pairs exactly one component below *path*."""
+        node = self._find(path)
+        if node is None:
+            return []
+        parts = split_path(path)
+        return [
+            (join_parts(parts + [part]), child.value)
+            for part, child in node.children.items()
+            if child.value is not _MISSING
+        ]
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return (
+            (join_parts(parts), value) for parts, value in self._walk(self._root, [])
+        )
+
+    def longest_prefix(self, path: str) -> Optional[Tuple[str, Any]]:
+        """Return the deepest stored ``(ancestor_or_self, value)`` of *path*."""
+        node = self._root
+        found: Optional[Tuple[int, Any]] = None
+        parts = split_path(path)
+        for depth, part in enumerate(parts, start=1):
+            node = node.children.get(part)
+            if node is None:
+                break
+            if node.value is not _MISSING:
+                found = (depth, node.value)
+        if found is None:
+            return None
+        depth, value = found
+        return join_parts(parts[:depth]), value
+
+    def clear(self) -> None:
+        self._root = _Node()
+        self._size = 0
+
+    def _find(self, path: str) -> Optional[_Node]:
+        node = self._root
+        for part in split_path(path):
+            node = node.children.get(part)
+            if node is None:
+                return None
+        return node
+
+    def _trail(self, path: str) -> Optional[List[Tuple[str, _Node]]]:
+        trail: List[Tuple[str, _Node]] = [("", self._root)]
+        node = self._root
+        for part in split_path(path):
+            node = node.children.get(part)
+            if node is None:
+                return None
+            trail.append((part, node))
+        return trail
+
+    @staticmethod
+    def _prune(trail: List[Tuple[str, _Node]]) -> None:
+        for index in range(len(trail) - 1, 0, -1):
+            part, node = trail[index]
+            if node.value is not _MISSING or node.children:
+                break
+            del trail[index - 1][1].children[part]
+
+    @staticmethod
+    def _walk(node: _Node, prefix: List[str]) -> Iterator[Tuple[List[str], Any]]:
+        stack = [(node, prefix)]
+        while stack:
+            current, parts = stack.pop()
+            if current.value is not _MISSING:
+                yield parts, current.value
+            for part, child in current.children.items():
+                stack.append((child, parts + [part]))
@@ -0,0 +1,270 @@
+"""Headless rendering benchmark: drive the renderer against a fake screen.
+
+Run ``python render_bench.py`` (``--help`` for options). Each scenario
+builds a synthetic tree on disk, then times the orchestrator's per-key step
+plus a full ``UIRenderer.render`` per frame and reports frames per second,
+curses calls per frame and the peak memory a frame holds above what was
+live before it (via tracemalloc). The default configuration is used, never
+the user's file.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Any, List, Optional, Sequence, Tuple
+
+from config import UserConfig
+from core_navigator import FileNavigator
+from orchestrator import Orchestrator
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_FRAMES = 200
+LAYOUTS = ("list", "matrix")
+VARIANTS = ("plain", "expanded", "marked", "visual")
+SCREEN_SIZE = (50, 160)
+
+
+class FakeScreen:
+    """In-memory stand-in for a curses window that counts every call."""
+
+    def __init__(self, height: int = SCREEN_SIZE[0], width: int = SCREEN_SIZE[1]):
+        self.size = (height, width)
+        self.calls: Counter = Counter()
+
+    def getmaxyx(self) -> Tuple[int, int]:
+        return self.size
+
+    def addstr(self, *args: Any) -> None:
+        self.calls["addstr"] += 1
+
+    def addch(self, *args: Any) -> None:
+        self.calls["addch"] += 1
+
+    def erase(self) -> None:
+        self.calls["erase"] += 1
+
+    def clear(self) -> None:
+        self.calls["clear"] += 1
+
+    def move(self, y: int, x: int) -> None:
+        self.calls["move"] += 1
+
+    def clrtoeol(self) -> None:
+        self.calls["clrtoeol"] += 1
+
+    def refresh(self) -> None:
+        self.calls["refresh"] += 1
+
+    def getch(self) -> int:
+        return -1
+
+    def timeout(self, delay: int) -> None:
+        pass
+
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+
+@dataclass
+class Result:
+    scenario: str
+    entries: int
+    rows: int
+    frames: int
+    fps: float
+    key_ms: float
+    render_ms: float
+    calls_per_frame: float
+    peak_kib_per_frame: float
+
+
+def build_tree(root: str, entries: int) -> List[str]:
+    """Create *entries* files and directories under *root*.
+
+    Half are files directly in *root*; the rest are spread over about
+    sqrt(entries / 2) subdirectories, which the "expanded" variant expands.
+    """
+    subdir_count = max(1, int(math.sqrt(entries / 2)))
+    per_dir = max(1, (entries // 2) // subdir_count)
+    subdirs = []
+    for index in range(subdir_count):
+        path = os.path.join(root, f"dir{index:04}")
+        os.mkdir(path)
+        subdirs.append(path)
+        for child in range(per_dir):
+            open(os.path.join(path, f"file{child:05}.txt"), "w").close()
+    for index in range(max(0, entries - subdir_count * (per_dir + 1))):
+        open(os.path.join(root, f"top{index:06}.txt"), "w").close()
+    return subdirs
+
+
+def _wait_for_listings(nav: Any, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        nav.build_display_items()
+        if not nav.has_pending_listings() or time.monotonic() > deadline:
+            return
+        time.sleep(0.01)
+
+
+def _prepare(root: str, subdirs: Sequence[str], layout: str, variant: str):
+    orchestrator = Orchestrator(
+        root, navigator_factory=lambda path: FileNavigator(path, config=UserConfig())
+    )
+    orchestrator.setup()
+    nav = orchestrator.navigator
+    screen = FakeScreen()
+    nav.renderer.stdscr = screen
+    nav.layout_mode = layout
+    if variant == "expanded":
+        for path in subdirs:
+            nav.expanded_nodes.add(path)
+    _wait_for_listings(nav)
+    if variant == "marked":
+        for row in nav.build_display_items()[:5_000:3]:
+            nav.marked_items.add(row.path)
+    elif variant == "visual":
+        nav.enter_visual_mode(0)
+    return orchestrator, screen
+
+
+def run_scenario(
+    root: str,
+    subdirs: Sequence[str],
+    entries: int,
+    layout: str,
+    variant: str,
+    frames: int = DEFAULT_FRAMES,
+) -> Result:
+    """Time *frames* key presses plus renders of one layout and variant."""
+    orchestrator, screen = _prepare(root, subdirs, layout, variant)
+    nav = orchestrator.navigator
+    # A selection move that keeps marks and visual mode intact.
+    key = ord("l") if layout == "matrix" else ord("j")
+    handle_input = orchestrator._handle_input
+    render = nav.renderer.render
+    clock = time.perf_counter
+    try:
+        rows = len(nav.build_display_items())
+        render()  # the first frame paints every cell
+
+        screen.calls.clear()
+        key_time = render_time = 0.0
+        for _ in range(frames):
+            started = clock()
+            handle_input(screen, key)
+            keyed = clock()
+            render()
+            key_time += keyed - started
+            render_time += clock() - keyed
+        calls = screen.total_calls()
+
+        # tracemalloc slows everything down, so memory gets its own pass.
+        traced_frames = max(1, frames // 4)
+        peak = 0
+        tracemalloc.start()
+        try:
+            for _ in range(traced_frames):
+                baseline = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                handle_input(screen, key)
+                render()
+                peak += tracemalloc.get_traced_memory()[1] - baseline
+        finally:
+            tracemalloc.stop()
+    finally:
+        nav.close()
+
+    elapsed = key_time + render_time
+    return Result(
+        scenario=f"{layout}/{variant}",
+        entries=entries,
+        rows=rows,
+        frames=frames,
+        fps=frames / elapsed if elapsed else float("inf"),
+        key_ms=key_time / frames * 1000,
+        render_ms=render_time / frames * 1000,
+        calls_per_frame=calls / frames,
+        peak_kib_per_frame=peak / traced_frames / 1024,
+    )
+
+
+def run(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    layouts: Sequence[str] = LAYOUTS,
+    variants: Sequence[str] = VARIANTS,
+    frames: int = DEFAULT_FRAMES,
+    on_result: Optional[Any] = None,
+) -> List[Result]:
+    results: List[Result] = []
+    for entries in sizes:
+        root = tempfile.mkdtemp(prefix="o-bench-")
+        try:
+            subdirs = build_tree(root, entries)
+            for layout in layouts:
+                for variant in variants:
+                    result = run_scenario(
+                        root, subdirs, entries, layout, variant, frames
+                    )
+                    results.append(result)
+                    if on_result is not None:
+                        on_result(result)
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+_HEADER = (
+    f"{'scenario':<18}{'entries':>9}{'rows':>9}{'fps':>10}"
+    f"{'key ms':>9}{'render ms':>11}{'calls/f':>9}{'peak KiB':>9}"
+)
+
+
+def format_result(result: Result) -> str:
+    return (
+        f"{result.scenario:<18}{result.entries:>9}{result.rows:>9}"
+        f"{result.fps:>10.1f}{result.key_ms:>9.3f}{result.render_ms:>11.3f}"
+        f"{result.calls_per_frame:>9.1f}{result.peak_kib_per_frame:>9.1f}"
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=lambda text: [int(part) for part in text.split(",")],
+        default=list(DEFAULT_SIZES),
+        help="comma-separated tree sizes (default: 1000,10000,100000)",
+    )
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES)
+    parser.add_argument("--layouts", nargs="+", choices=LAYOUTS, default=LAYOUTS)
+    parser.add_argument("--variants", nargs="+", choices=VARIANTS, default=VARIANTS)
+    parser.add_argument(
+        "--json", action="store_true", help="print results as JSON lines"
+    )
+    args = parser.parse_args(argv)
+
+    def report(result: Result) -> None:
+        if args.json:
+            print(json.dumps(asdict(result)), flush=True)
+        else:
+            print(format_result(result), flush=True)
+
+    if not args.json:
+        print(_HEADER)
+    run(args.sizes, args.layouts, args.variants, args.frames, on_result=report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,19 @@
+import time
+
+import pytest
+
+
+def _wait_for(predicate, timeout: float = 2.0):
+    """Poll *predicate* until it returns something truthy or time runs out."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = predicate()
+        if result:
+            return result
+        time.sleep(0.01)
+    return predicate()
+
+
+@pytest.fixture
+def wait_for():
+    return _wait_for
@@ -129,3 +129,71 @@ def test_normalize_executors_with_fallbacks(monkeypatch):
     assert executors_spec.shell == ["/bin/dash", "-c"]
     assert any("Invalid python executor" in w for w in warnings)
     assert any("Invalid shell executor" in w for w in warnings)
+
+
+def _load_config(tmp_path: Path, monkeypatch, payload: Dict[str, Any]):
+    cfg_path = tmp_path / "config.json"
+    cfg_path.write_text(json.dumps(payload), encoding="utf-8")
+    monkeypatch.setattr(config, "_config_path", lambda: str(cfg_path), raising=False)
+    return config.load_user_config()
+
+
+TUNING_KEYS = (
+    "watch_directories",
+    "gitignore_engine",
+    "background_listing",
+    "expand_all_max_entries",
+    "expand_all_max_depth",
+    "matrix_fps",
+    "matrix_idle_after",
+)
+
+
+def test_load_user_config_reads_tuning_options(tmp_path: Path, monkeypatch):
+    payload: Dict[str, Any] = {
+        "watch_directories": False,
+        "gitignore_engine": "git",
+        "background_listing": False,
+        "expand_all_max_entries": 500,
+        "expand_all_max_depth": 3,
+        "matrix_fps": 60,
+        "matrix_idle_after": 2.5,
+    }
+
+    user_config = _load_config(tmp_path, monkeypatch, payload)
+
+    assert {key: getattr(user_config, key) for key in TUNING_KEYS} == payload
+    assert isinstance(user_config.matrix_fps, float)
+
+
+def test_load_user_config_replaces_invalid_tuning_options(
+    tmp_path: Path, monkeypatch
+):
+    payload: Dict[str, Any] = {
+        "watch_directories": "no",
+        "gitignore_engine": "hg",
+        "background_listing": 0,
+        "expand_all_max_entries": True,
+        "expand_all_max_depth": -1,
+        "matrix_fps": 500,
+        "matrix_idle_after": "soon",
+    }
+
+    user_config = _load_config(tmp_path, monkeypatch, payload)
+
+    defaults = config.UserConfig()
+    for key in TUNING_KEYS:
+        assert getattr(user_config, key) == getattr(defaults, key), key
+
+
+def test_load_user_config_defaults_absent_tuning_options(tmp_path: Path, monkeypatch):
+    user_config = _load_config(tmp_path, monkeypatch, {})
+
+    assert user_config.watch_directories is True
+    assert user_config.gitignore_engine == "builtin"
+    assert user_config.background_listing is True
+    assert user_config.expand_all_max_entries == 20000
+    assert user_config.expand_all_max_depth == 12
+    assert user_config.matrix_fps == 25.0
+    assert user_config.matrix_idle_after == 30.0
+    assert user_config.warnings == []
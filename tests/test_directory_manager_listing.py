@@ -0,0 +1,139 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import directory_manager
+from directory_manager import DirectoryManager
+
+
+def test_list_directory_resolves_symlinks_and_skips_dangling_links(tmp_path):
+    (tmp_path / "real_dir").mkdir()
+    (tmp_path / "file.txt").write_text("x\n", encoding="utf-8")
+    os.symlink(tmp_path / "real_dir", tmp_path / "linked_dir")
+    os.symlink(tmp_path / "missing", tmp_path / "dangling")
+
+    manager = DirectoryManager(str(tmp_path))
+
+    assert manager.list_directory(str(tmp_path)) == [
+        ("linked_dir", True),
+        ("real_dir", True),
+        ("file.txt", False),
+    ]
+
+
+def test_list_directory_reuses_scandir_results_for_type_and_mtime(
+    tmp_path, monkeypatch
+):
+    now = time.time()
+    for idx in range(3):
+        path = tmp_path / f"file{idx}.txt"
+        path.write_text("x\n", encoding="utf-8")
+        os.utime(path, (now - idx, now - idx))
+    (tmp_path / "sub").mkdir()
+    os.utime(tmp_path / "sub", (now + 10, now + 10))
+
+    def unexpected(*_args, **_kwargs):
+        raise AssertionError("per-entry stat helpers should not be used")
+
+    for helper in ("exists", "isdir", "getmtime"):
+        monkeypatch.setattr(directory_manager.os.path, helper, unexpected)
+
+    manager = DirectoryManager(str(tmp_path))
+    manager.set_sort_mode("mtime_asc")
+
+    assert manager.get_items() == [
+        ("file2.txt", False),
+        ("file1.txt", False),
+        ("file0.txt", False),
+        ("sub", True),
+    ]
+
+
+def _age_directory(path: Path, seconds: float = 60.0) -> None:
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_get_items_serves_cached_listing_while_directory_is_unchanged(
+    tmp_path, monkeypatch
+):
+    (tmp_path / "a.txt").write_text("a\n", encoding="utf-8")
+    _age_directory(tmp_path)
+    manager = DirectoryManager(str(tmp_path))
+    assert manager.get_items() == [("a.txt", False)]
+
+    scans = []
+    real_scan = manager._scan_entries
+    monkeypatch.setattr(
+        manager, "_scan_entries", lambda path: scans.append(path) or real_scan(path)
+    )
+
+    assert manager.get_items() == [("a.txt", False)]
+    assert scans == []
+
+
+def test_get_items_picks_up_changes_made_by_other_processes(tmp_path):
+    (tmp_path / "a.txt").write_text("a\n", encoding="utf-8")
+    _age_directory(tmp_path, 120.0)
+    manager = DirectoryManager(str(tmp_path))
+    assert manager.get_items() == [("a.txt", False)]
+
+    (tmp_path / "b.txt").write_text("b\n", encoding="utf-8")
+    _age_directory(tmp_path, 60.0)
+
+    assert manager.get_items() == [("a.txt", False), ("b.txt", False)]
+
+
+def test_invalidate_directory_keeps_other_caches(tmp_path):
+    first = tmp_path / "first"
+    second = tmp_path / "second"
+    for directory in (first, second):
+        directory.mkdir()
+        (directory / "item.txt").write_text("x\n", encoding="utf-8")
+        _age_directory(directory)
+
+    manager = DirectoryManager(str(first))
+    manager.list_directory(str(first))
+    manager.list_directory(str(second))
+
+    manager.invalidate_directory(str(first))
+
+    assert str(first.resolve()) not in manager._cache
+    assert str(second.resolve()) in manager._cache
+
+
+def test_expanded_subtrees_are_listed_through_the_validated_cache(
+    tmp_path, monkeypatch
+):
+    from core_navigator import FileNavigator
+
+    child = tmp_path / "child"
+    child.mkdir()
+    (child / "inner.txt").write_text("x\n", encoding="utf-8")
+    _age_directory(child)
+    _age_directory(tmp_path)
+
+    nav = FileNavigator(str(tmp_path))
+    try:
+        nav.expanded_nodes.add(str(child))
+        first = nav.build_display_items()
+
+        scans = []
+        real_scan = nav.dir_manager._scan_entries
+        monkeypatch.setattr(
+            nav.dir_manager,
+            "_scan_entries",
+            lambda path: scans.append(path) or real_scan(path),
+        )
+
+        assert nav.build_display_items() == first
+        assert scans == []
+
+        nav.notify_directory_changed(str(child))
+        nav.build_display_items()
+        assert scans == [str(child.resolve())]
+    finally:
+        nav.close()
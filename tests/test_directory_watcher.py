@@ -0,0 +1,139 @@
+import errno
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core_navigator import FileNavigator
+import directory_watcher
+from directory_watcher import DirectoryWatcher, IN_CREATE
+
+_probe = DirectoryWatcher()
+inotify_required = pytest.mark.skipif(
+    not _probe.available, reason="inotify is required for watcher tests"
+)
+_probe.close()
+
+
+@inotify_required
+def test_watcher_queues_events_for_watched_directories(tmp_path, wait_for):
+    watcher = DirectoryWatcher()
+    try:
+        watcher.watch_paths([str(tmp_path)])
+        assert watcher.watched_paths == {str(tmp_path)}
+
+        (tmp_path / "new.txt").write_text("x\n", encoding="utf-8")
+
+        pending = wait_for(watcher.drain)
+        events = pending[str(tmp_path)]
+        assert any(mask & IN_CREATE and name == "new.txt" for mask, name in events)
+
+        watcher.watch_paths([])
+        assert watcher.watched_paths == set()
+    finally:
+        watcher.close()
+
+
+@inotify_required
+def test_navigator_invalidates_listing_only_for_visible_changes(tmp_path, wait_for):
+    (tmp_path / "a.txt").write_text("a\n", encoding="utf-8")
+    nav = FileNavigator(str(tmp_path))
+    try:
+        if nav.directory_watcher is None:
+            pytest.skip("directory watching disabled in user config")
+        nav.sync_directory_watches()
+        assert [row[0] for row in nav.build_display_items()] == ["a.txt"]
+
+        (tmp_path / ".hidden.swp").write_text("x\n", encoding="utf-8")
+        time.sleep(0.1)
+        assert nav.process_directory_events() is False
+
+        (tmp_path / "b.txt").write_text("b\n", encoding="utf-8")
+        assert wait_for(nav.process_directory_events) is True
+        assert [row[0] for row in nav.build_display_items()] == ["a.txt", "b.txt"]
+    finally:
+        nav.close()
+
+
+@inotify_required
+def test_watcher_backs_off_refused_paths(tmp_path, monkeypatch):
+    watcher = DirectoryWatcher()
+    try:
+        missing = str(tmp_path / "missing")
+        watcher.watch_paths([missing])
+        assert watcher.failed_paths == {missing: errno.ENOENT}
+
+        attempts = []
+        add_watch = watcher._add_watch
+        monkeypatch.setattr(
+            watcher, "_add_watch", lambda path: attempts.append(path) or add_watch(path)
+        )
+        watcher.watch_paths([missing])
+        assert attempts == []
+
+        error, backoff, _retry_at = watcher._failed[missing]
+        assert backoff == directory_watcher.RETRY_BACKOFF
+        watcher._failed[missing] = (error, backoff, 0.0)
+        watcher.watch_paths([missing])
+        assert attempts == [missing]
+        assert watcher._failed[missing][1] == 2 * directory_watcher.RETRY_BACKOFF
+    finally:
+        watcher.close()
+
+
+@inotify_required
+def test_watcher_waits_for_a_free_slot_after_enospc(tmp_path, monkeypatch):
+    watcher = DirectoryWatcher()
+    try:
+        watched = str(tmp_path)
+        watcher.watch_paths([watched])
+
+        attempts = []
+
+        def refuse(path):
+            attempts.append(path)
+            return errno.ENOSPC
+
+        monkeypatch.setattr(watcher, "_add_watch", refuse)
+        watcher.watch_paths([watched, "/a", "/b"])
+        assert len(attempts) == 1
+        assert watcher.failed_paths == {"/a": errno.ENOSPC, "/b": errno.ENOSPC}
+
+        attempts.clear()
+        watcher.watch_paths([watched, "/a", "/b"])
+        assert attempts == []
+
+        # Dropping the real watch frees a slot, so the refused paths retry.
+        watcher.watch_paths(["/a", "/b"])
+        assert len(attempts) == 1
+    finally:
+        watcher.close()
+
+
+@inotify_required
+def test_navigator_resyncs_watches_only_after_changes(tmp_path, monkeypatch):
+    (tmp_path / "sub").mkdir()
+    nav = FileNavigator(str(tmp_path))
+    try:
+        if nav.directory_watcher is None:
+            pytest.skip("directory watching disabled in user config")
+        synced = []
+        watch_paths = nav.directory_watcher.watch_paths
+        monkeypatch.setattr(
+            nav.directory_watcher,
+            "watch_paths",
+            lambda paths: synced.append(set(paths)) or watch_paths(paths),
+        )
+        nav.sync_directory_watches()
+        nav.sync_directory_watches()
+        assert synced == [{str(tmp_path)}]
+
+        nav.expanded_nodes.add(str(tmp_path / "sub"))
+        nav.sync_directory_watches()
+        nav.sync_directory_watches()
+        assert synced[1:] == [{str(tmp_path), str(tmp_path / "sub")}]
+    finally:
+        nav.close()
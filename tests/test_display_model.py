@@ -0,0 +1,269 @@
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import display_model
+from core_navigator import FileNavigator
+from expansion_set import ExpansionSet
+
+
+def _names(items):
+    return [item[0] for item in items]
+
+
+def test_display_rows_are_shared_until_state_changes(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "inner.txt").write_text("", encoding="utf-8")
+    (tmp_path / "b.txt").write_text("", encoding="utf-8")
+    nav = FileNavigator(str(tmp_path))
+    try:
+        first = nav.build_display_items()
+        builds = nav.display_model.builds
+        assert nav.build_display_items() is first
+        assert nav.display_model.builds == builds
+
+        nav.expanded_nodes.add(str(tmp_path / "sub"))
+        assert _names(nav.build_display_items()) == ["sub", "inner.txt", "b.txt"]
+
+        nav.dir_manager.filter_pattern = "/b"
+        assert _names(nav.build_display_items()) == ["b.txt"]
+
+        nav.dir_manager.filter_pattern = ""
+        nav.expanded_nodes = set()
+        assert isinstance(nav.expanded_nodes, ExpansionSet)
+        assert _names(nav.build_display_items()) == ["sub", "b.txt"]
+    finally:
+        nav.close()
+
+
+def test_invalidation_and_expiry_rebuild_the_snapshot(
+    tmp_path, monkeypatch, wait_for
+):
+    (tmp_path / "a.txt").write_text("", encoding="utf-8")
+    nav = FileNavigator(str(tmp_path))
+    try:
+        assert _names(nav.build_display_items()) == ["a.txt"]
+
+        (tmp_path / "b.txt").write_text("", encoding="utf-8")
+        nav.dir_manager.invalidate_directory(str(tmp_path))
+        assert wait_for(lambda: _names(nav.build_display_items()) == ["a.txt", "b.txt"])
+
+        # Without a watcher event, the snapshot re-validates once it expires.
+        monkeypatch.setattr(display_model, "REVALIDATE_INTERVAL", 0.0)
+        (tmp_path / "c.txt").write_text("", encoding="utf-8")
+        assert wait_for(
+            lambda: _names(nav.build_display_items()) == ["a.txt", "b.txt", "c.txt"],
+            timeout=3.0,
+        )
+    finally:
+        nav.close()
+
+
+def test_revalidation_skips_watched_directories(tmp_path, monkeypatch):
+    (tmp_path / "sub").mkdir()
+    nav = FileNavigator(str(tmp_path))
+    try:
+        if nav.directory_watcher is None:
+            pytest.skip("directory watching unavailable")
+        nav.expanded_nodes.add(str(tmp_path / "sub"))
+        nav.build_display_items()
+        nav.directory_watcher.watch_paths([str(tmp_path)])
+        revalidated = []
+        monkeypatch.setattr(nav.dir_manager, "get_listing", revalidated.append)
+        nav.display_model._revalidate()
+        assert revalidated == [str(tmp_path / "sub")]
+    finally:
+        nav.close()
+
+
+def test_expansion_set_versions_only_real_changes():
+    expanded = ExpansionSet({"/a"})
+    expanded.add("/a")
+    expanded.discard("/missing")
+    assert expanded.version == 0
+
+    expanded.add("/b")
+    expanded -= {"/a"}
+    expanded.clear()
+    assert expanded.version == 3
+
+
+def test_expand_and_collapse_splice_instead_of_rebuilding(tmp_path, monkeypatch):
+    for name in ("a", "b"):
+        (tmp_path / name / "deep").mkdir(parents=True)
+        (tmp_path / name / "deep" / "leaf.txt").write_text("", encoding="utf-8")
+        (tmp_path / name / f"{name}.txt").write_text("", encoding="utf-8")
+    (tmp_path / "z.txt").write_text("", encoding="utf-8")
+    monkeypatch.setattr(display_model, "REVALIDATE_INTERVAL", 60.0)
+    nav = FileNavigator(str(tmp_path))
+    try:
+        model = nav.display_model
+        nav.build_display_items()
+        builds = model.builds
+
+        nav.expanded_nodes.add(str(tmp_path / "b"))
+        nav.expanded_nodes.add(str(tmp_path / "a"))
+        nav.expanded_nodes.add(str(tmp_path / "a" / "deep"))
+        rows = nav.build_display_items()
+        assert [(item[0], item[3]) for item in rows] == [
+            ("a", 0), ("deep", 1), ("leaf.txt", 2), ("a.txt", 1),
+            ("b", 0), ("deep", 1), ("b.txt", 1), ("z.txt", 0),
+        ]
+
+        nav.expanded_nodes.discard(str(tmp_path / "a"))
+        assert _names(nav.build_display_items()) == ["a", "b", "deep", "b.txt", "z.txt"]
+        nav.expanded_nodes.add(str(tmp_path / "a"))
+        assert nav.build_display_items() == rows
+        assert model.builds == builds
+        # "a/deep" was already expanded when "a" was spliced in.
+        assert model.splices == 4
+
+        # A bulk change is not logged per path, so it rebuilds.
+        nav.expanded_nodes.clear()
+        assert _names(nav.build_display_items()) == ["a", "b", "z.txt"]
+        assert model.builds == builds + 1
+    finally:
+        nav.close()
+
+
+def test_row_index_tracks_splices_and_resolves_paths(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "one.txt").write_text("", encoding="utf-8")
+    (tmp_path / "a" / "two.txt").write_text("", encoding="utf-8")
+    (tmp_path / "z.txt").write_text("", encoding="utf-8")
+    nav = FileNavigator(str(tmp_path))
+    try:
+        model = nav.display_model
+        assert model.row_of(str(tmp_path / "z.txt")) == 1
+
+        nav.expanded_nodes.add(str(tmp_path / "a"))
+        assert model.row_of(str(tmp_path / "a" / "two.txt")) == 2
+        assert model.row_of(str(tmp_path / "z.txt")) == 3
+        nav.expanded_nodes.discard(str(tmp_path / "a"))
+        assert model.row_of(str(tmp_path / "a" / "two.txt")) is None
+        assert model.row_of(str(tmp_path / "z.txt")) == 1
+
+        assert model.row_of(str(tmp_path / "missing")) is None
+        unresolved = os.path.join(str(tmp_path), "a", "..", "z.txt")
+        assert model.row_of(unresolved) is None
+        assert model.row_of(unresolved, resolve=True) == 1
+    finally:
+        nav.close()
+
+
+def test_expansion_set_answers_branch_queries_from_its_tries(tmp_path):
+    real = tmp_path / "real"
+    (real / "a" / "b").mkdir(parents=True)
+    (real / "c").mkdir()
+    (tmp_path / "link").symlink_to(real)
+    real_a = str(real / "a")
+    expanded = ExpansionSet([str(real)])
+    expanded.add(real_a)
+    expanded.add(str(real / "a" / "b"))
+    expanded.add(str(real / "c"))
+    expanded.add(str(tmp_path / "link" / "c"))
+    # Inserts never touch the filesystem; listing jobs report real paths.
+    assert expanded.paths_under_real(str(real / "c")) == [str(real / "c")]
+    expanded.set_real(str(tmp_path / "link" / "c"), str(real / "c"))
+
+    assert expanded.contains_real(str(tmp_path / "link" / "a"))
+    assert not expanded.contains_real(str(tmp_path))
+    assert sorted(expanded.paths_under(real_a)) == [real_a, str(real / "a" / "b")]
+    assert sorted(expanded.paths_under_real(str(tmp_path / "link" / "c"))) == [
+        str(tmp_path / "link" / "c"),
+        str(real / "c"),
+    ]
+
+    version = expanded.version
+    assert expanded.discard_paths(expanded.paths_under(str(real))) == 4
+    # Only the outermost removal is logged; its span covers the rest.
+    assert expanded.changes_since(version) == ((version + 1, "discard", str(real)),)
+    assert set(expanded) == {str(tmp_path / "link" / "c")}
+    assert expanded.paths_under_real(str(real)) == [str(tmp_path / "link" / "c")]
+
+
+def test_expansions_follow_what_listing_jobs_report(tmp_path, wait_for):
+    real = tmp_path / "real"
+    (real / "inner").mkdir(parents=True)
+    link = tmp_path / "link"
+    link.symlink_to(real)
+    nav = FileNavigator(str(tmp_path))
+    try:
+        nav.expanded_nodes.add(str(link))
+        assert not nav.expanded_nodes.contains_real(str(real))
+        assert wait_for(lambda: "inner" in _names(nav.build_display_items()))
+        assert nav.expanded_nodes.contains_real(str(real))
+
+        (real / "inner").rmdir()
+        real.rmdir()
+        nav.dir_manager.invalidate_directory(str(link))
+
+        def dropped():
+            nav.build_display_items()
+            return str(link) not in nav.expanded_nodes
+
+        assert wait_for(dropped)
+        assert nav.dir_manager.is_missing(str(link))
+    finally:
+        nav.close()
+
+
+def test_virtual_rows_agree_with_a_full_walk(tmp_path):
+    for top in ("a", "b", "c"):
+        for inner in ("x", "y"):
+            (tmp_path / top / inner).mkdir(parents=True)
+            (tmp_path / top / inner / "leaf.txt").write_text("", encoding="utf-8")
+        (tmp_path / top / "file.txt").write_text("", encoding="utf-8")
+    nav = FileNavigator(str(tmp_path))
+    try:
+        for path in ("a", "a/y", "c", "c/x", "c/y", "b/x"):
+            nav.expanded_nodes.add(str(tmp_path / path))
+        before = nav.build_display_items()
+        flat = [tuple(row) for row in before]
+        # "b/x" is expanded, but hidden while "b" is collapsed.
+        assert len(before) == len(flat) == 3 + 3 + 1 + 3 + 1 + 1
+        for offset in range(len(flat)):
+            assert tuple(before[offset]) == flat[offset]
+            assert [tuple(row) for row in nav.display_model.rows(offset, 3)] == flat[
+                offset : offset + 3
+            ]
+            assert nav.display_model.row_of(flat[offset][2]) == offset
+
+        nav.expanded_nodes.add(str(tmp_path / "b"))
+        after = nav.build_display_items()
+        assert len(after) == len(flat) + 4
+        assert [tuple(row) for row in before] == flat  # old snapshots are kept
+        assert nav.display_model.row_of(str(tmp_path / "b" / "x" / "leaf.txt")) == 7
+    finally:
+        nav.close()
+
+
+def test_build_only_absorbs_worker_stores_it_waited_for(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "inner.txt").write_text("", encoding="utf-8")
+    nav = FileNavigator(str(tmp_path))
+    try:
+        dm = nav.dir_manager
+        assert dm.listing_workers is not None
+        nav.build_display_items()
+
+        # A store the build waited for is part of the view.
+        with dm.building_view() as view:
+            dm.get_listing(str(tmp_path / "sub"))
+        assert view.generation == dm.generation
+
+        # A store it did not wait for may have been missed.
+        with dm.building_view() as view:
+            worker = threading.Thread(
+                target=dm._bump_generation, args=(str(tmp_path),)
+            )
+            worker.start()
+            worker.join()
+        assert view.generation == view.start != dm.generation
+    finally:
+        nav.close()
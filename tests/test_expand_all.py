@@ -0,0 +1,93 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core_navigator import FileNavigator
+from directory_manager import DirectoryManager
+from expand_all import ExpandAllJob
+from listing_workers import ListingWorkers
+
+
+def _make_tree(root, depth, fanout):
+    if depth == 0:
+        return
+    for index in range(fanout):
+        child = root / f"d{index}"
+        child.mkdir()
+        (child / "file.txt").write_text("", encoding="utf-8")
+        _make_tree(child, depth - 1, fanout)
+
+
+def _run(job):
+    deadline = time.monotonic() + 5.0
+    while not job.done:
+        assert time.monotonic() < deadline
+        job.poll()
+        time.sleep(0.005)
+
+
+def test_expand_all_respects_depth_and_entry_budgets(tmp_path):
+    _make_tree(tmp_path, 3, 2)
+    manager = DirectoryManager(str(tmp_path))
+    expanded = []
+
+    def expand(path):
+        expanded.append(path)
+        return True
+
+    job = ExpandAllJob(manager, str(tmp_path), expand, max_depth=2)
+    _run(job)
+    assert len(expanded) == 6 and job.truncated
+    assert all(len(Path(path).relative_to(tmp_path).parts) <= 2 for path in expanded)
+    assert job.summary() == "Expanded 6 directories (limit reached)"
+
+    expanded.clear()
+    job = ExpandAllJob(manager, str(tmp_path), expand, max_entries=1, max_workers=1)
+    _run(job)
+    assert job.truncated and len(expanded) < 14
+
+
+def test_navigator_expand_all_reveals_rows_and_can_be_cancelled(tmp_path):
+    _make_tree(tmp_path, 2, 2)
+    nav = FileNavigator(str(tmp_path))
+    try:
+        nav.start_expand_all()
+        deadline = time.monotonic() + 5.0
+        while nav.expand_job is not None:
+            assert time.monotonic() < deadline
+            nav.poll_expand_all()
+            time.sleep(0.005)
+        assert nav.status_message == "Expanded 6 directories"
+        assert len(nav.build_display_items()) == 2 + 2 * (2 + 2 * 1 + 1)
+
+        nav.expanded_nodes.clear()
+        nav.start_expand_all()
+        assert nav.cancel_expand_all()
+        assert nav.expand_job is None
+        assert nav.status_message.startswith("Expand cancelled")
+        assert not nav.cancel_expand_all()
+    finally:
+        nav.close()
+
+
+def test_expand_all_lists_on_the_managers_workers(tmp_path):
+    _make_tree(tmp_path, 2, 2)
+    manager = DirectoryManager(str(tmp_path))
+    manager.listing_workers = ListingWorkers()
+    try:
+        expanded = []
+
+        def expand(path):
+            expanded.append(path)
+            return True
+
+        job = ExpandAllJob(manager, str(tmp_path), expand)
+        assert job.workers is manager.listing_workers
+        _run(job)
+        assert len(expanded) == 6
+        # The shared pool outlives the job.
+        assert manager.listing_workers.submit("k", lambda: 1).result(timeout=2.0) == 1
+    finally:
+        manager.close()
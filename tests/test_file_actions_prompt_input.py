@@ -148,3 +148,14 @@ def test_rename_selected_uses_editor_and_renames(tmp_path, monkeypatch):
     assert notified
     assert os.path.realpath(notified[0]) == os.path.realpath(tmp_path)
     assert nav.status_message == "Renamed to new.txt"
+
+
+def test_prompt_invalidates_the_renderer_frame(monkeypatch):
+    monkeypatch.setattr("file_actions.curses.curs_set", lambda n: None)
+    invalidated = []
+    nav = _make_nav(FakeStdScr([13]))
+    nav.renderer.invalidate_frame = lambda: invalidated.append(True)
+
+    FileActionService(nav)._prompt_for_input("Name: ")
+
+    assert invalidated == [True]
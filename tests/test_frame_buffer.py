@@ -0,0 +1,160 @@
+import curses
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core_navigator import FileNavigator
+from frame_buffer import FrameBuffer
+from orchestrator import Orchestrator
+
+
+class _Window:
+    def __init__(self, height=4, width=10):
+        self.size = (height, width)
+        self.calls = []
+
+    def getmaxyx(self):
+        return self.size
+
+    def addstr(self, y, x, text, attr=0):
+        self.calls.append((y, x, text, attr))
+
+    def refresh(self):
+        pass
+
+    def timeout(self, delay):
+        pass
+
+    def getch(self):
+        return -1
+
+
+def _draw(frame, rows):
+    frame.begin()
+    for y, text in enumerate(rows):
+        frame.addstr(y, 0, text)
+
+
+def test_frame_buffer_writes_only_changed_runs():
+    window = _Window()
+    frame = FrameBuffer(window)
+    _draw(frame, ["header", "abc", "", "status"])
+    frame.present()
+    assert len(window.calls) == 4  # one run per row on the first frame
+
+    window.calls.clear()
+    _draw(frame, ["header", "abc", "", "status"])
+    frame.present()
+    assert window.calls == []
+
+    window.calls.clear()
+    _draw(frame, ["header", "aXc", "", "status"])
+    frame.addch(2, 5, "*", curses.A_BOLD)
+    frame.present()
+    assert window.calls == [(1, 1, "X", 0), (2, 5, "*", curses.A_BOLD)]
+
+    window.calls.clear()
+    frame.invalidate()
+    _draw(frame, ["header", "aXc", "", "status"])
+    frame.present()
+    assert len(window.calls) == 4
+
+
+def test_frame_buffer_keeps_wide_characters_whole():
+    window = _Window(1, 6)
+    frame = FrameBuffer(window)
+    _draw(frame, ["名前ab"])
+    frame.present()
+    window.calls.clear()
+
+    _draw(frame, ["名前aZ"])
+    frame.present()
+    assert window.calls == [(0, 5, "Z", 0)]
+
+    window.calls.clear()
+    _draw(frame, ["名字aZ"])
+    frame.present()
+    assert window.calls == [(0, 2, "字", 0)]
+
+
+def test_unchanged_list_view_costs_no_curses_writes(tmp_path):
+    (tmp_path / "a.txt").write_text("", encoding="utf-8")
+    nav = FileNavigator(str(tmp_path))
+    try:
+        nav.layout_mode = "list"
+        window = _Window(10, 40)
+        nav.renderer.stdscr = window
+        nav.renderer.render()
+        assert window.calls
+        window.calls.clear()
+        nav.renderer.render()
+        assert window.calls == []
+    finally:
+        nav.close()
+
+
+def test_moving_the_list_cursor_rewrites_two_rows(tmp_path):
+    for index in range(30):
+        (tmp_path / f"f{index:02}.txt").write_text("", encoding="utf-8")
+    nav = FileNavigator(str(tmp_path))
+    try:
+        nav.layout_mode = "list"
+        window = _Window(20, 40)
+        nav.renderer.stdscr = window
+        nav.renderer.render()
+        frame = nav.renderer._frame
+
+        nav.browser_selected = 1
+        rows_before = frame.rows_written
+        window.calls.clear()
+        nav.renderer.render()
+        assert frame.rows_written - rows_before == 2
+        assert {call[0] for call in window.calls} == {2, 3}
+    finally:
+        nav.close()
+
+
+def test_motion_key_through_the_orchestrator_rewrites_two_rows(tmp_path):
+    for index in range(30):
+        (tmp_path / f"f{index:02}.txt").write_text("", encoding="utf-8")
+    orchestrator = Orchestrator(str(tmp_path))
+    orchestrator.setup()
+    nav = orchestrator.navigator
+    try:
+        nav.layout_mode = "list"
+        window = _Window(20, 40)
+        nav.renderer.stdscr = window
+        nav.renderer.render()
+        frame = nav.renderer._frame
+
+        rows_before = frame.rows_written
+        window.calls.clear()
+        assert orchestrator._handle_input(window, ord("j")) is False
+        nav.renderer.render()
+        assert frame.rows_written - rows_before == 2
+        assert {call[0] for call in window.calls} == {2, 3}
+    finally:
+        nav.close()
+
+
+def test_reused_rows_are_copied_before_drawing_over_them():
+    window = _Window(2, 8)
+    frame = FrameBuffer(window)
+    for _ in range(2):
+        frame.begin()
+        frame.draw_row(0, "abc")
+        frame.present()
+    window.calls.clear()
+
+    frame.begin()
+    frame.draw_row(0, "abc")
+    frame.addstr(0, 4, "pop")
+    frame.present()
+    assert window.calls == [(0, 4, "pop", 0)]
+
+    window.calls.clear()
+    frame.begin()
+    frame.draw_row(0, "abc")
+    frame.present()
+    assert window.calls == [(0, 4, "   ", 0)]
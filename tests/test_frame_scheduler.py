@@ -0,0 +1,52 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from frame_scheduler import FRAME_BUDGET, POLL_INTERVAL, FrameScheduler
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_static_views_paint_only_on_request():
+    clock = _Clock()
+    scheduler = FrameScheduler(fps=10, clock=clock)
+    assert scheduler.should_render(True, animating=False)
+    scheduler.frame_rendered(clock.now)
+    clock.now += 5
+    assert not scheduler.should_render(False, animating=False)
+    assert scheduler.timeout(animating=False) is None
+    assert scheduler.timeout(animating=False, busy=True) == POLL_INTERVAL
+
+
+def test_animation_paces_backs_off_when_idle_and_skips_overruns():
+    clock = _Clock()
+    scheduler = FrameScheduler(fps=10, idle_after=30, clock=clock)
+    scheduler.frame_rendered(clock.now)
+    assert not scheduler.should_render(False, animating=True)
+    clock.now += 0.1
+    assert scheduler.should_render(False, animating=True)
+
+    # A 0.3 s frame at 10 FPS holds the next one back to stay within budget.
+    started = clock.now
+    clock.now += 0.3
+    scheduler.frame_rendered(started)
+    assert scheduler.skipped == round(0.3 / FRAME_BUDGET / 0.1) - 1
+    clock.now = started + 0.3 / FRAME_BUDGET - 0.01
+    assert not scheduler.should_render(False, animating=True)
+    clock.now += 0.02
+    assert scheduler.should_render(False, animating=True)
+
+    clock.now += 31
+    assert scheduler.is_idle()
+    scheduler.frame_rendered(clock.now)
+    clock.now += 0.2
+    assert not scheduler.should_render(False, animating=True)
+    scheduler.note_input()
+    assert scheduler.frame_interval() == 0.1
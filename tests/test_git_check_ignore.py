@@ -0,0 +1,80 @@
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from git_check_ignore import GitCheckIgnore
+
+pytestmark = pytest.mark.skipif(
+    not shutil.which("git"), reason="git is required for check-ignore tests"
+)
+
+
+def _init_repo(repo: Path, gitignore: str) -> None:
+    subprocess.run(["git", "-C", str(repo), "init"], check=True, capture_output=True)
+    (repo / ".gitignore").write_text(gitignore, encoding="utf-8")
+
+
+def test_query_reports_ignore_sources_and_reuses_process(tmp_path):
+    _init_repo(tmp_path, "*.log\n!keep.log\nbuild/\n")
+    (tmp_path / "build").mkdir()
+    checker = GitCheckIgnore(str(tmp_path))
+    try:
+        first = checker.query(["a.log", "keep.log", "build", "src"])
+        process = checker._process
+        second = checker.query(["b.log"])
+
+        assert first == {"a.log": ".gitignore", "build": ".gitignore"}
+        assert second == {"b.log": ".gitignore"}
+        assert checker._process is process
+    finally:
+        checker.close()
+
+
+def test_query_restarts_process_after_it_dies(tmp_path):
+    _init_repo(tmp_path, "*.tmp\n")
+    checker = GitCheckIgnore(str(tmp_path))
+    try:
+        assert checker.query(["x.tmp"]) == {"x.tmp": ".gitignore"}
+        checker._process.kill()
+        checker._process.wait()
+
+        assert checker.query(["y.tmp", "y.txt"]) == {"y.tmp": ".gitignore"}
+    finally:
+        checker.close()
+
+
+def test_query_restarts_process_when_ignore_file_changes(tmp_path):
+    _init_repo(tmp_path, "*.tmp\n")
+    gitignore = str(tmp_path / ".gitignore")
+    checker = GitCheckIgnore(str(tmp_path))
+    try:
+        assert checker.query(["x.tmp", "x.bak"], [gitignore]) == {
+            "x.tmp": ".gitignore"
+        }
+
+        (tmp_path / ".gitignore").write_text("*.tmp\n*.bak\n", encoding="utf-8")
+
+        assert checker.query(["x.tmp", "x.bak"], [gitignore]) == {
+            "x.tmp": ".gitignore",
+            "x.bak": ".gitignore",
+        }
+    finally:
+        checker.close()
+
+
+def test_query_handles_batches_larger_than_pipe_buffers(tmp_path):
+    _init_repo(tmp_path, "*.o\n")
+    names = [f"f{idx}.o" if idx % 2 else f"f{idx}.c" for idx in range(20000)]
+    checker = GitCheckIgnore(str(tmp_path))
+    try:
+        result = checker.query(names)
+    finally:
+        checker.close()
+
+    assert len(result) == 10000
+    assert "f1.o" in result and "f0.c" not in result
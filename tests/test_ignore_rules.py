@@ -0,0 +1,180 @@
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import git_check_ignore
+from directory_manager import DirectoryManager
+from ignore_rules import IgnoreRuleSet, RepoIgnoreMatcher, parse_rules, read_index_paths
+
+requires_git = pytest.mark.skipif(
+    not shutil.which("git"), reason="git is required for gitignore integration tests"
+)
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-C", str(repo), *args],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+def _rules(text: str) -> IgnoreRuleSet:
+    return IgnoreRuleSet(parse_rules(text.splitlines(), ".gitignore"))
+
+
+def _ignored(rules: IgnoreRuleSet, path: str, is_dir: bool = False) -> bool:
+    rule = rules.match(path, is_dir)
+    return rule is not None and not rule.negated
+
+
+def test_last_matching_rule_wins_and_negation_reincludes():
+    rules = _rules("*.log\n!keep.log\nkeep.log\n!other.log\n")
+
+    assert _ignored(rules, "a.log")
+    assert _ignored(rules, "sub/keep.log")
+    assert not _ignored(rules, "other.log")
+    assert rules.match("other.log", False).line_number == 4
+
+
+def test_anchoring_double_star_and_directory_only_rules():
+    rules = _rules("/root.txt\ndocs/**/*.tmp\n**/cache\nbuild/\n")
+
+    assert _ignored(rules, "root.txt")
+    assert not _ignored(rules, "sub/root.txt")
+    assert _ignored(rules, "docs/x.tmp")
+    assert _ignored(rules, "docs/a/b/x.tmp")
+    assert _ignored(rules, "deep/cache")
+    assert _ignored(rules, "build", is_dir=True)
+    assert not _ignored(rules, "build")
+
+
+def test_escapes_brackets_and_trailing_spaces():
+    rules = _rules("\\#hash\n[!a-c]y.c\n[[:digit:]]z\nlit\\*star\nspace   \n")
+
+    assert _ignored(rules, "#hash")
+    assert _ignored(rules, "dy.c")
+    assert not _ignored(rules, "ay.c")
+    assert _ignored(rules, "7z")
+    assert _ignored(rules, "lit*star")
+    assert not _ignored(rules, "litXstar")
+    assert _ignored(rules, "space")
+
+
+@requires_git
+def test_builtin_engine_agrees_with_git_check_ignore(tmp_path):
+    repo = tmp_path
+    _git(repo, "init")
+    (repo / ".gitignore").write_text(
+        "*.log\n!keep.log\n/only_root\nout/\nsrc/**/gen\n[0-9]*.bak\n",
+        encoding="utf-8",
+    )
+    (repo / ".git" / "info" / "exclude").write_text("*.secret\n", encoding="utf-8")
+    (repo / "src" / "a").mkdir(parents=True)
+    (repo / "src" / ".gitignore").write_text("*.py\n!/main.py\n", encoding="utf-8")
+    (repo / "out").mkdir()
+
+    layout = {
+        "": ["x.log", "keep.log", "only_root", "out", "1.bak", "k.secret", "src"],
+        "src": ["main.py", "other.py", "only_root", "gen", "a"],
+        "src/a": ["main.py", "gen", "keep.log"],
+        "out": ["anything.txt"],
+    }
+    matcher = RepoIgnoreMatcher(str(repo))
+    for rel_dir, names in layout.items():
+        entries = [(name, (repo / rel_dir / name).is_dir()) for name in names]
+        for name, is_dir in entries:
+            if not is_dir and not (repo / rel_dir / name).exists():
+                (repo / rel_dir / name).write_text("", encoding="utf-8")
+        rel_paths = [f"{rel_dir}/{name}" if rel_dir else name for name in names]
+        expected = git_check_ignore.GitCheckIgnore(str(repo))
+        try:
+            assert matcher.ignore_sources(rel_dir, entries) == expected.query(rel_paths)
+        finally:
+            expected.close()
+
+
+@requires_git
+def test_tracked_paths_are_never_reported_as_ignored(tmp_path):
+    repo = tmp_path
+    _git(repo, "init")
+    (repo / "vendor").mkdir()
+    (repo / "vendor" / "lib.log").write_text("tracked\n", encoding="utf-8")
+    _git(repo, "add", "vendor/lib.log")
+    (repo / ".gitignore").write_text("*.log\nvendor/\n", encoding="utf-8")
+    (repo / "new.log").write_text("", encoding="utf-8")
+
+    matcher = RepoIgnoreMatcher(str(repo))
+
+    assert matcher.ignore_sources("", [("vendor", True), ("new.log", False)]) == {
+        "new.log": ".gitignore"
+    }
+    assert read_index_paths(str(repo / ".git" / "index")) == ["vendor/lib.log"]
+
+
+@requires_git
+def test_builtin_engine_lists_without_starting_git_check_ignore(tmp_path, monkeypatch):
+    repo = tmp_path
+    _git(repo, "init")
+    (repo / ".gitignore").write_text("*.apk\n", encoding="utf-8")
+    (repo / "app.apk").write_text("", encoding="utf-8")
+    (repo / "main.py").write_text("", encoding="utf-8")
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("git check-ignore should not be started")
+
+    monkeypatch.setattr(git_check_ignore.GitCheckIgnore, "_ensure_process", fail)
+    manager = DirectoryManager(str(repo))
+
+    assert [name for name, _is_dir in manager.get_items()] == ["main.py"]
+
+
+@requires_git
+def test_git_engine_watches_the_exclude_files_git_reads(tmp_path, monkeypatch):
+    main = tmp_path / "main"
+    main.mkdir()
+    _git(main, "init")
+    monkeypatch.setenv("GIT_AUTHOR_NAME", "t")
+    monkeypatch.setenv("GIT_AUTHOR_EMAIL", "t@t")
+    monkeypatch.setenv("GIT_COMMITTER_NAME", "t")
+    monkeypatch.setenv("GIT_COMMITTER_EMAIL", "t@t")
+    _git(main, "commit", "--allow-empty", "-m", "init")
+    worktree = tmp_path / "worktree"
+    _git(main, "worktree", "add", "--detach", str(worktree))
+    excludes = tmp_path / "excludes"
+    config = tmp_path / "gitconfig"
+    config.write_text(f"[core]\n\texcludesFile = {excludes}\n", encoding="utf-8")
+    monkeypatch.setenv("GIT_CONFIG_GLOBAL", str(config))
+
+    manager = DirectoryManager(str(worktree))
+    files = manager._ignore_files_for(str(worktree), "sub")
+
+    assert files[:2] == [str(excludes), str(main / ".git" / "info" / "exclude")]
+    assert files[2:] == [
+        str(worktree / ".gitignore"),
+        str(worktree / "sub" / ".gitignore"),
+    ]
+
+
+@requires_git
+def test_git_engine_matches_builtin_engine(tmp_path):
+    repo = tmp_path
+    _git(repo, "init")
+    (repo / ".gitignore").write_text("build/\n*.apk\n", encoding="utf-8")
+    (repo / "build").mkdir()
+    (repo / "app.apk").write_text("", encoding="utf-8")
+    (repo / "main.py").write_text("", encoding="utf-8")
+
+    builtin = DirectoryManager(str(repo))
+    verified = DirectoryManager(str(repo))
+    verified.gitignore_engine = "git"
+    try:
+        assert verified.get_items() == builtin.get_items() == [("main.py", False)]
+    finally:
+        verified.close()
@@ -0,0 +1,62 @@
+import curses
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from input_handler import InputHandler
+
+
+def make_handler(total, layout_mode="list"):
+    entries = [(f"f{i}", False, f"/tmp/f{i}", 0) for i in range(total)]
+    nav = SimpleNamespace(
+        dir_manager=SimpleNamespace(current_path="/tmp", filter_pattern=""),
+        marked_items=set(),
+        expanded_nodes=set(),
+        visual_mode=False,
+        exit_visual_mode=lambda **kwargs: None,
+        status_message="",
+        need_redraw=False,
+        update_visual_active=lambda idx: None,
+        show_help=False,
+        command_popup_visible=False,
+        layout_mode=layout_mode,
+        browser_selected=0,
+        builds=0,
+    )
+
+    def build_display_items():
+        nav.builds += 1
+        return entries
+
+    nav.build_display_items = build_display_items
+    return InputHandler(nav), nav
+
+
+def test_held_motion_keys_fold_into_one_move():
+    keys = [ord("j")] * 40 + [ord("k")] * 3 + [curses.KEY_DOWN] + [11, 11] + [ord("j")]
+
+    one_by_one, nav_single = make_handler(25)
+    for key in keys:
+        one_by_one.handle_key(None, key)
+
+    batched, nav_batched = make_handler(25)
+    assert all(batched.is_motion_key(key) for key in keys)
+    assert batched.handle_keys(None, keys) is False
+
+    assert nav_batched.browser_selected == nav_single.browser_selected
+    assert nav_single.builds == len(keys)
+    # One build per run: j/k/down, the two Ctrl+K jumps, the trailing j.
+    assert nav_batched.builds == 3
+
+
+def test_matrix_mode_folds_h_and_l_only():
+    handler, nav = make_handler(10, layout_mode="matrix")
+    assert not handler.is_motion_key(ord("j"))
+    handler.handle_keys(None, [ord("l")] * 13 + [ord("h")])
+    assert nav.browser_selected == 2
+    assert nav.builds == 1
+
+    handler.pending_operator = "d"
+    assert not handler.is_motion_key(ord("l"))
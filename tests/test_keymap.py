@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from input_handler import InputHandler
+from keymap import Keymap
+
+
+def make_handler(total):
+    entries = [(f"f{i}", False, f"/tmp/f{i}", 0) for i in range(total)]
+    nav = SimpleNamespace(
+        dir_manager=SimpleNamespace(current_path="/tmp", filter_pattern=""),
+        marked_items=set(),
+        expanded_nodes=set(),
+        visual_mode=False,
+        exit_visual_mode=lambda **kwargs: None,
+        status_message="",
+        need_redraw=False,
+        update_visual_active=lambda idx: None,
+        show_help=False,
+        command_popup_visible=False,
+        layout_mode="list",
+        browser_selected=0,
+        builds=0,
+    )
+
+    def build_display_items():
+        nav.builds += 1
+        return entries
+
+    nav.build_display_items = build_display_items
+    return InputHandler(nav), nav
+
+
+def test_keys_that_ignore_the_tree_do_not_build_rows():
+    handler, nav = make_handler(5)
+    assert handler.handle_key(None, ord("?")) is False
+    assert nav.show_help
+    nav.show_help = False
+    assert handler.handle_key(None, ord("d")) is False
+    assert handler.pending_operator == "d"
+    assert handler.handle_key(None, ord("q")) is True
+    assert nav.builds == 0
+
+    handler.handle_key(None, ord("j"))
+    assert nav.builds == 1
+    assert nav.browser_selected == 1
+
+
+def test_layout_binding_overrides_global_binding():
+    keymap = Keymap()
+    keymap.bind([ord("h")], lambda ctx: "any")
+    keymap.bind([ord("h")], lambda ctx: "matrix", layout="matrix")
+    assert keymap.lookup(ord("h"), "list").handler(None) == "any"
+    assert keymap.lookup(ord("h"), "matrix").handler(None) == "matrix"
+    assert keymap.lookup(ord("z"), "list") is None
+
+
+def test_unbound_key_cancels_pending_operator():
+    handler, nav = make_handler(3)
+    handler.handle_key(None, ord("y"))
+    assert handler.pending_operator == "y"
+    handler.handle_key(None, ord("z"))
+    assert handler.pending_operator is None
+    assert nav.builds == 0
@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core_navigator import FileNavigator
+from directory_manager import DirectoryManager
+from listing import DisplayRow, Listing
+
+
+def test_listing_rows_behave_like_name_flag_tuples():
+    listing = Listing("/data", ["docs", "a.txt", "ü.md"], [True, False, False])
+
+    assert len(listing) == 3
+    assert listing == [("docs", True), ("a.txt", False), ("ü.md", False)]
+    name, is_dir = listing[0]
+    assert (name, is_dir) == ("docs", True)
+    assert listing[-1].name == "ü.md" and not listing[-1].is_dir
+    assert listing.path_at(1) == os.path.join("/data", "a.txt")
+    assert list(listing.names()) == ["docs", "a.txt", "ü.md"]
+    assert listing.subset([2, 0]) == [("ü.md", False), ("docs", True)]
+
+    moved = listing.rebased("/link")
+    assert moved.path_at(0) == os.path.join("/link", "docs")
+    # Same entries under another parent are a different listing.
+    assert moved != listing and list(moved) == list(listing)
+    assert moved.rebased("/data") == listing
+
+
+def test_display_rows_unpack_like_tuples_and_join_paths_lazily():
+    listing = Listing("/data", ["docs"], [True])
+    row = DisplayRow(listing, 0, 2)
+
+    name, is_dir, path, depth = row
+    assert (name, is_dir, path, depth) == ("docs", True, os.path.join("/data", "docs"), 2)
+    assert row[2] == path and row[-1] == 2
+    assert row == ("docs", True, path, 2)
+
+
+def test_get_items_shares_the_cached_listing_without_copying(tmp_path):
+    (tmp_path / "b.txt").write_text("", encoding="utf-8")
+    (tmp_path / "a").mkdir()
+    past = time.time() - 60
+    os.utime(tmp_path, (past, past))
+    manager = DirectoryManager(str(tmp_path))
+
+    first = manager.get_items()
+    assert isinstance(first, Listing)
+    assert first is manager.get_items()
+    assert first == [("a", True), ("b.txt", False)]
+
+    manager.filter_pattern = "/b"
+    assert manager.get_filtered_items() == [("b.txt", False)]
+
+
+def test_display_items_are_listing_rows(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "inner.txt").write_text("", encoding="utf-8")
+    nav = FileNavigator(str(tmp_path))
+    try:
+        nav.expanded_nodes.add(str(tmp_path / "sub"))
+        items = nav.build_display_items()
+        assert all(isinstance(item, DisplayRow) for item in items)
+        assert [tuple(item) for item in items] == [
+            ("sub", True, str(tmp_path / "sub"), 0),
+            ("inner.txt", False, str(tmp_path / "sub" / "inner.txt"), 1),
+        ]
+    finally:
+        nav.close()
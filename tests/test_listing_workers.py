@@ -0,0 +1,247 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import directory_manager
+from directory_manager import DirectoryManager
+from listing_workers import ListingWorkers
+
+
+def test_workers_run_one_job_per_key_and_report_back(wait_for):
+    done = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def job(value):
+        calls.append(value)
+        release.wait(2.0)
+        return value * 2
+
+    workers = ListingWorkers(on_done=done.set)
+    try:
+        first = workers.submit("key", job, 1)
+        second = workers.submit("key", job, 5)
+        assert first is second
+        assert workers.pending_since("key") is not None
+
+        release.set()
+        assert first.result(timeout=2.0) == 2
+        assert done.wait(2.0)
+        assert calls == [1]
+        assert wait_for(lambda: not workers.has_pending())
+    finally:
+        workers.close()
+
+
+def _blocking_manager(tmp_path, monkeypatch):
+    (tmp_path / "a.txt").write_text("a\n", encoding="utf-8")
+    release = threading.Event()
+    scan = DirectoryManager._scan_entries
+
+    def slow_scan(self, target_path):
+        release.wait(5.0)
+        return scan(self, target_path)
+
+    monkeypatch.setattr(DirectoryManager, "_scan_entries", slow_scan)
+    ready = threading.Event()
+    manager = DirectoryManager(str(tmp_path))
+    manager.listing_workers = ListingWorkers(on_done=ready.set)
+    return manager, release, ready
+
+
+def test_slow_directory_does_not_block_the_caller(tmp_path, monkeypatch):
+    manager, release, ready = _blocking_manager(tmp_path, monkeypatch)
+    try:
+        started = time.monotonic()
+        assert manager.get_items() == []
+        assert time.monotonic() - started < 1.0
+        assert manager.is_loading(manager.current_path)
+
+        release.set()
+        assert ready.wait(5.0)
+        assert manager.get_items() == [("a.txt", False)]
+        assert not manager.is_loading(manager.current_path)
+    finally:
+        release.set()
+        manager.close()
+
+
+def test_invalidated_listing_is_shown_until_refresh_completes(
+    tmp_path, monkeypatch, wait_for
+):
+    manager, release, ready = _blocking_manager(tmp_path, monkeypatch)
+    try:
+        release.set()
+        assert wait_for(lambda: manager.get_items() == [("a.txt", False)])
+        release.clear()
+        ready.clear()
+
+        (tmp_path / "b.txt").write_text("b\n", encoding="utf-8")
+        manager.invalidate_directory(str(tmp_path))
+        assert manager.get_items() == [("a.txt", False)]
+
+        release.set()
+        assert ready.wait(5.0)
+        assert manager.get_items() == [("a.txt", False), ("b.txt", False)]
+    finally:
+        release.set()
+        manager.close()
+
+
+def test_one_view_build_waits_once_for_hung_directories(tmp_path, monkeypatch):
+    manager, release, _ready = _blocking_manager(tmp_path, monkeypatch)
+    paths = []
+    for index in range(20):
+        (tmp_path / f"d{index}").mkdir()
+        paths.append(str(tmp_path / f"d{index}"))
+    try:
+        with manager.building_view():
+            started = time.monotonic()
+            for path in paths:
+                assert manager.get_listing(path) == []
+            elapsed = time.monotonic() - started
+        # Not FOREGROUND_WAIT per directory, which would be a full second.
+        assert elapsed < 10 * directory_manager.FOREGROUND_WAIT
+    finally:
+        release.set()
+        manager.close()
+
+
+def test_bulk_invalidation_keeps_drawing_the_last_listing(
+    tmp_path, monkeypatch, wait_for
+):
+    manager, release, ready = _blocking_manager(tmp_path, monkeypatch)
+    try:
+        release.set()
+        assert wait_for(lambda: manager.get_items() == [("a.txt", False)])
+        release.clear()
+        ready.clear()
+
+        (tmp_path / ".hidden").write_text("", encoding="utf-8")
+        manager.toggle_hidden()
+        assert manager.get_items() == [("a.txt", False)]
+        manager.set_sort_mode("mtime_desc")
+        assert manager.get_items() == [("a.txt", False)]
+
+        release.set()
+        assert wait_for(lambda: len(manager.get_items()) == 2)
+    finally:
+        release.set()
+        manager.close()
+
+
+def test_cached_listings_are_revalidated_after_the_interval(
+    tmp_path, monkeypatch, wait_for
+):
+    monkeypatch.setattr(directory_manager, "REVALIDATE_INTERVAL", 0.0)
+    (tmp_path / "a.txt").write_text("a\n", encoding="utf-8")
+    manager = DirectoryManager(str(tmp_path))
+    manager.listing_workers = ListingWorkers()
+    try:
+        assert wait_for(lambda: manager.get_items() == [("a.txt", False)])
+        (tmp_path / "b.txt").write_text("b\n", encoding="utf-8")
+        assert wait_for(lambda: len(manager.get_items()) == 2)
+    finally:
+        manager.close()
+
+
+def test_large_directory_streams_a_sorted_prefix_while_loading(tmp_path, monkeypatch):
+    monkeypatch.setattr(directory_manager, "STREAM_FIRST_CHUNK", 4)
+    for idx in range(40):
+        (tmp_path / f"f{idx:02d}.txt").write_text("", encoding="utf-8")
+
+    release = threading.Event()
+    merge = DirectoryManager._merge_chunk
+    merged = []
+
+    def gated_merge(self, real_target, candidates, chunk, sort_mode):
+        merge(self, real_target, candidates, chunk, sort_mode)
+        merged.append(len(candidates))
+        if len(merged) == 2:
+            # The first sorted prefix has been published by now.
+            release.wait(5.0)
+
+    monkeypatch.setattr(DirectoryManager, "_merge_chunk", gated_merge)
+    ready = threading.Event()
+    manager = DirectoryManager(str(tmp_path))
+    manager.listing_workers = ListingWorkers(on_done=ready.set)
+    try:
+        partial = manager.get_items()
+        assert len(partial) == 4
+        assert partial == sorted(partial)
+        assert manager.is_loading(manager.current_path)
+
+        release.set()
+        assert ready.wait(5.0)
+        items = manager.get_items()
+        assert [name for name, _is_dir in items] == [f"f{i:02d}.txt" for i in range(40)]
+        assert merged[:3] == [4, 8, 16]
+    finally:
+        release.set()
+        manager.close()
+
+
+def test_invalidation_is_safe_while_workers_list(tmp_path):
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_text("ref: refs/heads/main\n", encoding="utf-8")
+    (tmp_path / ".gitignore").write_text("*.log\n", encoding="utf-8")
+    paths = []
+    for index in range(20):
+        deep = tmp_path / f"d{index}" / "a" / "b"
+        deep.mkdir(parents=True)
+        (deep / "x.log").write_text("", encoding="utf-8")
+        (deep / "keep.txt").write_text("", encoding="utf-8")
+        paths.append(str(deep))
+    manager = DirectoryManager(str(tmp_path))
+    manager.listing_workers = ListingWorkers()
+    # Switch threads often so invalidation interleaves with worker inserts.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        futures = []
+        for _ in range(200):
+            for path in paths:
+                futures.append(
+                    manager.listing_workers.submit(path, manager.load_listing, path)
+                )
+            # Drops the repo-root trie and ignore caches the workers fill.
+            manager.invalidate_directory(str(tmp_path), recursive=True)
+        for future in futures:
+            assert future.result(timeout=5.0) == [("keep.txt", False)]
+    finally:
+        sys.setswitchinterval(interval)
+        manager.close()
+
+
+def test_repo_root_lookup_racing_invalidation_is_not_memoized(tmp_path, monkeypatch):
+    deep = tmp_path / "a" / "b"
+    deep.mkdir(parents=True)
+    entered = threading.Event()
+    release = threading.Event()
+    is_worktree_root = directory_manager.is_worktree_root
+
+    def slow_is_worktree_root(directory):
+        if directory == str(tmp_path):
+            entered.set()
+            release.wait(2.0)
+        return is_worktree_root(directory)
+
+    monkeypatch.setattr(directory_manager, "is_worktree_root", slow_is_worktree_root)
+    manager = DirectoryManager(str(tmp_path))
+    manager.listing_workers = ListingWorkers()
+    try:
+        future = manager.listing_workers.submit(
+            str(deep), manager._get_git_repo_root, str(deep)
+        )
+        assert entered.wait(2.0)
+        # The worker is inside a filesystem call; invalidating must not wait.
+        manager.invalidate_directory(str(tmp_path))
+        release.set()
+        future.result(timeout=2.0)
+        assert str(deep) not in manager._git_repo_cache
+    finally:
+        release.set()
+        manager.close()
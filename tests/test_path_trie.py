@@ -0,0 +1,78 @@
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from directory_manager import DirectoryManager
+from path_trie import PathTrie
+
+
+def test_path_trie_lookups_and_subtree_removal():
+    trie = PathTrie()
+    trie["/a"] = 1
+    trie["/a/b/c"] = 2
+    trie["/a/bc"] = 3
+    trie["/"] = 0
+
+    assert trie.get("/a/b") is None
+    assert "/a/b" not in trie and trie.has_subtree("/a/b")
+    assert trie.longest_prefix("/a/b/c/d") == ("/a/b/c", 2)
+    assert trie.longest_prefix("/a/bx") == ("/a", 1)
+    assert trie.longest_prefix("/z") == ("/", 0)
+    assert sorted(trie.items_under("/a/b")) == [("/a/b/c", 2)]
+
+    assert trie.discard_subtree("/a/b") == 1
+    assert trie.pop("/a") == 1
+    assert sorted(trie) == ["/", "/a/bc"]
+    assert len(trie) == 2
+
+
+def _make_repo(path: Path) -> None:
+    (path / ".git" / "refs").mkdir(parents=True)
+    (path / ".git" / "HEAD").write_text("ref: refs/heads/main\n", encoding="utf-8")
+
+
+def test_repo_root_discovery_walks_parents_without_subprocesses(tmp_path, monkeypatch):
+    outer = tmp_path / "outer"
+    deep = outer / "a" / "b" / "c"
+    deep.mkdir(parents=True)
+    _make_repo(outer)
+    inner = outer / "a" / "vendored"
+    inner.mkdir()
+    _make_repo(inner)
+    worktree = tmp_path / "linked"
+    (worktree / "src").mkdir(parents=True)
+    (worktree / ".git").write_text(f"gitdir: {outer / '.git'}\n", encoding="utf-8")
+
+    def forbidden(*_args, **_kwargs):
+        raise AssertionError("repo discovery must not fork")
+
+    monkeypatch.setenv("GIT_CEILING_DIRECTORIES", str(tmp_path.resolve().parent))
+    monkeypatch.setattr(subprocess, "run", forbidden)
+    monkeypatch.setattr(subprocess, "Popen", forbidden)
+
+    manager = DirectoryManager(str(tmp_path))
+    root = str(outer.resolve())
+    assert manager._get_git_repo_root(str(deep.resolve())) == root
+    assert manager._git_repo_cache.get(str((outer / "a").resolve())) == root
+    assert manager._get_git_repo_root(str(inner.resolve())) == str(inner.resolve())
+    assert manager._get_git_repo_root(str((outer / ".git").resolve())) is None
+    assert manager._get_git_repo_root(str((worktree / "src").resolve())) == str(
+        worktree.resolve()
+    )
+    assert manager._get_git_repo_root(str(tmp_path.resolve())) is None
+
+
+def test_invalidating_a_directory_forgets_repo_roots_below_it(tmp_path, monkeypatch):
+    nested = tmp_path / "project" / "src"
+    nested.mkdir(parents=True)
+    monkeypatch.setenv("GIT_CEILING_DIRECTORIES", str(tmp_path.resolve()))
+    manager = DirectoryManager(str(tmp_path))
+    real_nested = str(nested.resolve())
+    assert manager._get_git_repo_root(real_nested) is None
+
+    _make_repo(tmp_path / "project")
+    manager.invalidate_directory(str(tmp_path / "project"))
+
+    assert manager._get_git_repo_root(real_nested) == str((tmp_path / "project").resolve())
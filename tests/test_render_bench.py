@@ -0,0 +1,30 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import render_bench  # noqa: E402
+
+
+def test_benchmark_runs_every_scenario_on_a_small_tree():
+    results = render_bench.run(sizes=[60], frames=5)
+    assert [result.scenario for result in results] == [
+        f"{layout}/{variant}"
+        for layout in render_bench.LAYOUTS
+        for variant in render_bench.VARIANTS
+    ]
+    rows = {result.scenario: result.rows for result in results}
+    assert rows["list/expanded"] == 60
+    assert rows["list/plain"] < rows["list/expanded"]
+    for result in results:
+        assert result.fps > 0
+        assert result.calls_per_frame > 0
+        assert result.peak_kib_per_frame >= 0
+        assert render_bench.format_result(result).startswith(result.scenario)
+
+
+def test_tree_has_the_requested_number_of_entries(tmp_path):
+    subdirs = render_bench.build_tree(str(tmp_path), 1000)
+    count = sum(1 for _ in tmp_path.rglob("*"))
+    assert count == 1000
+    assert all(Path(path).is_dir() for path in subdirs)
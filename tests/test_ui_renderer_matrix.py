@@ -0,0 +1,70 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core_navigator import FileNavigator
+from ui_renderer import _advance_heads, _stream_column
+
+
+class _Window:
+    def __init__(self, height, width):
+        self.size = (height, width)
+        self.calls = 0
+
+    def getmaxyx(self):
+        return self.size
+
+    def addstr(self, *args):
+        self.calls += 1
+
+    def refresh(self):
+        pass
+
+
+def test_matrix_animates_only_the_page_holding_the_selection(tmp_path):
+    for index in range(300):
+        (tmp_path / f"f{index:03}").write_text("", encoding="utf-8")
+    nav = FileNavigator(str(tmp_path))
+    try:
+        nav.layout_mode = "matrix"
+        nav.renderer.stdscr = _Window(20, 40)
+        nav.renderer.render()
+        state = nav.matrix_state
+        assert state.offset == 0 and len(state.streams) == 40
+        assert [stream.index for stream in state.streams] == list(range(40))
+
+        nav.browser_selected = 123
+        nav.renderer.render()
+        state = nav.matrix_state
+        assert state.offset == 120 and len(state.streams) == 40
+        assert state.streams[3].name == "f123"
+        columns = [stream.column for stream in state.streams]
+        assert len(set(columns)) == len(columns)
+
+        nav.browser_selected = 299
+        nav.renderer.render()
+        assert [stream.index for stream in nav.matrix_state.streams] == list(
+            range(280, 300)
+        )
+    finally:
+        nav.close()
+
+
+def test_stream_column_matches_the_per_cell_formula():
+    chars = "abcdefghijklmnopqrstuvwxyz012345"
+    length = len(chars)
+    for head in (0.0, 0.4, 3.9, 7.5, 15.99):
+        text, head_row = _stream_column(chars, head, 16)
+        expected = "".join(
+            chars[(length - 1 - int((head - row) % length)) % length]
+            for row in range(16)
+        )
+        assert text == expected
+        assert head_row == int(head)
+
+
+def test_heads_advance_together_except_paused_ones():
+    heads = _advance_heads([1.0, 2.0, 9.5], [2.0, 2.0, 1.0], 0.5, 10, [False, True, False])
+    assert heads == [2.0, 2.0, 0.0]
+    assert _advance_heads([1.0], [3.0], 0.0, 10) == [1.0]
@@ -0,0 +1,46 @@
+import select
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core_navigator import FileNavigator  # noqa: E402
+from wakeup import WakeupChannel  # noqa: E402
+
+
+def _readable(channel: WakeupChannel) -> bool:
+    ready, _, _ = select.select([channel.fileno()], [], [], 0)
+    return bool(ready)
+
+
+def test_notify_wakes_select_until_drained():
+    channel = WakeupChannel()
+    try:
+        assert not _readable(channel)
+        for _ in range(100000):
+            # A full pipe must not block or raise.
+            channel.notify()
+        assert _readable(channel)
+        channel.drain()
+        assert not _readable(channel)
+    finally:
+        channel.close()
+    channel.notify()
+
+
+def test_worker_callbacks_wake_the_main_loop(tmp_path):
+    (tmp_path / "a.txt").write_text("a")
+    nav = FileNavigator(str(tmp_path))
+    try:
+        nav.wakeup.drain()
+        nav.need_redraw = False
+        nav._on_listing_ready()
+        assert nav.need_redraw
+        assert _readable(nav.wakeup)
+        nav.wakeup.drain()
+
+        nav.append_command_popup_lines(["output"])
+        assert _readable(nav.wakeup)
+    finally:
+        nav.close()
+    assert nav.wakeup.closed
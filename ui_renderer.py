@@ -6,6 +6,9 @@ from dataclasses import dataclass
 from typing import Any, Optional, Sequence, Tuple, cast
 
 from directory_manager import DirectoryManager
+from frame_buffer import FrameBuffer
+
+SPINNER_FRAMES = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
 
 
 @dataclass
@@ -16,8 +19,6 @@ class MatrixStream:
     is_dir: bool
     depth: int
     column: int
-    velocity: float
-    head: float
     chars: str
 
     @property
@@ -33,13 +34,15 @@ class MatrixState:
     max_width: int
     last_update: float
     index_map: dict[int, MatrixStream]
+    # Per stream, in stream order, so a frame steps them all in one pass.
+    velocities: list[float]
+    heads: list[float]
+    offset: int = 0
 
 
 @dataclass
 class IdleStream:
     column: int
-    velocity: float
-    head: float
     chars: str
 
 
@@ -49,6 +52,47 @@ class IdleMatrixState:
     max_height: int
     max_width: int
     last_update: float
+    velocities: list[float]
+    heads: list[float]
+
+
+def _advance_heads(
+    heads: Sequence[float],
+    velocities: Sequence[float],
+    delta: float,
+    height: int,
+    paused: Optional[Sequence[bool]] = None,
+) -> list[float]:
+    """Every head moved by ``velocity * delta`` and wrapped at *height*.
+
+    Heads flagged in *paused* stay where they are.
+    """
+    if not delta or height <= 0:
+        return list(heads)
+    if paused is None:
+        return [
+            (head + velocity * delta) % height
+            for head, velocity in zip(heads, velocities)
+        ]
+    return [
+        head if stop else (head + velocity * delta) % height
+        for head, velocity, stop in zip(heads, velocities, paused)
+    ]
+
+
+def _stream_column(chars: str, head: float, rows: int) -> Tuple[str, int]:
+    """The characters a stream shows in rows ``0..rows-1`` and its head row.
+
+    Row ``r`` shows ``chars[(len - 1 - int(head) + r) % len]``, so the whole
+    column is one (wrapping) slice of the pattern.
+    """
+    length = len(chars)
+    top = int(head) % length
+    start = (length - 1 - top) % length
+    text = chars[start : start + rows]
+    while len(text) < rows:
+        text += chars[: rows - len(text)]
+    return text, top
 
 
 class UIRenderer:
@@ -56,45 +100,45 @@ class UIRenderer:
         self.nav = navigator
         self.stdscr: Optional[Any] = None
         self._idle_matrix_state: Optional[IdleMatrixState] = None
+        self._frame: Optional[FrameBuffer] = None
 
     def render(self):
-        stdscr = self.stdscr
-        if stdscr is None:
+        window = self.stdscr
+        if window is None:
             return
 
-        max_y, max_x = cast(Tuple[int, int], stdscr.getmaxyx())
-        self._clear_screen(stdscr)
+        frame = self._frame
+        if frame is None or frame.window is not window:
+            frame = self._frame = FrameBuffer(window)
+        frame.begin()
+        max_y, max_x = cast(Tuple[int, int], frame.getmaxyx())
 
         if self.nav.show_help:
-            self._render_help(stdscr, max_y, max_x)
-            stdscr.refresh()
+            self._render_help(frame, max_y, max_x)
+            frame.present()
             return
 
         display_path = DirectoryManager.pretty_path(self.nav.dir_manager.current_path)
-        self._render_path_header(stdscr, display_path, max_x)
+        self._render_path_header(frame, display_path, max_x)
 
         if self.nav.layout_mode == "matrix":
-            self._render_matrix(stdscr, max_y, max_x)
+            self._render_matrix(frame, max_y, max_x)
         else:
-            self._render_list(stdscr, max_y, max_x)
+            self._render_list(frame, max_y, max_x)
 
         if getattr(self.nav, "command_popup_visible", False):
-            self._render_command_popup(stdscr, max_y, max_x)
+            self._render_command_popup(frame, max_y, max_x)
+
+        frame.present()
 
-        stdscr.refresh()
+    def invalidate_frame(self) -> None:
+        """Repaint every cell next frame (something drew on the window)."""
+        if self._frame is not None:
+            self._frame.invalidate()
 
     # ------------------------------------------------------------------
     # Shared helpers
 
-    def _clear_screen(self, stdscr: Any) -> None:
-        try:
-            stdscr.erase()
-        except Exception:
-            try:
-                stdscr.clear()
-            except Exception:
-                pass
-
     def _render_path_header(self, stdscr: Any, display_path: str, max_x: int) -> None:
         try:
             stdscr.addstr(0, 0, display_path[:max_x])
@@ -320,6 +364,13 @@ class UIRenderer:
         status = f"HELP {start + 1}-{start + len(visible)} / {total_lines}"
         self._render_status_bar(stdscr, status, max_y, max_x)
 
+    def _is_loading(self, path: str) -> bool:
+        checker = getattr(self.nav.dir_manager, "is_loading", None)
+        return bool(checker(path)) if callable(checker) else False
+
+    def _spinner_frame(self) -> str:
+        return SPINNER_FRAMES[int(time.monotonic() * 10) % len(SPINNER_FRAMES)]
+
     # ------------------------------------------------------------------
     # List layout
 
@@ -329,15 +380,13 @@ class UIRenderer:
         if available_height < 0:
             available_height = 0
 
-        for yy in range(list_start_y, max(0, max_y - 1)):
-            try:
-                stdscr.move(yy, 0)
-                stdscr.clrtoeol()
-            except curses.error:
-                pass
+        # Rows go through draw_row so unchanged ones reuse last frame's cells;
+        # the frame starts blank, so nothing needs clearing first.
+        draw_row = getattr(stdscr, "draw_row", None)
 
         items = self.nav.build_display_items()
         total = len(items)
+        loading = self._is_loading(self.nav.dir_manager.current_path)
         visual_indices_set = set()
         visual_count = 0
         if hasattr(self.nav, "get_visual_indices"):
@@ -367,11 +416,12 @@ class UIRenderer:
         ]
 
         if total == 0:
-            msg = (
-                "(no matches)"
-                if self.nav.dir_manager.filter_pattern
-                else "(empty directory)"
-            )
+            if loading:
+                msg = f"{self._spinner_frame()} loading…"
+            elif self.nav.dir_manager.filter_pattern:
+                msg = "(no matches)"
+            else:
+                msg = "(empty directory)"
             try:
                 stdscr.addstr(
                     list_start_y + (available_height // 2 if available_height else 0),
@@ -390,7 +440,12 @@ class UIRenderer:
                 sel_block = f"{arrow}{mark} "
 
                 if is_dir:
-                    exp_symbol = "▾ " if full_path in self.nav.expanded_nodes else "▸ "
+                    if full_path not in self.nav.expanded_nodes:
+                        exp_symbol = "▸ "
+                    elif self._is_loading(full_path):
+                        exp_symbol = f"{self._spinner_frame()} "
+                    else:
+                        exp_symbol = "▾ "
                 else:
                     exp_symbol = "  "
 
@@ -408,17 +463,26 @@ class UIRenderer:
 
                 y = list_start_y + i
                 try:
-                    stdscr.move(y, 0)
-                    stdscr.clrtoeol()
-                    stdscr.addstr(y, 0, line[:max_x], attr)
+                    if draw_row is not None:
+                        draw_row(y, line[:max_x], attr)
+                    else:
+                        stdscr.move(y, 0)
+                        stdscr.clrtoeol()
+                        stdscr.addstr(y, 0, line[:max_x], attr)
                 except curses.error:
                     pass
 
         scroll_indicator = ""
+        # While a listing streams in, the total is a lower bound: "N+ loading".
+        total_label = f"{total}+ loading" if loading else str(total)
         if total > available_height and available_height > 0:
             top = self.nav.list_offset + 1
             bottom = min(total, self.nav.list_offset + available_height)
-            scroll_indicator = f"  [{top}-{bottom}/{total}]"
+            scroll_indicator = f"  [{top}-{bottom}/{total_label}]"
+        elif loading and total > 0:
+            scroll_indicator = f"  [{total_label}]"
+        if loading and total > 0:
+            scroll_indicator += f" {self._spinner_frame()}"
 
         status = self._compose_status(
             mode_indicator="",
@@ -466,17 +530,16 @@ class UIRenderer:
             return
 
         self._idle_matrix_state = None
-        state = self._ensure_matrix_state(items, matrix_height, max_x)
-
-        now = time.monotonic()
-        delta = 0.0 if state.last_update == 0 else now - state.last_update
-        state.last_update = now
-
         selected_index = (
             0 if total == 0 else max(0, min(self.nav.browser_selected, total - 1))
         )
         if total > 0:
             self.nav.browser_selected = selected_index
+        state = self._ensure_matrix_state(items, selected_index, matrix_height, max_x)
+
+        now = time.monotonic()
+        delta = 0.0 if state.last_update == 0 else now - state.last_update
+        state.last_update = now
 
         visual_indices: list[int] = []
         if getattr(self.nav, "visual_mode", False):
@@ -487,37 +550,36 @@ class UIRenderer:
         paused_indices = set(visual_indices)
         paused_indices.add(selected_index)
 
-        if self.nav.marked_items:
-            index_by_path = {items[idx][2]: idx for idx in range(total)}
-            for marked_path in self.nav.marked_items:
-                idx = index_by_path.get(marked_path)
-                if idx is not None:
-                    paused_indices.add(idx)
-
-        for stream in state.streams:
-            if stream.index in paused_indices:
-                continue
-            stream.head = (stream.head + stream.velocity * delta) % matrix_height
-
-        for stream in state.streams:
-            col = max(0, min(max_x - 1, stream.column))
-            chars = stream.chars or "0"
-            for row_offset in range(matrix_height):
-                y = content_start_y + row_offset
-                if y >= label_row:
-                    break
-                offset = int((stream.head - row_offset) % stream.length)
-                char_index = (stream.length - 1 - offset) % stream.length
-                ch = chars[char_index]
-                attr = curses.A_DIM
-                if stream.index == selected_index:
-                    attr = curses.A_BOLD if offset == 0 else curses.A_NORMAL
-                elif offset == 0:
-                    attr = curses.A_NORMAL
-                try:
-                    stdscr.addch(y, col, ch, attr)
-                except curses.error:
-                    pass
+        row_of = self.nav.display_model.row_of
+        for marked_path in self.nav.marked_items:
+            idx = row_of(marked_path)
+            if idx is not None:
+                paused_indices.add(idx)
+
+        state.heads = _advance_heads(
+            state.heads,
+            state.velocities,
+            delta,
+            matrix_height,
+            [stream.index in paused_indices for stream in state.streams],
+        )
+
+        rows = min(matrix_height, label_row - content_start_y)
+        for stream, head in zip(state.streams, state.heads):
+            if stream.index == selected_index:
+                body_attr, head_attr = curses.A_NORMAL, curses.A_BOLD
+            else:
+                body_attr, head_attr = curses.A_DIM, curses.A_NORMAL
+            self._draw_stream(
+                stdscr,
+                content_start_y,
+                max(0, min(max_x - 1, stream.column)),
+                rows,
+                stream.chars or "0",
+                head,
+                body_attr,
+                head_attr,
+            )
 
         if 0 <= label_row < max_y:
             name, is_dir, path, _ = items[selected_index]
@@ -544,6 +606,32 @@ class UIRenderer:
         )
         self._render_status_bar(stdscr, status, max_y, max_x, bold=False)
 
+    def _draw_stream(
+        self,
+        stdscr: Any,
+        top: int,
+        col: int,
+        rows: int,
+        chars: str,
+        head: float,
+        body_attr: int,
+        lit_attr: int,
+        *,
+        lit_row: Optional[int] = None,
+    ) -> None:
+        """Draw one stream as a single column write plus its lit cell."""
+        if rows <= 0:
+            return
+        text, head_row = _stream_column(chars, head, rows)
+        if lit_row is None:
+            lit_row = head_row
+        try:
+            stdscr.addvstr(top, col, text, body_attr)
+            if lit_row < rows:
+                stdscr.addch(top + lit_row, col, text[lit_row], lit_attr)
+        except curses.error:
+            pass
+
     def _compute_columns(self, count: int, max_x: int) -> list[int]:
         if count <= 0 or max_x <= 0:
             return []
@@ -559,25 +647,41 @@ class UIRenderer:
     def _ensure_matrix_state(
         self,
         items: Sequence[Tuple[str, bool, str, int]],
+        selected_index: int,
         matrix_height: int,
         max_x: int,
     ) -> MatrixState:
-        signature = tuple(entry[2] for entry in items)
+        """Streams for the page of at most ``max_x`` items holding the selection.
+
+        Only that page is animated and drawn, so a frame costs the same for
+        ten thousand items as for a hundred; moving the selection past the
+        page edge pages the next set of streams in.
+        """
+        page_size = max(1, max_x)
+        offset = (selected_index // page_size) * page_size
+        page = items[offset : offset + page_size]
+        signature = tuple(entry[2] for entry in page)
         state: Optional[MatrixState] = getattr(self.nav, "matrix_state", None)
 
         if (
             state is None
+            or state.offset != offset
             or state.signature != signature
             or state.max_height != matrix_height
             or state.max_width != max_x
         ):
             streams: list[MatrixStream] = []
-            columns = self._compute_columns(len(items), max_x)
+            velocities: list[float] = []
+            heads: list[float] = []
+            columns = self._compute_columns(len(page), max_x)
             pattern_length = max(32, matrix_height * 2)
-            for idx, (name, is_dir, path, depth) in enumerate(items):
-                column = columns[idx] if idx < len(columns) else (idx % max_x)
-                velocity = random.uniform(5.0, 12.0)
-                head = random.uniform(0, matrix_height - 1 if matrix_height > 1 else 0)
+            for slot, (name, is_dir, path, depth) in enumerate(page):
+                idx = offset + slot
+                column = columns[slot] if slot < len(columns) else (slot % max_x)
+                velocities.append(random.uniform(5.0, 12.0))
+                heads.append(
+                    random.uniform(0, matrix_height - 1 if matrix_height > 1 else 0)
+                )
                 base_label = name + ("/" if is_dir else "")
                 sanitized = base_label.strip()
                 if not sanitized:
@@ -596,8 +700,6 @@ class UIRenderer:
                         is_dir=is_dir,
                         depth=depth,
                         column=column,
-                        velocity=velocity,
-                        head=head,
                         chars=chars,
                     )
                 )
@@ -610,6 +712,9 @@ class UIRenderer:
                 max_width=max_x,
                 last_update=0.0,
                 index_map=index_map,
+                velocities=velocities,
+                heads=heads,
+                offset=offset,
             )
             self.nav.matrix_state = state
 
@@ -641,17 +746,16 @@ class UIRenderer:
             streams: list[IdleStream] = []
             for idx in range(count):
                 column = columns[idx] if idx < len(columns) else min(max_x - 1, idx)
-                velocity = random.uniform(4.0, 9.0)
-                head = random.uniform(0, matrix_height - 1 if matrix_height > 1 else 0)
                 chars = "".join(random.choice("01") for _ in range(length))
-                streams.append(
-                    IdleStream(column=column, velocity=velocity, head=head, chars=chars)
-                )
+                streams.append(IdleStream(column=column, chars=chars))
+            high = matrix_height - 1 if matrix_height > 1 else 0
             state = IdleMatrixState(
                 streams=streams,
                 max_height=matrix_height,
                 max_width=max_x,
                 last_update=time.monotonic(),
+                velocities=[random.uniform(4.0, 9.0) for _ in range(count)],
+                heads=[random.uniform(0, high) for _ in range(count)],
             )
             self._idle_matrix_state = state
 
@@ -668,25 +772,21 @@ class UIRenderer:
             except curses.error:
                 pass
 
-        for stream in state.streams:
-            stream.head = (stream.head + stream.velocity * delta) % matrix_height
+        state.heads = _advance_heads(state.heads, state.velocities, delta, matrix_height)
+        rows = min(matrix_height, label_row - content_start_y)
+        for stream, head in zip(state.streams, state.heads):
             if len(stream.chars) < trail_length:
                 repeats = (trail_length // max(1, len(stream.chars))) + 2
                 stream.chars = (stream.chars * repeats)[:trail_length]
-            chars = stream.chars or "0"
-            length = len(chars)
-            col = max(0, min(max_x - 1, stream.column))
-            for row_offset in range(matrix_height):
-                y = content_start_y + row_offset
-                if y >= label_row:
-                    break
-                offset = int((stream.head - row_offset) % length)
-                char_index = (length - 1 - offset) % length
-                ch = chars[char_index]
-                attr = curses.A_DIM
-                if offset == int(stream.head % length):
-                    attr = curses.A_NORMAL
-                try:
-                    stdscr.addch(y, col, ch, attr)
-                except curses.error:
-                    pass
+            # Idle streams light their top row rather than their head.
+            self._draw_stream(
+                stdscr,
+                content_start_y,
+                max(0, min(max_x - 1, stream.column)),
+                rows,
+                stream.chars or "0",
+                head,
+                curses.A_DIM,
+                curses.A_NORMAL,
+                lit_row=0,
+            )
@@ -0,0 +1,53 @@
+"""Self-pipe that lets worker threads wake the main loop's select()."""
+
+from __future__ import annotations
+
+import os
+
+
+class WakeupChannel:
+    """A non-blocking pipe: ``notify`` from any thread, ``select`` on ``fileno``.
+
+    Writes coalesce: a full pipe already guarantees a wakeup, so ``notify``
+    never blocks and never fails. The write end can also be handed to
+    ``signal.set_wakeup_fd`` so signals wake the loop the same way.
+    """
+
+    def __init__(self):
+        self._read_fd, self._write_fd = os.pipe()
+        for fd in (self._read_fd, self._write_fd):
+            os.set_blocking(fd, False)
+        self.closed = False
+
+    def fileno(self) -> int:
+        return self._read_fd
+
+    @property
+    def write_fd(self) -> int:
+        return self._write_fd
+
+    def notify(self) -> None:
+        if self.closed:
+            return
+        try:
+            os.write(self._write_fd, b"\0")
+        except (BlockingIOError, OSError):
+            pass
+
+    def drain(self) -> None:
+        while True:
+            try:
+                if not os.read(self._read_fd, 4096):
+                    return
+            except (BlockingIOError, OSError):
+                return
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        for fd in (self._read_fd, self._write_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass